@@ -0,0 +1,87 @@
+"""
+Benchmark for parsing a single huge statement.
+
+Writes a model file whose objective is one line, sum(...) over long variable
+names, and parses it in a fresh process with Parser.parse on the whole text
+and with Parser.parse_stream, reporting the time and peak memory of each.
+
+    python benchmarks/long_line.py [--megabytes 100] [--chunk-size 65536]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Number of distinct variables in the objective.
+VARIABLES = 1000
+
+# Returns the name of variable i.
+def name(i):
+    return 'variable_with_a_long_name_%04d' % i
+
+# Writes the model to path, with an objective of about megabytes MB.
+def write_model(path, megabytes):
+    with open(path, 'w') as f:
+        f.write('variable positive %s\n' % ' '.join(name(i) for i in range(VARIABLES)))
+        f.write('sum(')
+        size = megabytes * (1 << 20)
+        written = 0
+        i = 0
+        while written < size:
+            arg = name(i % VARIABLES) + ', '
+            f.write(arg)
+            written += len(arg)
+            i += 1
+        f.write('1)\n')
+
+# Parses the model at path with the given mode, in this process.
+# Returns the seconds taken.
+def run(path, mode, chunk_size):
+    from dcp_parser.parser import Parser
+    parser = Parser()
+    start = time.time()
+    if mode == 'parse':
+        with open(path) as f:
+            parser.parse(f.read())
+    else:
+        with open(path) as f:
+            for result in parser.parse_stream(f, chunk_size):
+                if not result.is_success():
+                    raise result.error
+    assert len(parser.statements) == 1
+    return time.time() - start
+
+# Peak resident memory of this process in MB.
+def peak_memory():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--megabytes', type=int, default=100)
+    parser.add_argument('--chunk-size', type=int, default=1 << 16)
+    parser.add_argument('--mode', choices=['parse', 'stream'])
+    parser.add_argument('--path')
+    args = parser.parse_args()
+    if args.mode is not None:
+        seconds = run(args.path, args.mode, args.chunk_size)
+        print "%-8s %8.1f s %10.1f MB peak" % (args.mode, seconds, peak_memory())
+        return
+
+    (handle, path) = tempfile.mkstemp(suffix='.txt')
+    os.close(handle)
+    try:
+        write_model(path, args.megabytes)
+        print "%d MB statement" % args.megabytes
+        for mode in ['parse', 'stream']:
+            subprocess.check_call([sys.executable, __file__, '--mode', mode,
+                                   '--path', path, '--chunk-size', str(args.chunk_size)])
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
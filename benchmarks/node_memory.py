@@ -0,0 +1,74 @@
+"""
+Benchmark for the memory used per expression tree node.
+
+Parses a model of many short statements, keeping every statement, and
+reports the growth in resident memory divided by the number of nodes
+(expressions, constraints and DCP violations) in the statements.
+With --share-nodes the parser shares identical subexpressions (see
+dcp_parser.expression.node_table), and distinct nodes are counted.
+
+    python benchmarks/node_memory.py [--statements 100000] [--share-nodes]
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dcp_parser.parser import Parser, preload
+
+# Declared names, so statement objects rather than leaves dominate.
+DECLARATIONS = ['variable x y z', 'parameter positive a b', 'parameter c']
+
+# Statements cycled through, with and without DCP violations.
+STATEMENTS = ['a * x + square(y) - 2 * log(z) <= b',
+              'max(x, y) + c * z',
+              'square(x) + log(y) == 3',
+              'c * square(x + y) - b / 2']
+
+# Returns the peak resident memory in bytes.
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and bytes on OS X.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+# Returns the number of distinct nodes reachable from the statements.
+def count_nodes(statements):
+    seen = set()
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        if id(node) in seen or isinstance(node, basestring):
+            continue
+        seen.add(id(node))
+        stack.extend(node.subexpressions)
+        seen.update(id(error) for error in node.errors)
+    return len(seen)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--statements', type=int, default=100000)
+    parser.add_argument('--share-nodes', action='store_true')
+    args = parser.parse_args()
+    preload()
+    dcp_parser = Parser('fast', share_nodes=args.share_nodes)
+    for line in DECLARATIONS:
+        dcp_parser.parse(line)
+    gc.collect()
+    before = peak_rss()
+    start = time.time()
+    for i in range(args.statements):
+        dcp_parser.parse(STATEMENTS[i % len(STATEMENTS)])
+    seconds = time.time() - start
+    used = peak_rss() - before
+    nodes = count_nodes(dcp_parser.statements)
+    print "%d statements, %d nodes" % (args.statements, nodes)
+    print "%-16s %8.3f s" % ("parse", seconds)
+    print "%-16s %8.1f MB" % ("memory", used / 1e6)
+    print "%-16s %8.1f bytes" % ("per node", float(used) / nodes)
+
+if __name__ == '__main__':
+    main()
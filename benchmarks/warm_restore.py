@@ -0,0 +1,68 @@
+"""
+Benchmark for restoring a parser with a large declared symbol table.
+
+Declares many variables and parameters, parses a few statements, and times
+getting an equivalent Parser back by re-parsing the declarations, by
+unpickling the objects as they are, and by Parser.restore(snapshot).
+
+    python benchmarks/warm_restore.py [--declarations 100000]
+"""
+import argparse
+import cPickle
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dcp_parser.parser import Parser, preload
+
+# Names declared per line.
+PER_LINE = 10
+
+# Returns the lines of the model, declarations first.
+def model(declarations):
+    lines = []
+    for i in range(0, declarations, PER_LINE):
+        kind = 'variable' if i % (2 * PER_LINE) == 0 else 'parameter'
+        names = ' '.join('s%d' % j for j in range(i, i + PER_LINE))
+        lines.append('%s positive %s' % (kind, names))
+    lines.append('square(s0) + s10 * log(s1) <= max(s2, s11)')
+    lines.append('sum(%s)' % ', '.join('s%d' % j for j in range(0, declarations, 97)))
+    return lines
+
+# Runs f and returns (seconds, result).
+def timed(f):
+    start = time.time()
+    result = f()
+    return (time.time() - start, result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--declarations', type=int, default=100000)
+    args = parser.parse_args()
+    preload()
+    lines = model(args.declarations)
+
+    def parse():
+        parser = Parser()
+        for line in lines:
+            parser.parse(line)
+        return parser
+    (seconds, parsed) = timed(parse)
+    print "%d declarations, %d statements" % (len(parsed.symbol_table),
+                                              len(parsed.statements))
+    print "%-24s %8.3f s" % ("parse", seconds)
+
+    pickled = cPickle.dumps((parsed.symbol_table, parsed.statements),
+                           cPickle.HIGHEST_PROTOCOL)
+    (seconds, state) = timed(lambda: cPickle.loads(pickled))
+    print "%-24s %8.3f s %8.1f MB" % ("unpickle objects", seconds, len(pickled) / 1e6)
+
+    snapshot = parsed.snapshot()
+    (seconds, restored) = timed(lambda: Parser.restore(snapshot))
+    print "%-24s %8.3f s %8.1f MB" % ("Parser.restore", seconds, len(snapshot) / 1e6)
+    assert [str(s) for s in restored.statements] == [str(s) for s in parsed.statements]
+
+if __name__ == '__main__':
+    main()
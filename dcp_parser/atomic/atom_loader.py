@@ -1,46 +1,140 @@
+import abc
+import collections
 from dcp_parser.expression.expression import Expression
-from atoms import Atom
 from dcp_parser.error_messages.dcp_violation_factory import DCPViolationFactory
 # Methods to create a dict of atomic functions
 
+# Entry point group for atoms defined in other packages.
+ENTRY_POINT_GROUP = 'dcp_parser.atoms'
+
+# Maps atomic function names to atomic functions.
+# Filled in as Atom subclasses are defined, see AtomMeta and register.
+ATOM_REGISTRY = {}
+
+# Whether load_entry_points has run.
+entry_points_loaded = False
+
 # For a given atomic class creates a function that takes in arguments,
 # passes them to the class constructor, and returns an Expression
 # based on the class sign and curvature.
 def make_atomic_func(atomic_class):
     def atomic_func(*args):
         instance = atomic_class(*args)
-        func_name = instance.name()
-        name = func_name + "("
+        # The name is rendered from the arguments when needed.
+        name = [instance.name() + "("]
         for i in range(len(args)):
-            name += str(args[i])
-            if i < len(args)-1: 
-                name += ", " 
-        name += ")"
+            if i > 0:
+                name.append(", ")
+            name.append(args[i])
+        name.append(")")
 
         errors = DCPViolationFactory.composition_error(instance.signed_curvature(), 
                                                 instance.monotonicity(),
                                                 instance.argument_curvatures(),
                                                 instance.argument_signs())
-        return Expression(instance.curvature(), instance.sign(), name, instance.arguments(), 
+        return Expression(instance.curvature(), instance.sign(), tuple(name), instance.arguments(), 
                           errors = errors, 
                           monotonicity = instance.monotonicity(), 
                           short_name = instance.short_name())
+    atomic_func.atom_class = atomic_class
     return atomic_func
 
 # Creates a dict mapping atomic function names to generated atomic functions.
 def generate_atom_dict():
-    atom_dict = {}
-    for subclass in get_subclasses(Atom):
-        name = subclass.__name__.lower()
-        func = make_atomic_func(subclass)
-        atom_dict[name] = func
-    return atom_dict
-
-# Returns a list of all classes derived at some point from the given class.
-def get_subclasses(cls):
-    subcls = []
-    if hasattr(cls, '__subclasses__'):
-        subcls = cls.__subclasses__()
-        for cls in subcls:
-            subcls = subcls + get_subclasses(cls)
-    return subcls
\ No newline at end of file
+    load_atoms()
+    load_entry_points()
+    return dict(ATOM_REGISTRY)
+
+class AtomMeta(abc.ABCMeta):
+    """
+    Metaclass of Atom that registers every subclass under its class name
+    in lower case as it is defined. The function it registers keeps the
+    atom it replaced, so that register can put it back.
+    """
+    def __init__(cls, name, bases, namespace):
+        super(AtomMeta, cls).__init__(name, bases, namespace)
+        if any(isinstance(base, AtomMeta) for base in bases):
+            name = name.lower()
+            atomic_func = make_atomic_func(cls)
+            atomic_func.replaced = ATOM_REGISTRY.get(name)
+            ATOM_REGISTRY[name] = atomic_func
+
+# Adds the atomic function for an Atom subclass to ATOM_REGISTRY under
+# the given name, by default the class name in lower case.
+# Subclasses of Atom are registered when they are defined, so this is only
+# needed to register an atom under another name, e.g. as a decorator:
+#   @register(name="my_atom")
+#   class MyAtom(Atom): ...
+# The atom is then registered as my_atom instead of under its class name,
+# and whatever the class name was registered to before is put back. With
+# the name of a built-in atom, e.g. "square", it replaces the built-in.
+# To keep the class name and add an alias, call register(MyAtom) first.
+def register(atom_class=None, name=None):
+    if atom_class is None:
+        return lambda atom_class: register(atom_class, name)
+    default = atom_class.__name__.lower()
+    if name is None:
+        name = default
+    automatic = ATOM_REGISTRY.get(default)
+    if name != default and hasattr(automatic, 'replaced') and \
+       automatic.atom_class is atom_class:
+        if automatic.replaced is None:
+            del ATOM_REGISTRY[default]
+        else:
+            ATOM_REGISTRY[default] = automatic.replaced
+    ATOM_REGISTRY[name] = make_atomic_func(atom_class)
+    return atom_class
+
+# Removes the atom registered under the given name, e.g. to hide a
+# built-in atom. Does nothing if there is none.
+def unregister(name):
+    load_atoms()
+    ATOM_REGISTRY.pop(name, None)
+
+# Imports the built-in atoms, which registers them.
+def load_atoms():
+    import atoms
+
+# Loads the atoms of other packages, once. Each entry point in the
+# ENTRY_POINT_GROUP group names a module defining Atom subclasses,
+# or an Atom subclass, which is registered under the entry point's name.
+# Only loaded when a name is not a built-in atom, as scanning the
+# installed packages is slow. Needs setuptools.
+def load_entry_points():
+    global entry_points_loaded
+    if entry_points_loaded:
+        return
+    entry_points_loaded = True
+    try:
+        import pkg_resources
+    except ImportError:
+        return
+    for entry_point in pkg_resources.iter_entry_points(ENTRY_POINT_GROUP):
+        atom = entry_point.load()
+        if isinstance(atom, AtomMeta):
+            register(atom, entry_point.name)
+
+
+class LazyAtomDict(collections.Mapping):
+    """
+    Read-only view of ATOM_REGISTRY, which imports the atoms module
+    on the first lookup and the entry points on the first miss.
+    """
+    def __getitem__(self, name):
+        load_atoms()
+        if name not in ATOM_REGISTRY:
+            load_entry_points()
+        return ATOM_REGISTRY[name]
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(generate_atom_dict())
+
+    def __len__(self):
+        return len(generate_atom_dict())
@@ -1,21 +1,20 @@
 """ Definitions of atomic functions """
 import abc
-try:  # No exceptions module in Python 3
-    import exceptions
-except ImportError:
-    pass
 import copy
 from types import MethodType
 from numbers import Number
-import dcp_parser.expression.settings as settings
 from dcp_parser.expression.sign import Sign
 from dcp_parser.expression.curvature import Curvature
 from dcp_parser.atomic.monotonicity import Monotonicity
 from dcp_parser.expression.expression import Expression, Constant
+from atom_loader import AtomMeta
 
 class Atom(object):
-    """ Abstract base class for all atoms. """
-    __metaclass__ = abc.ABCMeta
+    """
+    Abstract base class for all atoms.
+    Every subclass is added to atom_loader.ATOM_REGISTRY when it is defined.
+    """
+    __metaclass__ = AtomMeta
 
     # Name for expressions generated by arguments.
     GENERATED_EXPRESSION = "atom"
@@ -90,19 +89,14 @@ class Atom(object):
                           Atom.GENERATED_EXPRESSION,
                           instance.arguments())
 
-    # Converts a Constant or -Constant to its numeric value.
-    # Returns given argument if cannot be converted.
-    # http://stackoverflow.com/questions/379906/parse-string-to-float-or-int
+    # Converts a Constant written as a number, such as 2 or -1.5, to its
+    # numeric value. Returns given argument if cannot be converted.
+    # Folded Constants (see expression.Constant) such as 1 + 1 or (2) are
+    # not converted, so norm(x, 1 + 1) stays the norm of x and 1 + 1.
     @staticmethod
     def constant_to_number(constant):
-        if isinstance(constant, Constant) or \
-          (isinstance(constant, Expression) and \
-           len(constant.subexpressions) == 1 and \
-           constant.name ==  settings.MINUS + constant.subexpressions[0].name):
-            try:
-                return int(constant.name)
-            except exceptions.ValueError:
-                return float(constant.name)
+        if isinstance(constant, Constant) and constant.is_literal():
+            return constant.value
         else:
             return constant
 
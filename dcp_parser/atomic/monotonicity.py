@@ -1,19 +1,32 @@
 from dcp_parser.expression.curvature import Curvature
 
 class Monotonicity(object):
-    """ Monotonicity of atomic functions in a given argument. """
+    """
+    Monotonicity of atomic functions in a given argument.
+    There is a single Monotonicity object for each monotonicity, so
+    Monotonicity(str) returns one of the class constants.
+    """
+    __slots__ = ('monotonicity_str', 'curvatures')
     INCREASING_KEY = 'INCREASING'
     DECREASING_KEY = 'DECREASING'
     NONMONOTONIC_KEY = 'NONMONOTONIC'
 
     MONOTONICITY_SET = set([INCREASING_KEY, DECREASING_KEY, NONMONOTONIC_KEY])
 
-    def __init__(self,monotonicity_str):
-        monotonicity_str = monotonicity_str.upper()
-        if monotonicity_str in Monotonicity.MONOTONICITY_SET:
-            self.monotonicity_str = monotonicity_str
-        else:
-            raise Exception("No such monotonicity %s exists." % str(monotonicity_str))
+    # The Monotonicity for each key.
+    INSTANCES = {}
+
+    def __new__(cls, monotonicity_str):
+        monotonicity = Monotonicity.INSTANCES.get(monotonicity_str)
+        if monotonicity is None:
+            monotonicity = Monotonicity.INSTANCES.get(monotonicity_str.upper())
+            if monotonicity is None:
+                raise Exception("No such monotonicity %s exists." % str(monotonicity_str))
+        return monotonicity
+
+    # Monotonicities are pickled and copied by key, so there stays one of each.
+    def __reduce__(self):
+        return (Monotonicity, (self.monotonicity_str,))
 
     def __repr__(self):
         return "Monotonicity('%s')" % self.monotonicity_str
@@ -35,23 +48,40 @@ class Monotonicity(object):
         concave/affine + decreasing + convex == concave
     Notes: Increasing (decreasing) means non-decreasing (non-increasing).
         Any combinations not covered by the rules result in a nonconvex expression.
+    The results are looked up in the curvatures table, indexed by
+    function curvature and argument curvature, built by dcp_curvature_rule.
     """
     def dcp_curvature(self, func_curvature, arg_curvature):
-        if func_curvature == Curvature.NONCONVEX:
-            return Curvature.NONCONVEX
-        elif func_curvature == Curvature.CONSTANT or \
-             arg_curvature == Curvature.CONSTANT:
-            return Curvature.CONSTANT
-        elif arg_curvature == Curvature.AFFINE:
-            return func_curvature
-        elif self.monotonicity_str == Monotonicity.INCREASING_KEY:
-            return func_curvature + arg_curvature
-        elif self.monotonicity_str == Monotonicity.DECREASING_KEY:
-            return func_curvature - arg_curvature
-        else: # non-monotonic
-            return Curvature.NONCONVEX
-
-# Class constants for all monotonicity types.
+        return self.curvatures[func_curvature.index][arg_curvature.index]
+
+# Returns the curvature in an argument with the given monotonicity
+# by the composition rules above.
+def dcp_curvature_rule(monotonicity, func_curvature, arg_curvature):
+    if func_curvature is Curvature.NONCONVEX:
+        return Curvature.NONCONVEX
+    elif func_curvature is Curvature.CONSTANT or \
+         arg_curvature is Curvature.CONSTANT:
+        return Curvature.CONSTANT
+    elif arg_curvature is Curvature.AFFINE:
+        return func_curvature
+    elif monotonicity.monotonicity_str == Monotonicity.INCREASING_KEY:
+        return func_curvature + arg_curvature
+    elif monotonicity.monotonicity_str == Monotonicity.DECREASING_KEY:
+        return func_curvature - arg_curvature
+    else: # non-monotonic
+        return Curvature.NONCONVEX
+
+# Class constants for all monotonicity types, the only Monotonicity objects.
+def make_monotonicities():
+    curvatures = [Curvature(key) for key in Curvature.KEYS]
+    for key in Monotonicity.MONOTONICITY_SET:
+        monotonicity = object.__new__(Monotonicity)
+        monotonicity.monotonicity_str = key
+        monotonicity.curvatures = tuple(
+            tuple(dcp_curvature_rule(monotonicity, func, arg) for arg in curvatures)
+            for func in curvatures)
+        Monotonicity.INSTANCES[key] = monotonicity
+make_monotonicities()
 Monotonicity.INCREASING = Monotonicity(Monotonicity.INCREASING_KEY)
 Monotonicity.DECREASING = Monotonicity(Monotonicity.DECREASING_KEY)
-Monotonicity.NONMONOTONIC = Monotonicity(Monotonicity.NONMONOTONIC_KEY)
\ No newline at end of file
+Monotonicity.NONMONOTONIC = Monotonicity(Monotonicity.NONMONOTONIC_KEY)
@@ -0,0 +1,129 @@
+"""
+Reads and lexes lines in bounded-size chunks.
+
+Parser.parse_stream uses these to parse a file without ever holding a whole
+line in memory. A LineReader hands out the text of the current line in chunks
+of about chunk_size characters, each ending on a token boundary, and a
+ChunkLexer feeds the tokens of those chunks to the PLY parser one at a time.
+"""
+
+# Characters read from the file at a time.
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Characters that always end a token, so a line can be split after them.
+DELIMITERS = ' \t,()+-*/'
+
+class LineReader(object):
+    """
+    Reads a file object one line at a time.
+    next_line() moves to the next line that is not empty,
+    chunks() yields the text of that line split on token boundaries and
+    line() returns its first chunk_size characters, followed by '...'
+    if the line is longer.
+    """
+    def __init__(self, fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.raw = iter([])
+        self.head = []
+        self.text = ''
+        self.cut = False
+
+    # Moves to the next line that is not empty.
+    # Returns False at the end of the file.
+    def next_line(self):
+        while not self.eof:
+            # Skip what is left of the previous line.
+            for chunk in self.raw:
+                pass
+            self.raw = self.raw_chunks()
+            (self.head, self.text, self.cut) = ([], '', False)
+            for chunk in self.raw:
+                self.keep(chunk)
+                # Spaces and tabs before the first token need not be lexed.
+                if len(chunk.strip(' \t')) > 0:
+                    self.head.append(chunk)
+                if len(chunk.strip()) > 0:
+                    # Read ahead until the start of the line is known.
+                    for chunk in self.raw:
+                        self.keep(chunk)
+                        self.head.append(chunk)
+                        if self.cut:
+                            break
+                    return True
+        return False
+
+    # Returns the start of the current line.
+    def line(self):
+        return self.text + '...' if self.cut else self.text
+
+    # Yields the text of the current line in chunks that end on a token
+    # boundary. Everything after a '#' is a comment and is dropped.
+    def chunks(self):
+        pending = ''
+        for raw in (self.head, self.raw):
+            for chunk in raw:
+                comment = chunk.find('#')
+                if comment >= 0:
+                    yield pending + chunk[:comment]
+                    return
+                text = pending + chunk
+                split = max(text.rfind(c) for c in DELIMITERS)
+                if split < 0:
+                    pending = text
+                else:
+                    yield text[:split + 1]
+                    pending = text[split + 1:]
+        if len(pending) > 0:
+            yield pending
+
+    # Yields the text of the current line as it is read, without the newline.
+    def raw_chunks(self):
+        while True:
+            end = self.buffer.find('\n', self.pos)
+            if end >= 0:
+                chunk = self.buffer[self.pos:end]
+                self.pos = end + 1
+                yield chunk
+                return
+            chunk = self.buffer[self.pos:]
+            (self.buffer, self.pos) = (self.fileobj.read(self.chunk_size), 0)
+            if len(chunk) > 0:
+                yield chunk
+            if len(self.buffer) == 0:
+                self.eof = True
+                return
+
+    # Keeps the start of the line for line().
+    def keep(self, chunk):
+        room = self.chunk_size - len(self.text)
+        if len(chunk) > room:
+            self.cut = True
+        if room > 0:
+            self.text += chunk[:room]
+
+
+class ChunkLexer(object):
+    """
+    Lexer for the PLY parser that reads its input from a sequence of
+    chunks, none of which may split a token, passing each chunk
+    in turn to the given PLY lexer.
+    """
+    def __init__(self, lexer, chunks):
+        self.lexer = lexer
+        self.chunks = iter(chunks)
+        self.lexer.input('')
+
+    # Returns the next token, or None at the end of the input.
+    def token(self):
+        while True:
+            token = self.lexer.token()
+            if token is not None:
+                return token
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return None
+            self.lexer.input(chunk)
@@ -0,0 +1,42 @@
+"""
+Catalog of DCP violation messages.
+
+A violation is recorded as an integer code for its class and fields, e.g.
+the operator and the curvatures and signs of the operands of an
+OperationError (see dcp_violation.DCPViolation). Each violation class adds
+every combination of its fields once, when its module is loaded, and the
+message for each code is rendered then, so messages are looked up rather
+than built again for every error shown or encoded.
+"""
+from dcp_parser.expression.curvature import Curvature
+from dcp_parser.expression.sign import Sign
+from dcp_parser.atomic.monotonicity import Monotonicity
+
+# The values fields range over, in a fixed order.
+CURVATURES = [Curvature(key) for key in Curvature.KEYS]
+SIGNS = [Sign(key) for key in Sign.ORDERING]
+MONOTONICITIES = [Monotonicity.INCREASING, Monotonicity.DECREASING,
+                  Monotonicity.NONMONOTONIC]
+
+# The class, fields and message of each code, by code.
+CLASSES = []
+FIELDS = []
+MESSAGES = []
+# The code of each (class, fields...) tuple.
+CODES = {}
+
+# Adds a code for each tuple of fields in records of the violation class
+# cls, rendering the messages with cls.render(*fields).
+def add_records(cls, records):
+    for fields in records:
+        CODES[(cls,) + fields] = len(MESSAGES)
+        CLASSES.append(cls)
+        FIELDS.append(fields)
+        MESSAGES.append(cls.render(*fields))
+
+# Returns the tuples of one value from each of the lists, in order.
+def combinations(*lists):
+    records = [()]
+    for values in lists:
+        records = [record + (value,) for record in records for value in values]
+    return records
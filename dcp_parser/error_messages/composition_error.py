@@ -1,23 +1,35 @@
 import dcp_parser.expression.settings as EXP_SET
-from dcp_violation import DCPViolation
+from dcp_violation import DCPViolation, field
 from dcp_parser.atomic.monotonicity import Monotonicity
+import catalog
 
 class CompositionError(DCPViolation):
     """ Represents a DCP violation through function composition."""
+    __slots__ = ('index', '__weakref__')
     BASE_MSG = "Illegal composition:"
 
-    def __init__(self, func_curvature, monotonicity, arg_curvature, arg_sign, index):
-        self.func_curvature = func_curvature
-        self.monotonicity = monotonicity
-        self.arg_curvature = arg_curvature
-        self.arg_sign = arg_sign
-        self.index = index
+    func_curvature = field(0)
+    monotonicity = field(1)
+    arg_curvature = field(2)
+    arg_sign = field(3)
 
-    # Core error message
-    def error_message(self):
+    # Returns the CompositionError for argument index.
+    def __new__(cls, func_curvature, monotonicity, arg_curvature, arg_sign, index):
+        return DCPViolation.record(CompositionError,
+                                   (func_curvature, monotonicity,
+                                    arg_curvature, arg_sign), index)
+
+    # Core error message for the fields.
+    @staticmethod
+    def render(func_curvature, monotonicity, arg_curvature, arg_sign):
         return " ".join([CompositionError.BASE_MSG, 
-                              CompositionError.type_to_name(self.func_curvature),
-                              CompositionError.type_to_name(self.monotonicity),
+                              CompositionError.type_to_name(func_curvature),
+                              CompositionError.type_to_name(monotonicity),
                               "with",
-                              CompositionError.type_to_name(self.arg_curvature),
-                              "argument"])
\ No newline at end of file
+                              CompositionError.type_to_name(arg_curvature),
+                              "argument"])
+
+catalog.add_records(CompositionError,
+                    catalog.combinations(catalog.CURVATURES,
+                                         catalog.MONOTONICITIES,
+                                         catalog.CURVATURES, catalog.SIGNS))
@@ -1,17 +1,29 @@
-from dcp_violation import DCPViolation
+from dcp_violation import DCPViolation, field
+import catalog
 
 class ConstraintError(DCPViolation):
     """ Represents a DCP violation through an improper constraint."""
+    __slots__ = ()
     BASE_MSG = "Illegal constraint:"
+    CONSTRAINTS = ['==', '<=', '>=']
 
-    def __init__(self, constraint_str, lh_curvature, rh_curvature):
-        self.constraint_str = constraint_str
-        self.lh_curvature = lh_curvature
-        self.rh_curvature = rh_curvature
+    constraint_str = field(0)
+    lh_curvature = field(1)
+    rh_curvature = field(2)
 
-    # Core error message
-    def error_message(self):
+    # Returns the ConstraintError for lh_curvature constraint_str rh_curvature.
+    def __new__(cls, constraint_str, lh_curvature, rh_curvature):
+        return DCPViolation.record(ConstraintError,
+                                   (constraint_str, lh_curvature, rh_curvature))
+
+    # Core error message for the fields.
+    @staticmethod
+    def render(constraint_str, lh_curvature, rh_curvature):
         return " ".join([ConstraintError.BASE_MSG, 
-                              ConstraintError.type_to_name(self.lh_curvature),
-                              self.constraint_str,
-                              ConstraintError.type_to_name(self.rh_curvature)])
\ No newline at end of file
+                              ConstraintError.type_to_name(lh_curvature),
+                              constraint_str,
+                              ConstraintError.type_to_name(rh_curvature)])
+
+catalog.add_records(ConstraintError,
+                    catalog.combinations(ConstraintError.CONSTRAINTS,
+                                         catalog.CURVATURES, catalog.CURVATURES))
@@ -1,12 +1,27 @@
 import abc
+import weakref
 from dcp_parser.expression.curvature import Curvature
 from dcp_parser.expression.sign import Sign
 from dcp_parser.atomic.monotonicity import Monotonicity
+import catalog
 import settings
 
 class DCPViolation(object):
-    """ Abstract base class for DCP Violations. """
+    """
+    Abstract base class for DCP Violations.
+    Subclasses declare their attributes in __slots__.
+
+    A violation is a small record: code is the catalog code of its class and
+    fields (the operator, curvatures, signs and monotonicity involved), and
+    a CompositionError also has the index of the argument. Violations keep
+    no references to the expressions involved, so they do not keep parse
+    trees alive. There is a single violation object for each record in use,
+    like Sign and Curvature, and messages are looked up in the catalog by code.
+    Subclasses make their fields readable by name (see field), render
+    their messages from the fields and add their records to the catalog.
+    """
     __metaclass__ = abc.ABCMeta
+    __slots__ = ('code',)
 
     # Maps curvature, monotonicity, and sign to the error message name.
     TYPE_TO_NAME = {
@@ -24,6 +39,42 @@ class DCPViolation(object):
                 str(Sign.UNKNOWN): 'unknown sign',
                 }
 
+    # The violation for each code, for violations without an index. There
+    # are at most as many as there are codes in the catalog.
+    INSTANCES = {}
+    # The violation for each (code, index) record of indexed violations.
+    # Argument indices have no bound, so these are only kept while in use,
+    # and indexed violation classes declare __weakref__ in __slots__.
+    INDEXED_INSTANCES = weakref.WeakValueDictionary()
+
+    # Returns the violation of class cls with the given fields, and the
+    # given argument index for indexed violations.
+    @staticmethod
+    def record(cls, fields, index=None):
+        code = catalog.CODES[(cls,) + fields]
+        if index is None:
+            violation = DCPViolation.INSTANCES.get(code)
+        else:
+            violation = DCPViolation.INDEXED_INSTANCES.get((code, index))
+        if violation is None:
+            violation = object.__new__(cls)
+            violation.code = code
+            if index is None:
+                DCPViolation.INSTANCES[code] = violation
+            else:
+                violation.index = index
+                DCPViolation.INDEXED_INSTANCES[(code, index)] = violation
+        return violation
+
+    # Violations are pickled and copied by class and fields,
+    # so there stays one of each.
+    def __reduce__(self):
+        return (record, (type(self), self.fields(), getattr(self, 'index', None)))
+
+    # Returns the fields of the violation.
+    def fields(self):
+        return catalog.FIELDS[self.code]
+
     # Maps curvature and monotonicity to the error message name.
     @staticmethod
     def type_to_name(type):
@@ -35,10 +86,18 @@ class DCPViolation(object):
         return hasattr(self, 'index')
 
     # Core error message
-    @abc.abstractmethod
     def error_message(self):
-        return NotImplemented
+        return catalog.MESSAGES[self.code]
 
     # Error message with preamble
     def __str__(self):
-        return settings.DCP_ERROR_MSG + self.error_message()
+        return settings.DCP_ERROR_MSG + catalog.MESSAGES[self.code]
+
+# Returns the violation of class cls with the given fields and index.
+# Used for unpickling.
+def record(cls, fields, index):
+    return DCPViolation.record(cls, fields, index)
+
+# Returns a property for the field at position i of the fields of a violation.
+def field(i):
+    return property(lambda self: catalog.FIELDS[self.code][i])
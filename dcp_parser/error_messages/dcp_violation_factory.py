@@ -1,18 +1,19 @@
 from dcp_parser.expression.curvature import Curvature
 from dcp_parser.expression.sign import Sign
 from dcp_parser.atomic.monotonicity import Monotonicity
-from operation_error import OperationError
-from composition_error import CompositionError
-from constraint_error import ConstraintError
 
 class DCPViolationFactory(object):
-    """ Factory class for OperationError and CompositionError. """
+    """
+    Factory class for OperationError and CompositionError.
+    The error classes are imported when the first violation is found.
+    """
 
     # Returns an OperationError if the operation resulted in 
     # a non-convex expression.
     @staticmethod
     def operation_error(op_str, lh_exp, rh_exp, result_exp):
         if result_exp.curvature == Curvature.NONCONVEX:
+            from operation_error import OperationError
             return [OperationError(op_str, lh_exp, rh_exp)]
         else:
             return []
@@ -26,6 +27,7 @@ class DCPViolationFactory(object):
             monotonicity = func_monotonicities[i]
             curvature = monotonicity.dcp_curvature(func_curvature, arg_curvatures[i])
             if curvature == Curvature.NONCONVEX:
+                from composition_error import CompositionError
                 err = CompositionError(func_curvature, monotonicity, arg_curvatures[i], arg_signs[i], i)
                 errors.append(err)
 
@@ -37,4 +39,5 @@ class DCPViolationFactory(object):
     # Returns a ConstraintError using the given curvatures and constraint string.
     @staticmethod
     def constraint_error(constraint_str, lh_curvature, rh_curvature):
+        from constraint_error import ConstraintError
         return [ConstraintError(constraint_str, lh_curvature, rh_curvature)]
\ No newline at end of file
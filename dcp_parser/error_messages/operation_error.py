@@ -1,46 +1,64 @@
 import dcp_parser.expression.settings as EXP_SET
-from dcp_violation import DCPViolation
+from dcp_violation import DCPViolation, field
 from dcp_parser.expression.curvature import Curvature
 from dcp_parser.expression.sign import Sign
+import catalog
 
 class OperationError(DCPViolation):
     """ Represents a DCP violation through arithmetic operations. """
+    __slots__ = ()
     BASE_MSG = "Illegal operation: "
+    OPERATORS = [EXP_SET.PLUS, EXP_SET.MINUS, EXP_SET.MULT, EXP_SET.DIV]
 
-    def __init__(self, op_str, lh_exp, rh_exp):
-        self.op_str = op_str
-        self.lh_exp = lh_exp
-        self.rh_exp = rh_exp
+    op_str = field(0)
+    lh_curvature = field(1)
+    lh_sign = field(2)
+    rh_curvature = field(3)
+    rh_sign = field(4)
 
-    # Generates the appropriate error message given the curvature of the
-    # lefthand and righthand expressions.
-    def generate_error_str(self):
-        lh_str = OperationError.type_to_name(self.lh_exp.curvature)
-        rh_str = OperationError.type_to_name(self.rh_exp.curvature)
+    # Returns the OperationError for lh_exp op_str rh_exp.
+    def __new__(cls, op_str, lh_exp, rh_exp):
+        return DCPViolation.record(OperationError,
+                                   (op_str, lh_exp.curvature, lh_exp.sign,
+                                    rh_exp.curvature, rh_exp.sign))
+
+    # Returns the names of the lefthand and righthand curvatures
+    # for the error message.
+    @staticmethod
+    def generate_error_str(op_str, lh_curvature, lh_sign, rh_curvature, rh_sign):
+        lh_str = OperationError.type_to_name(lh_curvature)
+        rh_str = OperationError.type_to_name(rh_curvature)
 
         # Sign can cause an error when a constant with unknown sign is
         # multiplied by or divides a convex or concave expression.
         # Otherwise sign does not matter.
-        if self.op_str == EXP_SET.MULT:
-            if OperationError.unknown_constant_error(self.lh_exp, self.rh_exp):
+        if op_str == EXP_SET.MULT:
+            if OperationError.unknown_constant_error(lh_curvature, lh_sign, rh_curvature):
                 lh_str = lh_str + " with unknown sign"
-            elif OperationError.unknown_constant_error(self.rh_exp, self.lh_exp):
+            elif OperationError.unknown_constant_error(rh_curvature, rh_sign, lh_curvature):
                 rh_str = rh_str + " with unknown sign"
-        if self.op_str == EXP_SET.DIV and \
-            OperationError.unknown_constant_error(self.rh_exp, self.lh_exp):
+        if op_str == EXP_SET.DIV and \
+            OperationError.unknown_constant_error(rh_curvature, rh_sign, lh_curvature):
             rh_str = rh_str + " with unknown sign"
 
         return (lh_str, rh_str)
 
-    # Checks if lefthand is an unknown constant and right hand is convex or concave.
+    # Checks if the constant is of unknown sign and the other expression
+    # is convex or concave.
     @staticmethod
-    def unknown_constant_error(const_exp, rh_exp):
-        return const_exp.curvature == Curvature.CONSTANT and \
-               const_exp.sign == Sign.UNKNOWN and \
-               (rh_exp.curvature == Curvature.CONVEX or \
-                rh_exp.curvature == Curvature.CONCAVE)
-
-    # Core error message
-    def error_message(self):
-        (lh_str, rh_str) = self.generate_error_str()
-        return "%s%s %s %s" % (OperationError.BASE_MSG, lh_str, self.op_str, rh_str)
\ No newline at end of file
+    def unknown_constant_error(const_curvature, const_sign, other_curvature):
+        return const_curvature == Curvature.CONSTANT and \
+               const_sign == Sign.UNKNOWN and \
+               (other_curvature == Curvature.CONVEX or \
+                other_curvature == Curvature.CONCAVE)
+
+    # Core error message for the fields.
+    @staticmethod
+    def render(*fields):
+        (lh_str, rh_str) = OperationError.generate_error_str(*fields)
+        return "%s%s %s %s" % (OperationError.BASE_MSG, lh_str, fields[0], rh_str)
+
+catalog.add_records(OperationError,
+                    catalog.combinations(OperationError.OPERATORS,
+                                         catalog.CURVATURES, catalog.SIGNS,
+                                         catalog.CURVATURES, catalog.SIGNS))
@@ -0,0 +1,112 @@
+"""
+Canonical keys of statements.
+
+Two statements have the same canonical key if they only differ in
+  the order of the terms of sums and products,
+  the order of the arguments of atoms in settings.SYMMETRIC_ATOMS,
+  the order of the sides of an equality, or x >= y written as y <= x,
+  parentheses, including those grouping sums and products,
+  double negation.
+So the key can be used to memoize the analysis of statements and to find
+duplicates in large generated models, where text or tree comparison
+misses trivially reordered input.
+
+A key is a string, e.g. "(+ (* (constant 2 POSITIVE) (variable y UNKNOWN))
+(variable x UNKNOWN))" for x + 2*y, so keys can be stored and compared
+across processes. Variables, parameters and constants carry their sign,
+so declarations with different signs give different keys. Constants and
+the parameters of atoms are keyed by value, so 2, 2.0 and 4/2 have the
+same key, and so do pow(x, 2) and pow(x, 2.0).
+"""
+import math
+import settings
+from statement import Statement
+from traversal import postorder
+from expression import Expression, NaryExpression, Variable, Parameter, Constant
+from constraints import EqConstraint, LeqConstraint, GeqConstraint
+
+# The start of the key of a negation.
+NEGATION_PREFIX = "(neg "
+# What comes before the parameter in the short name of an atom,
+# e.g. "pow(..., 2)", see atoms.Atom.short_name.
+PARAMETER_PREFIX = "(..., "
+
+# Returns the canonical key of a statement.
+def canonical_key(statement):
+    return canonical_keys([statement])[0]
+
+# Returns the canonical keys of the statements, in order.
+# Nodes shared by several statements (see node_table) are keyed once.
+def canonical_keys(statements):
+    keys = {}
+    terms = {}
+    seen = set()
+    for statement in statements:
+        for (path, node) in postorder(statement, seen):
+            keys[id(node)] = node_key(node, keys, terms)
+    return [keys[id(statement)] for statement in statements]
+
+# Returns the key of a node from the keys of its subexpressions.
+# The keys of the terms of sums and products are saved in terms,
+# so enclosing sums and products can take them over.
+def node_key(node, keys, terms):
+    if isinstance(node, Variable):
+        return "(variable %s %s)" % (node.short_name, node.sign)
+    elif isinstance(node, Parameter):
+        return "(parameter %s %s)" % (node.short_name, node.sign)
+    elif isinstance(node, Constant):
+        return "(constant %s %s)" % (number_key(node.value), node.sign)
+    sub_keys = [keys[id(sub)] if isinstance(sub, Statement) else repr(sub)
+                for sub in node.subexpressions]
+    if isinstance(node, NaryExpression):
+        # Terms that are sums (products) themselves are merged into the sum.
+        node_terms = []
+        for (sub, key) in zip(node.subexpressions, sub_keys):
+            if isinstance(sub, NaryExpression) and sub.op == node.op:
+                node_terms.extend(terms[id(sub)])
+            else:
+                node_terms.append(key)
+        node_terms.sort()
+        terms[id(node)] = node_terms
+        return "(%s %s)" % (node.op, " ".join(node_terms))
+    elif isinstance(node, EqConstraint):
+        sub_keys.sort()
+    elif isinstance(node, GeqConstraint):
+        return "(%s %s %s)" % (LeqConstraint.CONSTRAINT_STR,
+                               sub_keys[1], sub_keys[0])
+    elif node.short_name == settings.MINUS and len(sub_keys) == 1:
+        # -(-x) is x.
+        if sub_keys[0].startswith(NEGATION_PREFIX):
+            return sub_keys[0][len(NEGATION_PREFIX):-1]
+        return "%s%s)" % (NEGATION_PREFIX, sub_keys[0])
+    elif isinstance(node, Expression) and node.monotonicity is not None:
+        if node.short_name.split('(')[0] in settings.SYMMETRIC_ATOMS:
+            sub_keys.sort()
+        return "(%s %s)" % (atom_key(node.short_name), " ".join(sub_keys))
+    return "(%s %s)" % (node.short_name, " ".join(sub_keys))
+
+# Returns the key of the short name of an atom, with a numeric parameter
+# keyed by number_key, e.g. "pow(..., 2)" for "pow(..., 2.0)".
+def atom_key(short_name):
+    (head, prefix, parameter) = short_name.partition(PARAMETER_PREFIX)
+    if not prefix:
+        return short_name
+    parameter = parameter[:-1]
+    try:
+        value = int(parameter)
+    except ValueError:
+        try:
+            value = float(parameter)
+        except ValueError:
+            return short_name
+        # Inf is written as given.
+        if math.isinf(value) or math.isnan(value):
+            return short_name
+    return "%s%s%s)" % (head, prefix, number_key(value))
+
+# Returns the key of a number. Whole floats are keyed as the integer
+# they equal, as numbers that are equal have the same hash.
+def number_key(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(value).rstrip('L')
@@ -6,6 +6,8 @@ from dcp_parser.error_messages.dcp_violation_factory import DCPViolationFactory
 class Constraint(Statement):
     """ Abstract base class for all constraint types """
     __metaclass__ = abc.ABCMeta
+    __slots__ = ('lhs', 'rhs')
+
     def __init__(self, lhs, rhs):
         self.lhs = lhs
         self.rhs = rhs
@@ -30,6 +32,7 @@ class Constraint(Statement):
 
 class EqConstraint(Constraint):
     """ Represents an equality constraint """
+    __slots__ = ()
     CONSTRAINT_STR = "=="
 
     # Checks whether lhs and rhs are both affine.
@@ -44,6 +47,7 @@ class EqConstraint(Constraint):
 
 class LeqConstraint(Constraint):
     """ Represents a less than or equals constraint """
+    __slots__ = ()
     CONSTRAINT_STR = "<="
 
     # Checks whether lhs is convex and rhs is concave.
@@ -58,6 +62,7 @@ class LeqConstraint(Constraint):
 
 class GeqConstraint(Constraint):
     """ Represents an greater than or equals constraint """
+    __slots__ = ()
     CONSTRAINT_STR = ">="
 
     # Checks whether lhs is concave and rhs is convex.
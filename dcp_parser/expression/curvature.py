@@ -1,7 +1,14 @@
 from sign import Sign
 
 class Curvature(object):
-    """ Curvature for a convex optimization expression. """
+    """
+    Curvature for a convex optimization expression.
+    There is a single Curvature object for each curvature, so Curvature(str)
+    returns one of the class constants and curvatures are compared by
+    identity. The operators look up their results in tables built once
+    from the rules below.
+    """
+    __slots__ = ('curvature_str', 'index')
     CONSTANT_KEY = 'CONSTANT'
     AFFINE_KEY = 'AFFINE'
     CONVEX_KEY = 'CONVEX'
@@ -27,13 +34,24 @@ class Curvature(object):
     NEGATION_MAP = {CONVEX_KEY: CONCAVE_KEY, CONCAVE_KEY: CONVEX_KEY}
     # For multiplying curvature by unknown sign.
     UNKNOWN_MAP = {CONVEX_KEY: NONCONVEX_KEY, CONCAVE_KEY: NONCONVEX_KEY}
+
+    # Order of the curvatures in the lookup tables.
+    KEYS = [CONSTANT_KEY, AFFINE_KEY, CONVEX_KEY, CONCAVE_KEY, NONCONVEX_KEY]
+
+    # The Curvature for each key.
+    INSTANCES = {}
     
-    def __init__(self,curvature_str):
-        curvature_str = curvature_str.upper()
-        if curvature_str in Curvature.VEXITY_MAP.keys():
-            self.curvature_str = curvature_str
-        else:
-            raise Exception("No such curvature %s exists." % str(curvature_str))
+    def __new__(cls, curvature_str):
+        curvature = Curvature.INSTANCES.get(curvature_str)
+        if curvature is None:
+            curvature = Curvature.INSTANCES.get(curvature_str.upper())
+            if curvature is None:
+                raise Exception("No such curvature %s exists." % str(curvature_str))
+        return curvature
+
+    # Curvatures are pickled and copied by key, so there stays one of each.
+    def __reduce__(self):
+        return (Curvature, (self.curvature_str,))
         
     def __repr__(self):
         return "Curvature('%s')" % self.curvature_str
@@ -42,25 +60,22 @@ class Curvature(object):
         return self.curvature_str
         
     def __add__(self, other):
-        curvature_val = Curvature.VEXITY_MAP[self.curvature_str] | Curvature.VEXITY_MAP[other.curvature_str]
-        for key,val in Curvature.VEXITY_MAP.items():
-            if val == curvature_val:
-                return Curvature(key)
+        return Curvature.SUMS[self.index][other.index]
 
     # Returns whether the curvature is affine, 
     # counting constant expressions as affine.
     def is_affine(self):
-        return self == Curvature.CONSTANT or self == Curvature.AFFINE
+        return self is Curvature.CONSTANT or self is Curvature.AFFINE
 
     # Returns whether the curvature is convex, 
     # counting affine and constant expressions as convex.
     def is_convex(self):
-        return self.is_affine() or self == Curvature.CONVEX
+        return self.is_affine() or self is Curvature.CONVEX
 
     # Returns whether the curvature is concave, 
     # counting affine and constant expressions as concave.
     def is_concave(self):
-        return self.is_affine() or self == Curvature.CONCAVE
+        return self.is_affine() or self is Curvature.CONCAVE
 
     # Sums list of curvatures
     @staticmethod
@@ -71,46 +86,80 @@ class Curvature(object):
         return sum_curvature
     
     def __sub__(self, other):
-        return self + -other
+        return Curvature.DIFFERENCES[self.index][other.index]
 
     # Captures effect on curvature of multiplication or division by a signed constant.
     # e.g. negative constant * convex == concave
     def sign_mult(self, sign):
-        if sign == Sign.UNKNOWN:
-            curvature_str = Curvature.UNKNOWN_MAP.get(self.curvature_str, self.curvature_str)
-            return Curvature(curvature_str)
-        elif sign == Sign.ZERO:
-            return Curvature.CONSTANT
-        elif sign == Sign.NEGATIVE:
-            curvature_str = Curvature.NEGATION_MAP.get(self.curvature_str, self.curvature_str)
-            return Curvature(curvature_str)
-        else: # Positive sign
-            return self
+        return Curvature.SIGN_MULTS[self.index][sign.index]
        
     def __mul__(self, other):
-        if self == Curvature.CONSTANT or other == Curvature.CONSTANT:
-            return self + other
-        else:
-            return Curvature.NONCONVEX
+        return Curvature.PRODUCTS[self.index][other.index]
 
     def __div__(self, other):
-        if other == Curvature.CONSTANT:
-            return self + other
-        else:
-            return Curvature.NONCONVEX
+        return Curvature.QUOTIENTS[self.index][other.index]
         
     def __neg__(self):
-        return self.sign_mult(Sign.NEGATIVE)
-        
-    def __eq__(self,other):
-        return self.curvature_str == other.curvature_str
-    
-    def __ne__(self,other):
-        return self.curvature_str != other.curvature_str
+        return Curvature.NEGATIONS[self.index]
 
-# Class constants for all curvature types.
+# Class constants for all curvature types, the only Curvature objects.
+# index is the position in KEYS.
+def make_curvatures():
+    for (index, key) in enumerate(Curvature.KEYS):
+        curvature = object.__new__(Curvature)
+        curvature.curvature_str = key
+        curvature.index = index
+        Curvature.INSTANCES[key] = curvature
+make_curvatures()
 Curvature.CONSTANT = Curvature(Curvature.CONSTANT_KEY)
 Curvature.AFFINE = Curvature(Curvature.AFFINE_KEY)
 Curvature.CONVEX = Curvature(Curvature.CONVEX_KEY)
 Curvature.CONCAVE = Curvature(Curvature.CONCAVE_KEY)
-Curvature.NONCONVEX = Curvature(Curvature.NONCONVEX_KEY)
\ No newline at end of file
+Curvature.NONCONVEX = Curvature(Curvature.NONCONVEX_KEY)
+
+# Rules the lookup tables are built from.
+
+# Returns the curvature of a sum, combining VEXITY_MAP values with bitwise OR.
+def curvature_sum(lhs, rhs):
+    vexity = Curvature.VEXITY_MAP[lhs.curvature_str] | Curvature.VEXITY_MAP[rhs.curvature_str]
+    for (key, value) in Curvature.VEXITY_MAP.items():
+        if value == vexity:
+            return Curvature(key)
+
+# Returns the curvature multiplied by a constant of the given sign.
+def sign_mult(curvature, sign):
+    if sign is Sign.UNKNOWN:
+        return Curvature(Curvature.UNKNOWN_MAP.get(curvature.curvature_str,
+                                                   curvature.curvature_str))
+    elif sign is Sign.ZERO:
+        return Curvature.CONSTANT
+    elif sign is Sign.NEGATIVE:
+        return Curvature(Curvature.NEGATION_MAP.get(curvature.curvature_str,
+                                                    curvature.curvature_str))
+    else: # Positive sign
+        return curvature
+
+# Returns the curvature of a product, which is only known if one side is constant.
+def product(lhs, rhs):
+    if lhs is Curvature.CONSTANT or rhs is Curvature.CONSTANT:
+        return curvature_sum(lhs, rhs)
+    else:
+        return Curvature.NONCONVEX
+
+# Returns the curvature of a quotient, which is only known for constant divisors.
+def quotient(lhs, rhs):
+    if rhs is Curvature.CONSTANT:
+        return curvature_sum(lhs, rhs)
+    else:
+        return Curvature.NONCONVEX
+
+# Lookup tables for the operators, indexed by position in KEYS
+# (and for SIGN_MULTS, by Sign index).
+CURVATURES = [Curvature(key) for key in Curvature.KEYS]
+SIGNS = sorted(Sign.INSTANCES.values(), key=lambda sign: sign.index)
+Curvature.SUMS = [[curvature_sum(lhs, rhs) for rhs in CURVATURES] for lhs in CURVATURES]
+Curvature.SIGN_MULTS = [[sign_mult(lhs, sign) for sign in SIGNS] for lhs in CURVATURES]
+Curvature.NEGATIONS = [sign_mult(curvature, Sign.NEGATIVE) for curvature in CURVATURES]
+Curvature.DIFFERENCES = [[lhs + -rhs for rhs in CURVATURES] for lhs in CURVATURES]
+Curvature.PRODUCTS = [[product(lhs, rhs) for rhs in CURVATURES] for lhs in CURVATURES]
+Curvature.QUOTIENTS = [[quotient(lhs, rhs) for rhs in CURVATURES] for lhs in CURVATURES]
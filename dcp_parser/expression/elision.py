@@ -0,0 +1,170 @@
+"""
+Renders statements in a bounded number of characters.
+
+The name of a node of a generated model can be megabytes long. bounded_str
+gives at most limit characters: the whole name if it fits, and otherwise
+the name with the middle of wide subexpressions replaced by
+settings.ELLIPSIS, e.g. "max(x1, x2, ..., x99998)", and subexpressions that
+still do not fit cut short. Names are only rendered as far as the limit, so
+the time taken follows the length of the result rather than the size of
+the statement.
+"""
+import settings
+from expression import Expression
+from constraints import Constraint
+
+# Returns the string representation of a statement cut to at most limit
+# characters, see the module docstring.
+def bounded_str(statement, limit):
+    out = []
+    # Strings to output and (node, budget, fits) tasks, where fits says
+    # whether the node may fit in budget characters (if not, it is elided
+    # without trying to render it in full).
+    tasks = [(statement, limit, True)]
+    while tasks:
+        task = tasks.pop()
+        if isinstance(task, basestring):
+            out.append(task)
+            continue
+        (node, budget, fits) = task
+        if fits:
+            text = fitting_name(node, budget)
+            if text is not None:
+                out.append(text)
+                continue
+        tasks.extend(reversed(elide(node, budget)))
+    return ''.join(out)
+
+# Returns the name of node if it has at most limit characters, and None
+# otherwise. Every part still to be rendered adds at least one character,
+# so rendering stops once the parts left would not fit either, e.g. before
+# reaching the first character of a long left-nested chain.
+def fitting_name(node, limit):
+    out = []
+    size = 0
+    stack = [((node,), 0)]
+    while stack:
+        if size + len(stack) > limit:
+            return None
+        (parts, index) = stack.pop()
+        if index + 1 < len(parts):
+            stack.append((parts, index + 1))
+        item = parts[index]
+        if isinstance(item, basestring):
+            text = item
+        elif not isinstance(item, (Expression, Constraint)):
+            text = str(item)
+        elif isinstance(item, Expression) and item.name_cache is not None:
+            text = ('(' * item.parens) + item.name_cache + (')' * item.parens)
+        else:
+            (opening, parts, closing) = node_parts(item)
+            if len(closing) > 0:
+                stack.append(((closing,), 0))
+            if len(parts) > 0:
+                stack.append((parts, 0))
+            text = opening
+        out.append(text)
+        size += len(text)
+    if size > limit:
+        return None
+    return ''.join(out)
+
+# Returns the pieces of the name of a node that does not fit in budget
+# characters, as strings and tasks for bounded_str, in order.
+# A node with one subexpression keeps the text around it and elides the
+# subexpression. A node with several keeps as many subexpressions from the
+# start as fit and the last one in up to half of the budget, with the
+# ellipsis between them.
+def elide(node, budget):
+    if not isinstance(node, (Expression, Constraint)):
+        return [cut(str(node), budget)]
+    (opening, parts, closing) = node_parts(node)
+    first = 0
+    while first < len(parts) and isinstance(parts[first], basestring):
+        first += 1
+    if first == len(parts):
+        return [cut(opening + ''.join(parts) + closing, budget)]
+    last = len(parts) - 1
+    while isinstance(parts[last], basestring):
+        last -= 1
+    opening += ''.join(parts[i] for i in range(first))
+    closing = ''.join(parts[i] for i in range(last + 1, len(parts))) + closing
+    inner = budget - len(opening) - len(closing)
+    if inner < len(settings.ELLIPSIS):
+        return [cut(opening + settings.ELLIPSIS + closing, budget)]
+    if first == last:
+        return [opening, (parts[first], inner, False), closing]
+
+    # The text between the first two subexpressions separates them all.
+    (separator, second) = next_separator(parts, first)
+    if second == last:
+        gap = separator
+    else:
+        gap = separator + settings.ELLIPSIS + separator
+    last_budget = inner // 2
+    last_text = fitting_name(parts[last], last_budget)
+    if last_text is not None:
+        tail = last_text
+        last_budget = len(last_text)
+    else:
+        tail = (parts[last], last_budget, False)
+    room = inner - last_budget - len(gap)
+    if room < len(settings.ELLIPSIS):
+        return [opening, settings.ELLIPSIS, closing]
+
+    pieces = [opening]
+    used = 0
+    index = first
+    while True:
+        text = fitting_name(parts[index], room - used)
+        if text is None:
+            if index == first:
+                pieces.append((parts[index], room, False))
+                pieces.append(gap)
+            else:
+                # The separator before this subexpression is already out.
+                pieces.append(settings.ELLIPSIS + separator)
+            break
+        pieces.append(text)
+        used += len(text)
+        (between, index) = next_separator(parts, index)
+        if index == last:
+            # Everything but the last subexpression fits.
+            pieces.append(between)
+            break
+        if used + len(between) > room:
+            pieces.append(gap)
+            break
+        pieces.append(between)
+        used += len(between)
+    pieces.append(tail)
+    pieces.append(closing)
+    return pieces
+
+# Returns the text before a node's parts, the sequence of strings and
+# subexpressions the name is made of, and the text after them.
+def node_parts(node):
+    if isinstance(node, Constraint):
+        return ('', (node.lhs, " %s " % node.CONSTRAINT_STR, node.rhs), '')
+    parts = node.render_parts()
+    if isinstance(parts, basestring):
+        parts = (parts,)
+    return ('(' * node.parens, parts, ')' * node.parens)
+
+# Returns the strings after the subexpression parts[index], joined, and the
+# index of the next subexpression.
+def next_separator(parts, index):
+    index += 1
+    strings = []
+    while isinstance(parts[index], basestring):
+        strings.append(parts[index])
+        index += 1
+    return (''.join(strings), index)
+
+# Returns text cut to budget characters, ending in the ellipsis if cut.
+def cut(text, budget):
+    if len(text) <= budget:
+        return text
+    if budget < len(settings.ELLIPSIS):
+        return settings.ELLIPSIS[:budget]
+    return text[:budget - len(settings.ELLIPSIS)] + settings.ELLIPSIS
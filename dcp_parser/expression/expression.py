@@ -1,12 +1,16 @@
 # from utils import error_msg, id_wrapper, \
 #     isunknown, ispositive, isnegative, \
 #     isaff, iscvx, isccv, ismatrix, isscalar, isvector   
+import copy
+import operator
 import settings
 from sign import Sign
 from curvature import Curvature
 from sys import maxint
 from numbers import Number
-from statement import Statement
+from statement import Statement, structural_hash
+from violations import summarize, NO_VIOLATIONS
+from traversal import postorder
 from constraints import EqConstraint, GeqConstraint, LeqConstraint
 from dcp_parser.error_messages.dcp_violation_factory import DCPViolationFactory
 
@@ -22,25 +26,70 @@ class Expression(Statement):
     Errors records the DCP violations introduced by forming the expression.
     Monotonicity stores the monotonicity in each argument for atomic functions.
     short_name is the name without the subexpressions, i.e. "x + y" is "+".
+
+    name is rendered on demand from name_parts, which is either a string or
+    a tuple of strings, Expressions and other arguments (e.g. numbers) whose
+    names are joined in order. So "x + y" is stored as (x, " + ", y) and
+    building an expression takes constant time and memory whatever its size.
+    parens counts the parentheses around the name.
+
+    Expressions are not changed once built (parenthesized returns a copy),
+    so they can be shared by statements, threads and caches.
+    The fingerprint of an expression without subexpressions covers its
+    name, curvature and sign, see leaf_fingerprint.
     """
+    __slots__ = ('curvature', 'sign', 'name_parts', 'name_cache', 'parens',
+                 'monotonicity')
 
     def __init__(self, curvature, sign, name, 
                  subexpressions = [],
                  errors = [],
                  monotonicity = None,
-                 short_name = None): 
+                 short_name = None,
+                 fingerprint = None,
+                 violations = None): 
         self.curvature = curvature
         self.sign = sign
         self.name = name
+        self.parens = 0
         self.monotonicity = monotonicity
         # If no short_name given, default to the full name.
         if short_name is None:
             short_name = self.name
-        super(Expression, self).__init__(short_name, subexpressions, errors)
+        if fingerprint is None and len(subexpressions) == 0:
+            fingerprint = leaf_fingerprint(short_name, curvature, sign)
+        super(Expression, self).__init__(short_name, subexpressions, errors,
+                                         fingerprint, violations)
+
+    # The string representation of the expression.
+    # Kept once rendered if settings.CACHE_NAMES is True.
+    @property
+    def name(self):
+        if self.name_cache is not None:
+            return self.name_cache
+        name = render_name(self)
+        if settings.CACHE_NAMES:
+            self.name_cache = name
+        return name
 
-    # Adds parentheses around the string representation of the expression.
-    def add_parens(self):
-        self.name = "(" + self.name + ")"
+    @name.setter
+    def name(self, name):
+        self.name_parts = name
+        self.name_cache = None
+
+    # Returns the strings, expressions and other arguments
+    # the name is rendered from, in order.
+    def render_parts(self):
+        return self.name_parts
+
+    # Returns a copy of the expression with parentheses
+    # around its string representation.
+    def parenthesized(self):
+        exp = copy.copy(self)
+        exp.parens = self.parens + 1
+        exp.name_cache = None
+        exp.violations = self.violations.for_copy(self, exp)
+        return exp
 
     # Verifies that expression is a number or an expression. 
     # If it is a number, it is converted to a constant.
@@ -55,71 +104,44 @@ class Expression(Statement):
                             "type number or Expression, but is type %s."
                             % (str(expression), expression.__class__.__name__))
     
+    # Sums are NaryExpressions, see NaryExpression.combine.
     def __add__(self, other):
-        exp = Expression(self.curvature + other.curvature,
-                          self.sign + other.sign,
-                          "%s %s %s" % (self.name, settings.PLUS, other.name),
-                          [self,other],
-                          short_name = settings.PLUS)
-        exp.errors = DCPViolationFactory.operation_error(settings.PLUS, self, other, exp)
-        return exp
+        return NaryExpression.combine(settings.PLUS, self, other)
 
     # Called if var + Expression not implemented, with arguments reversed.
     def __radd__(self, other):
         return settings.type_check(other) + self
     
     def __sub__(self, other):
-        exp = Expression(self.curvature - other.curvature,
-                          self.sign - other.sign,
-                          "%s %s %s" % (self.name, settings.MINUS, other.name),
+        (curvature, sign) = operation_result(settings.MINUS, self, other)
+        exp = Expression(curvature,
+                          sign,
+                          (self, " %s " % settings.MINUS, other),
                           [self,other],
                           short_name = settings.MINUS)
-        exp.errors = DCPViolationFactory.operation_error(settings.MINUS, self, other, exp)
+        exp._set_errors(DCPViolationFactory.operation_error(settings.MINUS, self, other, exp))
         return exp
 
     # Called if var - Expression not implemented, with arguments reversed.
     def __rsub__(self, other):
         return Expression.type_check(other) - self
 
-    # Adjust curvature based on sign of subexpressions.
-    # Used for multiplication and division.
-    # Only constant expressions can change the curvature,
-    # e.g. negative constant * convex == concave
-    # For multiplication by non-constants, the curvature
-    # is always nonconvex.
-    def sign_by_curvature(self):
-        for i in range(len(self.subexpressions)):
-            curvature = self.subexpressions[i].curvature
-            sign = self.subexpressions[i].sign
-            if curvature == Curvature.CONSTANT:
-                self.curvature = self.curvature.sign_mult(sign)
-
+    # Products are NaryExpressions, see NaryExpression.combine.
     def __mul__(self, other):
-        sign = self.sign * other.sign
-        curvature = self.curvature * other.curvature
-        exp = Expression(curvature, 
-                         sign, 
-                         "%s %s %s" % (self.name, settings.MULT, other.name),
-                         [self,other],
-                         short_name = settings.MULT)
-        exp.sign_by_curvature()
-        exp.errors = DCPViolationFactory.operation_error(settings.MULT, self, other, exp)
-        return exp
+        return NaryExpression.combine(settings.MULT, self, other)
 
     # Called if var * Expression not implemented, with arguments reversed.
     def __rmul__(self, other):
         return Expression.type_check(other) * self
 
     def __div__(self, other):
-        sign = self.sign / other.sign
-        curvature = self.curvature / other.curvature
+        (curvature, sign) = operation_result(settings.DIV, self, other)
         exp = Expression(curvature, 
                          sign, 
-                         "%s %s %s" % (self.name, settings.DIV, other.name),
+                         (self, " %s " % settings.DIV, other),
                          [self,other],
                          short_name = settings.DIV)
-        exp.sign_by_curvature()
-        exp.errors = DCPViolationFactory.operation_error(settings.DIV, self, other, exp)
+        exp._set_errors(DCPViolationFactory.operation_error(settings.DIV, self, other, exp))
         return exp
 
     # Called if var / Expression not implemented, with arguments reversed.
@@ -130,7 +152,7 @@ class Expression(Statement):
         self = Expression.type_check(self)
         return Expression(-self.curvature,
                           -self.sign,
-                          '-' + str(self), 
+                          (settings.MINUS, self),
                           [self],
                           short_name = settings.MINUS)
     
@@ -145,21 +167,240 @@ class Expression(Statement):
            
     def __repr__(self):
         """Representation in Python"""
-        return "Expression(%s, %s, %s, %s, %s, %s, %s)" % (self.curvature,
-                                                           self.sign, 
-                                                           self.name, 
-                                                           self.subexpressions,
-                                                           self.errors,
-                                                           self.monotonicity,
-                                                           self.short_name)
+        return expression_repr(self)
     
     def __str__(self):
         """String representation"""
         return self.name
 
 
+# Renders the name of an Expression from its name_parts and those of its
+# parts, with a stack instead of recursion so deep trees can be rendered.
+def render_name(expression):
+    out = []
+    stack = [expression]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, basestring):
+            out.append(item)
+        elif not isinstance(item, Expression):
+            out.append(str(item))
+        elif item.name_cache is not None:
+            out.append(item.name_cache)
+        else:
+            if item.parens > 0:
+                stack.append(')' * item.parens)
+            parts = item.render_parts()
+            if isinstance(parts, basestring):
+                stack.append(parts)
+            else:
+                stack.extend(reversed(parts))
+            if item.parens > 0:
+                stack.append('(' * item.parens)
+    return ''.join(out)
+
+# Returns repr(expression). The representations of the subexpressions are
+# worked out first, from the bottom up, instead of recursively: each node
+# takes those of its subexpressions off the top of a stack of results.
+def expression_repr(expression):
+    results = []
+    for (path, node) in postorder(expression):
+        subexpressions = node.subexpressions
+        count = sum(1 for sub in subexpressions if isinstance(sub, Statement))
+        sub_reprs = iter(results[len(results) - count:])
+        del results[len(results) - count:]
+        if not (isinstance(node, Expression) and
+                type(node).__repr__ == Expression.__repr__):
+            results.append(repr(node))
+            continue
+        sub_reprs = [next(sub_reprs) if isinstance(sub, Statement) else repr(sub)
+                     for sub in subexpressions]
+        results.append("Expression(%s, %s, %s, [%s], %s, %s, %s)" % (
+                       node.curvature,
+                       node.sign,
+                       node.name,
+                       ", ".join(sub_reprs),
+                       node.errors,
+                       node.monotonicity,
+                       node.short_name))
+    return results[0]
+
+# Returns the fingerprint of an expression without subexpressions,
+# e.g. a Variable or Parameter.
+def leaf_fingerprint(short_name, curvature, sign):
+    return structural_hash((short_name, str(curvature), str(sign)), ())
+
+
+class NaryExpression(Expression):
+    """
+    A sum or product of two or more terms, e.g. "x + y + z".
+    op is settings.PLUS or settings.MULT.
+
+    Adding a term to a sum (or multiplying a product) that is not in
+    parentheses gives a new NaryExpression with one more term instead of a
+    binary expression, so a chain of any length is one level deep.
+    The sign, curvature and errors are those of the binary expressions
+    the chain replaces, worked out one term at a time.
+
+    The new NaryExpression shares its lists of terms and errors with the old
+    one: the new entries are appended and each NaryExpression only uses the
+    first term_count terms and error_count errors. A list is only copied
+    when a shorter chain is extended again, so building a chain term by
+    term takes linear time and memory.
+
+    The fingerprint of a chain is that of the chain without its last term
+    combined with the fingerprint of the last term (see chain_fingerprint),
+    so it also takes constant time to extend, and so does its summary of
+    violations, from that of the chain and of the last term.
+    """
+    __slots__ = ('op', 'term_list', 'term_count', 'error_list', 'error_count')
+
+    def __init__(self, op, curvature, sign, terms, errors, fingerprint = None,
+                 violations = None):
+        self.op = op
+        if fingerprint is None:
+            fingerprint = hash((op,))
+            for term in terms:
+                fingerprint = NaryExpression.chain_fingerprint(fingerprint, term)
+        super(NaryExpression, self).__init__(curvature, sign, None, terms,
+                                             errors, short_name=op,
+                                             fingerprint=fingerprint,
+                                             violations=violations)
+
+    # The terms of the chain.
+    @property
+    def subexpressions(self):
+        if len(self.term_list) == self.term_count:
+            return self.term_list
+        return self.term_list[:self.term_count]
+
+    @subexpressions.setter
+    def subexpressions(self, terms):
+        self.term_list = terms
+        self.term_count = len(terms)
+
+    # The violations introduced by each operation in the chain.
+    @property
+    def errors(self):
+        if len(self.error_list) == self.error_count:
+            return self.error_list
+        return self.error_list[:self.error_count]
+
+    @errors.setter
+    def errors(self, errors):
+        self.error_list = errors
+        self.error_count = len(errors)
+
+    # The terms separated by the operator, see NaryParts.
+    def render_parts(self):
+        return NaryParts(self)
+
+    # Saves only the terms and errors of this chain, not those a longer
+    # chain appended to the shared lists, see Statement.__getstate__.
+    def __getstate__(self):
+        state = super(NaryExpression, self).__getstate__()
+        state['term_list'] = self.subexpressions
+        state['error_list'] = self.errors
+        return state
+
+    # Returns lh_exp op rh_exp for op settings.PLUS or settings.MULT,
+    # extending lh_exp if it is a chain of the same operator.
+    @staticmethod
+    def combine(op, lh_exp, rh_exp):
+        (curvature, sign) = operation_result(op, lh_exp, rh_exp)
+        if isinstance(lh_exp, NaryExpression) and lh_exp.op == op and \
+           lh_exp.parens == 0:
+            terms = extend_prefix(lh_exp.term_list, lh_exp.term_count, [rh_exp])
+            errors = extend_prefix(lh_exp.error_list, lh_exp.error_count, [])
+            fingerprint = lh_exp.fingerprint
+            parts = [(None, lh_exp.violations)]
+        else:
+            terms = [lh_exp, rh_exp]
+            errors = []
+            fingerprint = NaryExpression.chain_fingerprint(hash((op,)), lh_exp)
+            parts = [(0, lh_exp.violations)]
+        # The violations are summarized once the new errors are known.
+        exp = NaryExpression(op, curvature, sign, terms, errors,
+                             NaryExpression.chain_fingerprint(fingerprint, rh_exp),
+                             NO_VIOLATIONS)
+        new_errors = DCPViolationFactory.operation_error(op, lh_exp, rh_exp, exp)
+        if len(new_errors) > 0:
+            exp.errors = extend_prefix(errors, exp.error_count, new_errors)
+        parts.append((exp.term_count - 1, rh_exp.violations))
+        if len(new_errors) > 0 or parts[0][1].count > 0 or \
+           rh_exp.violations.count > 0:
+            exp.violations = summarize(exp, new_errors, parts)
+        return exp
+
+    # Returns the fingerprint of a chain with the given fingerprint
+    # extended by term.
+    @staticmethod
+    def chain_fingerprint(fingerprint, term):
+        return hash((fingerprint, term.fingerprint))
+
+
+class NaryParts(object):
+    """
+    The terms of a NaryExpression separated by its operator, as a sequence
+    that looks the parts up in the list of terms instead of copying them,
+    so rendering the start of a long chain does not touch the rest.
+    """
+    __slots__ = ('terms', 'count', 'separator')
+
+    def __init__(self, expression):
+        self.terms = expression.term_list
+        self.count = expression.term_count
+        self.separator = " %s " % expression.op
+
+    def __len__(self):
+        return 2 * self.count - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if index % 2 == 1:
+            return self.separator
+        return self.terms[index // 2]
+
+
+# Returns the curvature and sign of lh_exp op rh_exp.
+# For multiplication and division, only constant expressions can change
+# the curvature, e.g. negative constant * convex == concave.
+# For multiplication by non-constants, the curvature is always nonconvex.
+def operation_result(op, lh_exp, rh_exp):
+    if op == settings.PLUS:
+        return (lh_exp.curvature + rh_exp.curvature, lh_exp.sign + rh_exp.sign)
+    elif op == settings.MINUS:
+        return (lh_exp.curvature - rh_exp.curvature, lh_exp.sign - rh_exp.sign)
+    elif op == settings.MULT:
+        sign = lh_exp.sign * rh_exp.sign
+        curvature = lh_exp.curvature * rh_exp.curvature
+    else:
+        sign = lh_exp.sign / rh_exp.sign
+        curvature = lh_exp.curvature / rh_exp.curvature
+    for exp in (lh_exp, rh_exp):
+        if exp.curvature is Curvature.CONSTANT:
+            curvature = curvature.sign_mult(exp.sign)
+    return (curvature, sign)
+
+# Returns the first count items followed by new_items, appending to items
+# itself if nothing has been appended after the first count items yet.
+# Another thread may extend the same list at the same time, so the new items
+# are only kept in place if they landed right after the first count items.
+def extend_prefix(items, count, new_items):
+    if len(items) == count:
+        items.extend(new_items)
+        if all(items[count + i] is item for (i, item) in enumerate(new_items)):
+            return items
+    return items[:count] + new_items
+
+
 class Variable(Expression):
     """ A convex optimization variable. """
+    __slots__ = ()
+
     def __init__(self, name, sign=Sign.UNKNOWN):
         super(Variable, self).__init__(Curvature.AFFINE,
                                        sign,
@@ -174,6 +415,8 @@ class Variable(Expression):
         
 class Parameter(Expression):
     """ A convex optimization parameter. """
+    __slots__ = ()
+
     def __init__(self, name, sign):
         super(Parameter, self).__init__(Curvature.CONSTANT,
                                         sign,
@@ -186,16 +429,82 @@ class Parameter(Expression):
     
         
 class Constant(Expression):
-    def __init__(self, value):
-        if value > 0:
-            sign_str = Sign.POSITIVE_KEY
-        elif value == 0:
-            sign_str = Sign.ZERO_KEY
-        else:
-            sign_str = Sign.NEGATIVE_KEY
+    """
+    A numeric constant. value is the number itself.
+
+    Arithmetic on Constants is folded into a single Constant as it is built,
+    so "2 * 3" is one node with value 6. A folded Constant keeps the name it
+    was written with and the sign given by the sign rules, so the analysis
+    is the same as for the unfolded expression.
+    The fingerprint covers the value and sign, not the name.
+    """
+    __slots__ = ('value',)
+
+    # sign and name default to those of the value.
+    def __init__(self, value, sign = None, name = None):
+        if sign is None:
+            if value > 0:
+                sign = Sign.POSITIVE
+            elif value == 0:
+                sign = Sign.ZERO
+            else:
+                sign = Sign.NEGATIVE
+        if name is None:
+            name = str(value)
+        fingerprint = structural_hash((Constant.__name__, value, str(sign)), ())
         super(Constant, self).__init__(Curvature.CONSTANT, 
-                                       Sign(sign_str),
-                                       str(value))
-        
+                                       sign,
+                                       name,
+                                       fingerprint = fingerprint)
+        self.value = value
+
+    # Returns lh_exp op rh_exp as a Constant if rh_exp is a Constant,
+    # and None if it is not or the value cannot be computed, e.g. 1/(2 - 2).
+    @staticmethod
+    def fold(op, lh_exp, rh_exp):
+        if not isinstance(rh_exp, Constant):
+            return None
+        (curvature, sign) = operation_result(op, lh_exp, rh_exp)
+        try:
+            value = FOLDS[op](lh_exp.value, rh_exp.value)
+        except (ZeroDivisionError, OverflowError):
+            return None
+        return Constant(value, sign,
+                        "%s %s %s" % (lh_exp.name, op, rh_exp.name))
+
+    def __add__(self, other):
+        exp = Constant.fold(settings.PLUS, self, other)
+        return Expression.__add__(self, other) if exp is None else exp
+
+    def __sub__(self, other):
+        exp = Constant.fold(settings.MINUS, self, other)
+        return Expression.__sub__(self, other) if exp is None else exp
+
+    def __mul__(self, other):
+        exp = Constant.fold(settings.MULT, self, other)
+        return Expression.__mul__(self, other) if exp is None else exp
+
+    def __div__(self, other):
+        exp = Constant.fold(settings.DIV, self, other)
+        return Expression.__div__(self, other) if exp is None else exp
+
+    def __neg__(self):
+        return Constant(-self.value, -self.sign, settings.MINUS + self.name)
+
+    # Returns whether the constant is written as a number, e.g. "2" or "-1.5",
+    # rather than as arithmetic on numbers or in parentheses.
+    def is_literal(self):
+        try:
+            float(self.name)
+        except ValueError:
+            return False
+        return True
+
     def __repr__(self):
-        return "Constant(%s)" % self.name
\ No newline at end of file
+        return "Constant(%s)" % self.name
+
+# Functions computing the value of folded Constants, by operator.
+FOLDS = {settings.PLUS: operator.add,
+         settings.MINUS: operator.sub,
+         settings.MULT: operator.mul,
+         settings.DIV: operator.truediv}
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Hash-consing of expressions.
+
+The parser builds expressions through a NodeBuilder. The default builder
+makes a new expression for every occurrence of a subterm. A NodeTable makes
+structurally identical subexpressions the same object, so a model that
+repeats square(x) or a*z thousands of times builds and analyzes each of them
+once, and the statements form a DAG. Code that walks statements through
+subexpressions still sees the logical tree, visiting a shared node once for
+each place it occurs; distinct_nodes visits each node once.
+"""
+from expression import Constant
+from traversal import preorder
+
+class NodeBuilder(object):
+    """ Builds a new expression for every call. """
+
+    # Returns lhs op rhs for op in '+', '-', '*' and '/'.
+    def binary(self, op, lhs, rhs):
+        if op == '+': return lhs + rhs
+        elif op == '-': return lhs - rhs
+        elif op == '*': return lhs * rhs
+        elif op == '/': return lhs / rhs
+
+    # Returns -expression.
+    def negate(self, expression):
+        return -expression
+
+    # Returns the expression in parentheses.
+    def group(self, expression):
+        return expression.parenthesized()
+
+    # Returns the Constant for a number.
+    def constant(self, value):
+        return Constant(value)
+
+    # Returns the result of applying an atomic function
+    # (see atom_loader.make_atomic_func) to the arguments.
+    def atom(self, atom_func, args):
+        return atom_func(*args)
+
+# The builder of parses that do not share nodes.
+PLAIN_BUILDER = NodeBuilder()
+
+
+class NodeTable(NodeBuilder):
+    """
+    Builds each distinct expression once and returns it again for every
+    structurally identical expression after that.
+
+    An expression is keyed by its operation and the ids of its operands,
+    which are themselves shared, so looking it up takes constant time.
+    The table keeps the expressions it returns, and through them their
+    operands, so the ids in its keys stay valid.
+
+    Expressions are not changed once built, so sharing them is safe.
+    """
+    def __init__(self, nodes=None, kept=None):
+        self.nodes = {} if nodes is None else nodes
+        # Operands that are not referenced by the expressions built from them.
+        self.kept = [] if kept is None else kept
+
+    # Returns a NodeTable with a copy of the entries.
+    def copy(self):
+        return NodeTable(dict(self.nodes), list(self.kept))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def binary(self, op, lhs, rhs):
+        key = (op, id(lhs), id(rhs))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = NodeBuilder.binary(self, op, lhs, rhs)
+        return node
+
+    def negate(self, expression):
+        key = ('neg', id(expression))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = -expression
+        return node
+
+    def group(self, expression):
+        key = ('()', id(expression))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = expression.parenthesized()
+            self.kept.append(expression)
+        return node
+
+    # Numbers are keyed by type as well, so 2 and 2.0 keep their names.
+    def constant(self, value):
+        key = ('const', type(value), value)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Constant(value)
+        return node
+
+    # Arguments that are not expressions (e.g. 'Inf') are keyed by value.
+    def atom(self, atom_func, args):
+        key = (atom_func,) + tuple(arg if isinstance(arg, basestring)
+                                   else id(arg) for arg in args)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = atom_func(*args)
+        return node
+
+
+# Returns the distinct expressions and constraints reachable from the
+# statements, each once, parents before their subexpressions.
+def distinct_nodes(statements):
+    seen = set()
+    return [node for statement in statements
+                 for (path, node) in preorder(statement, seen)]
@@ -7,4 +7,16 @@ PLUS = '+'
 MINUS = '-'
 PRIORITY_MAP = {MULT: 2, DIV: 2, PLUS: 1, MINUS: 1}
 
+# Whether an Expression keeps its name once rendered.
+CACHE_NAMES = False
+
+# Marks the parts of a name left out by bounded_str, see elision.py.
+ELLIPSIS = '...'
+
+# Atoms whose value does not depend on the order of their arguments.
+# Used for canonical keys, see canonical.py.
+SYMMETRIC_ATOMS = frozenset(['max', 'min', 'sum', 'log_sum_exp', 'geo_mean',
+                             'norm', 'norm1', 'norm2', 'norm_inf',
+                             'norm_largest', 'sum_largest', 'sum_smallest'])
+
 # Constants for 
\ No newline at end of file
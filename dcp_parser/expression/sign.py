@@ -1,5 +1,12 @@
 class Sign(object):
-    """ Sign of convex optimization expressions. """
+    """
+    Sign of convex optimization expressions.
+    There is a single Sign object for each sign: Sign(sign_str) returns
+    one of Sign.POSITIVE, Sign.NEGATIVE, Sign.ZERO and Sign.UNKNOWN,
+    so signs are compared by identity. The arithmetic operators look up
+    their results in tables built once from the rules below.
+    """
+    __slots__ = ('sign_str', 'index', 'rank')
     POSITIVE_KEY = 'POSITIVE'
     NEGATIVE_KEY = 'NEGATIVE'
     UNKNOWN_KEY = 'UNKNOWN'
@@ -9,13 +16,21 @@ class Sign(object):
     SIGN_MAP = {ZERO_KEY: 0, POSITIVE_KEY: 1, NEGATIVE_KEY: 2, UNKNOWN_KEY: 3}
     # For comparison of signs
     ORDERING = [NEGATIVE_KEY, ZERO_KEY, UNKNOWN_KEY, POSITIVE_KEY]
+
+    # The Sign for each key.
+    INSTANCES = {}
     
-    def __init__(self,sign_str):
-        sign_str = sign_str.upper()
-        if sign_str in Sign.SIGN_MAP.keys():
-            self.sign_str = sign_str
-        else:
-            raise Exception("No such sign %s exists." % str(sign_str))
+    def __new__(cls, sign_str):
+        sign = Sign.INSTANCES.get(sign_str)
+        if sign is None:
+            sign = Sign.INSTANCES.get(sign_str.upper())
+            if sign is None:
+                raise Exception("No such sign %s exists." % str(sign_str))
+        return sign
+
+    # Signs are pickled and copied by key, so there stays one of each.
+    def __reduce__(self):
+        return (Sign, (self.sign_str,))
 
     # Returns whether the sign string is a valid sign type.
     @staticmethod
@@ -31,50 +46,34 @@ class Sign(object):
         return sum_sign
         
     def __add__(self, other):
-        sign_val = Sign.SIGN_MAP[self.sign_str] | Sign.SIGN_MAP[other.sign_str]
-        for key,val in Sign.SIGN_MAP.items():
-            if val == sign_val:
-                return Sign(key)
+        return Sign.SUMS[self.index][other.index]
     
     def __sub__(self, other):
-        return self + -other
+        return Sign.DIFFERENCES[self.index][other.index]
        
     def __mul__(self, other):
-        if self == Sign.ZERO or other == Sign.ZERO:
-            return Sign.ZERO
-        elif self == Sign.UNKNOWN or other == Sign.UNKNOWN:
-            return Sign.UNKNOWN
-        elif self != other:
-            return Sign.NEGATIVE
-        else:
-            return Sign.POSITIVE
+        return Sign.PRODUCTS[self.index][other.index]
 
     def __div__(self, other):
-        if other == Sign.ZERO:
+        if other is Sign.ZERO:
             raise Exception("Divide by zero error.")
         else:
-            return self * other
+            return Sign.PRODUCTS[self.index][other.index]
         
     def __neg__(self):
-        return self * Sign.NEGATIVE
-        
-    def __eq__(self,other):
-        return self.sign_str == other.sign_str
-    
-    def __ne__(self,other):
-        return self.sign_str != other.sign_str
+        return Sign.NEGATIONS[self.index]
 
     def __lt__(self, other): 
-        return Sign.ORDERING.index(self.sign_str) < Sign.ORDERING.index(other.sign_str)
+        return self.rank < other.rank
 
     def __gt__(self, other): 
-        return other < self
+        return self.rank > other.rank
 
     def __le__(self, other):
-        return self < other or self == other
+        return self.rank <= other.rank
 
     def __ge__(self, other):
-        return other <= self
+        return self.rank >= other.rank
 
     def __repr__(self):
         return "Sign('%s')" % self.sign_str
@@ -82,8 +81,35 @@ class Sign(object):
     def __str__(self):
         return self.sign_str
 
-# Class constants for all sign types.
+# Class constants for all sign types, the only Sign objects.
+# index is the SIGN_MAP value and rank the position in ORDERING.
+def make_signs():
+    for (key, index) in Sign.SIGN_MAP.items():
+        sign = object.__new__(Sign)
+        sign.sign_str = key
+        sign.index = index
+        sign.rank = Sign.ORDERING.index(key)
+        Sign.INSTANCES[key] = sign
+make_signs()
 Sign.POSITIVE = Sign(Sign.POSITIVE_KEY)
 Sign.NEGATIVE = Sign(Sign.NEGATIVE_KEY)
 Sign.ZERO = Sign(Sign.ZERO_KEY)
-Sign.UNKNOWN = Sign(Sign.UNKNOWN_KEY)
\ No newline at end of file
+Sign.UNKNOWN = Sign(Sign.UNKNOWN_KEY)
+
+# Returns the sign of the product of two signs.
+def product(lhs, rhs):
+    if lhs is Sign.ZERO or rhs is Sign.ZERO:
+        return Sign.ZERO
+    elif lhs is Sign.UNKNOWN or rhs is Sign.UNKNOWN:
+        return Sign.UNKNOWN
+    elif lhs is not rhs:
+        return Sign.NEGATIVE
+    else:
+        return Sign.POSITIVE
+
+# Lookup tables for the operators, indexed by SIGN_MAP value.
+SIGNS = sorted(Sign.INSTANCES.values(), key=lambda sign: sign.index)
+Sign.SUMS = [[SIGNS[lhs.index | rhs.index] for rhs in SIGNS] for lhs in SIGNS]
+Sign.PRODUCTS = [[product(lhs, rhs) for rhs in SIGNS] for lhs in SIGNS]
+Sign.NEGATIONS = [product(sign, Sign.NEGATIVE) for sign in SIGNS]
+Sign.DIFFERENCES = [[lhs + -rhs for rhs in SIGNS] for lhs in SIGNS]
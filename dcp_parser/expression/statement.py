@@ -1,11 +1,87 @@
 import abc
+from violations import summarize
 
 class Statement(object):
-    """ Abstract base class for Expression and Constraint """
+    """
+    Abstract base class for Expression and Constraint.
+    Statements and their subclasses use __slots__ instead of a __dict__
+    to keep large parse trees small, so every subclass declares __slots__.
+
+    fingerprint is a hash of the structure of the statement, worked out
+    from those of its subexpressions when it is built, so statements with
+    the same fingerprint are (barring hash collisions) the same function of
+    the same declarations, whatever their text. Fingerprints are only
+    comparable within one process.
+
+    violations is the violations.ViolationSummary of the errors of the
+    statement and its subexpressions, also worked out when it is built.
+
+    Statements are not changed once built, by convention: the slots can
+    still be assigned, as checking every assignment would slow down
+    building every node, so only the code building a statement sets them.
+    """
     __metaclass__ = abc.ABCMeta
+    __slots__ = ('short_name', 'subexpressions', 'errors', 'fingerprint',
+                 'violations')
+
     # Takes short_name (string representation without subexpressions), 
     # subexpressions, and errors.
-    def __init__(self, short_name, subexpressions, errors = []):
+    # fingerprint defaults to the structural_hash of short_name
+    # and the subexpressions, violations to their summary.
+    def __init__(self, short_name, subexpressions, errors = [],
+                 fingerprint = None, violations = None):
         self.short_name = short_name
         self.subexpressions = subexpressions
-        self.errors = errors
\ No newline at end of file
+        self.errors = errors
+        if fingerprint is None:
+            fingerprint = structural_hash(short_name, subexpressions)
+        self.fingerprint = fingerprint
+        if violations is None:
+            violations = summarize(self, errors,
+                                   subexpression_violations(subexpressions))
+        self.violations = violations
+
+    # Sets the errors of a statement that is being built,
+    # e.g. once its curvature is known, and updates its violations.
+    def _set_errors(self, errors):
+        self.errors = errors
+        self.violations = summarize(self, errors,
+                                    subexpression_violations(self.subexpressions))
+
+    # Returns the string representation cut to at most limit characters,
+    # leaving out the middle of long or deeply nested subexpressions,
+    # see elision.bounded_str.
+    def bounded_str(self, limit):
+        from elision import bounded_str
+        return bounded_str(self, limit)
+
+    # Returns the slots that are set, by name, for pickling.
+    # The slots are read directly so properties of subclasses
+    # that override a slot are not saved twice.
+    def __getstate__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                try:
+                    state[name] = cls.__dict__[name].__get__(self, cls)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name in state:
+                    cls.__dict__[name].__set__(self, state[name])
+
+# Returns the (index, violations) of the subexpressions that are Statements.
+def subexpression_violations(subexpressions):
+    return [(i, subexpressions[i].violations)
+            for i in range(len(subexpressions))
+            if isinstance(subexpressions[i], Statement)]
+
+# Returns a hash of head and the fingerprints of the subexpressions.
+# Subexpressions that are not Statements (e.g. strings) are hashed by value.
+def structural_hash(head, subexpressions):
+    return hash((head,) + tuple([sub.fingerprint if isinstance(sub, Statement)
+                                 else hash(sub) for sub in subexpressions]))
@@ -0,0 +1,86 @@
+"""
+Walks parse trees without recursion.
+
+Each traversal yields (path, node) pairs for a statement and the
+statements below it, where path is the tuple of subexpression indices that
+leads from the statement to the node: () is the statement itself and
+(1, 0) the first subexpression of its second subexpression. Explicit stacks
+and queues are used, so trees of any depth can be walked; each path is a
+new tuple, so it takes time proportional to the depth of its node.
+Subexpressions that are not Statements (e.g. string arguments) are skipped.
+
+A node shared by several parents (see node_table) is visited once for each
+place it occurs. If seen is a set, nodes whose id is in it are skipped along
+with their subexpressions, and the ids of the visited nodes are added to it,
+so sharing seen between calls visits every node once.
+"""
+from collections import deque
+from statement import Statement
+
+# Yields the nodes of the tree, each before its subexpressions.
+def preorder(statement, seen=None):
+    stack = [((), statement)]
+    while stack:
+        (path, node) = stack.pop()
+        if seen is not None:
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+        yield (path, node)
+        push_children(stack, path, node, ())
+
+# Yields the nodes of the tree, each after its subexpressions.
+def postorder(statement, seen=None):
+    stack = [((), statement, False)]
+    while stack:
+        (path, node, expanded) = stack.pop()
+        if expanded:
+            yield (path, node)
+            continue
+        if seen is not None:
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+        stack.append((path, node, True))
+        push_children(stack, path, node, (False,))
+
+# Yields the nodes of the tree level by level.
+def breadth_first(statement, seen=None):
+    queue = deque([((), statement)])
+    while queue:
+        (path, node) = queue.popleft()
+        if seen is not None:
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+        yield (path, node)
+        subexpressions = node.subexpressions
+        for i in range(len(subexpressions)):
+            if isinstance(subexpressions[i], Statement):
+                queue.append((path + (i,), subexpressions[i]))
+
+# Yields the nodes of the tree, in the order of the given traversal, that are
+#   instances of cls, if cls is given,
+#   named short_name, if it is given; an atom also matches its function name,
+#     e.g. 'norm' matches norm(..., 2),
+#   have (has_errors is True) or do not have (False) DCP violations,
+#     if has_errors is given.
+def find(statement, cls=None, short_name=None, has_errors=None,
+         order=preorder):
+    for (path, node) in order(statement):
+        if cls is not None and not isinstance(node, cls):
+            continue
+        if short_name is not None and short_name != node.short_name and \
+           short_name != node.short_name.split('(')[0]:
+            continue
+        if has_errors is not None and has_errors != (len(node.errors) > 0):
+            continue
+        yield (path, node)
+
+# Pushes (path, subexpression) + extra for each subexpression of node that is
+# a Statement onto stack, last first, so they are popped in order.
+def push_children(stack, path, node, extra):
+    subexpressions = node.subexpressions
+    for i in range(len(subexpressions) - 1, -1, -1):
+        if isinstance(subexpressions[i], Statement):
+            stack.append((path + (i,), subexpressions[i]) + extra)
@@ -0,0 +1,106 @@
+"""
+Summaries of the DCP violations in parse trees.
+
+A violation is kept in the errors of the node that introduced it, so
+finding out whether a statement is DCP and where it fails used to take a
+walk over the whole tree. Every statement also has a ViolationSummary of
+the violations in it and its subexpressions, worked out from those of its
+subexpressions as it is built, so these questions take constant time:
+
+    statement.violations.count == 0       # the statement is DCP
+    statement.violations.first            # the first node with errors
+    statement.violations.kinds            # e.g. {'CompositionError': 2}
+
+The first node is the first one with errors in preorder, i.e. the one
+traversal.find(statement, has_errors=True) yields first, and
+first_violation gives its path as well.
+"""
+
+class ViolationSummary(object):
+    """
+    The violations in a node and its subexpressions.
+    count is their number and kind_counts a tuple of (kind, count) pairs
+    sorted by kind, where the kind of a violation is its class name.
+    first is the first node with errors in preorder and first_index the
+    index of the subexpression it is in, or None if it is the node itself.
+
+    Summaries are not changed once built. All nodes without violations
+    share NO_VIOLATIONS.
+    """
+    __slots__ = ('count', 'kind_counts', 'first', 'first_index')
+
+    def __init__(self, count, kind_counts, first, first_index):
+        self.count = count
+        self.kind_counts = kind_counts
+        self.first = first
+        self.first_index = first_index
+
+    # Returns whether there are no violations.
+    def is_empty(self):
+        return self.count == 0
+
+    # The number of violations of each kind, by kind.
+    @property
+    def kinds(self):
+        return dict(self.kind_counts)
+
+    # Returns the summary for a copy of node, the node it summarizes
+    # (e.g. the node in parentheses), which is the first node of its own
+    # summary if node is the first node of this one.
+    def for_copy(self, node, copy):
+        if self.first is not node:
+            return self
+        return ViolationSummary(self.count, self.kind_counts, copy, None)
+
+    def __repr__(self):
+        return "ViolationSummary(%r, %r)" % (self.count, self.kinds)
+
+# The summary of nodes without violations.
+NO_VIOLATIONS = ViolationSummary(0, (), None, None)
+
+# Returns the ViolationSummary of node, which has the given errors, from the
+# summaries of its subexpressions, as (index, summary) pairs in order.
+# errors are only counted, so a chain (see expression.NaryExpression) can
+# pass just the errors it adds to those in the summary of the chain it
+# extends, given with index None. The first node is node if it has errors.
+def summarize(node, errors, parts):
+    parts = [(index, summary) for (index, summary) in parts
+             if summary.count > 0]
+    if len(errors) == 0 and len(parts) == 0:
+        return NO_VIOLATIONS
+    (first, first_index) = (None, None)
+    if len(node.errors) > 0:
+        first = node
+    elif parts[0][0] is None:
+        (first, first_index) = (parts[0][1].first, parts[0][1].first_index)
+    else:
+        (first, first_index) = (parts[0][1].first, parts[0][0])
+    # A node above a single violating subexpression shares its counts.
+    if len(errors) == 0 and len(parts) == 1:
+        summary = parts[0][1]
+        return ViolationSummary(summary.count, summary.kind_counts, first,
+                                first_index)
+    count = len(errors)
+    kinds = {}
+    for error in errors:
+        kind = type(error).__name__
+        kinds[kind] = kinds.get(kind, 0) + 1
+    for (index, summary) in parts:
+        count += summary.count
+        for (kind, kind_count) in summary.kind_counts:
+            kinds[kind] = kinds.get(kind, 0) + kind_count
+    return ViolationSummary(count, tuple(sorted(kinds.items())), first,
+                            first_index)
+
+# Returns the (path, node) of the first node with errors in preorder, as
+# traversal.find would, or None if the statement has no violations.
+# Takes time proportional to the depth of the node.
+def first_violation(statement):
+    if statement.violations.count == 0:
+        return None
+    path = []
+    node = statement
+    while node.violations.first_index is not None:
+        path.append(node.violations.first_index)
+        node = node.subexpressions[node.violations.first_index]
+    return (tuple(path), node)
@@ -0,0 +1,303 @@
+"""
+Hand-written engine for the grammar in grammar.py, selected with
+Parser(engine="fast").
+
+A line is parsed in two passes. The first pass tokenizes the line with a single
+regular expression and checks the syntax by precedence climbing, emitting the
+grammar actions as a flat program in the order the LALR parser would reduce.
+The second pass runs the program on a stack to build the Expression or Constraint.
+
+The first pass has no side effects, so any line it rejects (an illegal
+character or a syntax error) is handed to the PLY engine, which reports the
+error exactly as before. Lines it accepts are in the language of the grammar,
+so the second pass raises the same errors, in the same order, as the PLY actions.
+"""
+import re
+import threading
+from dcp_parser.expression.sign import Sign
+from grammar import CompiledGrammar, ParseContext, reserved, \
+    get_atom_string, missing_arguments
+from parse_errors import UnknownSymbolError, ArgumentCountError
+
+# One token per match, with the same rule order as the PLY lexer.
+# Spaces and tabs are skipped, newlines and comments are matched and dropped.
+TOKEN_RE = re.compile(r"""[ \t]*(?:
+    (?P<ID>[a-zA-Z_][a-zA-Z_0-9]*)
+  | (?P<FLOAT>\d*\.\d+)
+  | (?P<INT>\d+)
+  | (?P<IGNORE>\n+|\#.*)
+  | (?P<OP>==|<=|>=|[-+*/(),])
+  | (?P<END>[ \t]*$)
+)""", re.VERBOSE)
+
+# Binding power of the binary operators.
+BINARY_PRIORITY = {'+': 1, '-': 1, '*': 2, '/': 2}
+CONSTRAINT_OPS = set(['==', '<=', '>='])
+
+# Instructions for the second pass.
+PUSH_NUMBER = 0
+PUSH_ID = 1
+PUSH_STRING = 2
+PUSH_EMPTY = 3
+CALL = 4
+GROUP = 5
+NEGATE = 6
+BINARY = 7
+CONSTRAINT = 8
+
+
+class NotAccepted(Exception):
+    """ Raised by the first pass when a line must go to the PLY engine. """
+
+
+class FastGrammar(object):
+    """
+    Recursive descent replacement for CompiledGrammar.
+    Shares the atom functions of the PLY grammar and falls back to it
+    for every line with a lexical or syntax error.
+    """
+    # The instance returned by shared().
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.atom_dict = fallback.atom_dict
+
+    # Returns the FastGrammar shared by the process, building it on first use.
+    @staticmethod
+    def shared():
+        if FastGrammar._shared is None:
+            with FastGrammar._lock:
+                if FastGrammar._shared is None:
+                    FastGrammar._shared = FastGrammar(CompiledGrammar.shared())
+        return FastGrammar._shared
+
+    # Returns a new ParseContext for the given symbol table and statements,
+    # building expressions with nodes (see ParseContext).
+    def context(self, symbol_table, statements, nodes=None):
+        return ParseContext(symbol_table, statements, self.atom_dict, nodes)
+
+    # Parses a single line, recording its meaning in the context.
+    # Returns the number of syntax errors.
+    def parse(self, line, context):
+        try:
+            program = LineParser(tokenize(line)).statement()
+        except (NotAccepted, RuntimeError):
+            # Syntax errors and expressions nested past the recursion limit.
+            return self.fallback.parse(line, context)
+        run(program, context)
+        return context.errors
+
+    # Lines read in chunks are parsed by the PLY engine, which never
+    # needs more than the current token.
+    def parse_chunks(self, chunks, context):
+        return self.fallback.parse_chunks(chunks, context)
+
+
+# Splits a line into (type, value) pairs using the PLY token types.
+# Raises NotAccepted on characters the PLY lexer rejects.
+def tokenize(line):
+    tokens = []
+    match = TOKEN_RE.match
+    pos = 0
+    end = len(line)
+    while pos < end:
+        m = match(line, pos)
+        if m is None:
+            raise NotAccepted()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == 'ID':
+            tokens.append((reserved.get(value, 'ID'), value))
+        elif kind == 'OP':
+            tokens.append((value, value))
+        elif kind == 'INT':
+            tokens.append(('NUMBER', int(value)))
+        elif kind == 'FLOAT':
+            tokens.append(('NUMBER', float(value)))
+        elif kind == 'END':
+            break
+        pos = m.end()
+    tokens.append((None, None))
+    return tokens
+
+
+class LineParser(object):
+    """
+    First pass over the tokens of a line.
+    Each method consumes one grammar symbol and appends its actions to program.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.program = []
+
+    # Returns the type of the current token.
+    def peek(self):
+        return self.tokens[self.pos][0]
+
+    # Consumes the current token, which must have the given type.
+    def expect(self, kind):
+        if self.tokens[self.pos][0] != kind:
+            raise NotAccepted()
+        self.pos += 1
+
+    # statement : VARIABLE (SIGN) id_list
+    #           | PARAMETER (SIGN) id_list
+    #           | expression
+    #           | constraint
+    # Returns the program for the statement.
+    def statement(self):
+        kind = self.peek()
+        if kind == 'VARIABLE' or kind == 'PARAMETER':
+            self.pos += 1
+            sign = Sign.UNKNOWN
+            if self.peek() == 'SIGN':
+                sign = Sign(self.tokens[self.pos][1])
+                self.pos += 1
+            ids = []
+            while self.peek() == 'ID':
+                ids.append(self.tokens[self.pos][1])
+                self.pos += 1
+            if len(ids) == 0 or self.peek() is not None:
+                raise NotAccepted()
+            return (kind, sign, ids)
+
+        self.expression(1)
+        kind = self.peek()
+        if kind in CONSTRAINT_OPS:
+            self.pos += 1
+            self.expression(1)
+            self.program.append((CONSTRAINT, kind))
+        if self.peek() is not None:
+            raise NotAccepted()
+        return self.program
+
+    # Binary operators with at least the given priority.
+    def expression(self, min_priority):
+        self.unary()
+        while True:
+            op = self.peek()
+            priority = BINARY_PRIORITY.get(op)
+            if priority is None or priority < min_priority:
+                return
+            self.pos += 1
+            self.expression(priority + 1)
+            self.program.append((BINARY, op))
+
+    # Unary plus and minus bind tighter than any binary operator.
+    def unary(self):
+        kind = self.peek()
+        if kind == '-':
+            self.pos += 1
+            self.unary()
+            self.program.append((NEGATE, None))
+        elif kind == '+':
+            self.pos += 1
+            self.unary()
+        else:
+            self.primary()
+
+    # Numbers, variables and parameters, atoms and parenthesized expressions.
+    def primary(self):
+        (kind, value) = self.tokens[self.pos]
+        self.pos += 1
+        if kind == 'NUMBER':
+            self.program.append((PUSH_NUMBER, value))
+        elif kind == 'ID':
+            if self.peek() == '(':
+                self.pos += 1
+                count = self.expression_list()
+                self.expect(')')
+                self.program.append((CALL, (value, count)))
+            else:
+                self.program.append((PUSH_ID, value))
+        elif kind == '(':
+            self.expression(1)
+            self.expect(')')
+            self.program.append((GROUP, None))
+        else:
+            raise NotAccepted()
+
+    # Arguments of an atom, each an expression, STRING_ARG or empty.
+    # Returns the number of arguments.
+    def expression_list(self):
+        count = 0
+        while True:
+            kind = self.peek()
+            if kind == 'STRING_ARG':
+                self.program.append((PUSH_STRING, self.tokens[self.pos][1]))
+                self.pos += 1
+            elif kind == ',' or kind == ')':
+                self.program.append((PUSH_EMPTY, None))
+            else:
+                self.expression(1)
+            count += 1
+            if self.peek() != ',':
+                break
+            self.pos += 1
+        return count
+
+
+# Second pass: runs the actions of an accepted line on a stack,
+# raising the same errors as the PLY actions.
+def run(program, context):
+    if isinstance(program, tuple):
+        (kind, sign, ids) = program
+        if kind == 'VARIABLE':
+            context.add_variables(ids, sign)
+        else:
+            context.add_parameters(ids, sign)
+        return
+
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    symbol_table = context.symbol_table
+    nodes = context.nodes
+    for (op, arg) in program:
+        if op == BINARY:
+            rhs = pop()
+            push(nodes.binary(arg, pop(), rhs))
+        elif op == PUSH_ID:
+            try:
+                push(symbol_table[arg])
+            except LookupError:
+                raise UnknownSymbolError("'%s' is not a known variable or parameter." % arg)
+        elif op == PUSH_NUMBER:
+            push(nodes.constant(arg))
+        elif op == NEGATE:
+            push(nodes.negate(pop()))
+        elif op == GROUP:
+            push(nodes.group(pop()))
+        elif op == PUSH_EMPTY:
+            push('')
+        elif op == PUSH_STRING:
+            push(arg)
+        elif op == CALL:
+            push(call_atom(arg[0], arg[1], stack, context.atom_dict, nodes))
+        elif op == CONSTRAINT:
+            rhs = pop()
+            lhs = pop()
+            if arg == '==': push(lhs.__eq__(rhs))
+            elif arg == '<=': push(lhs.__le__(rhs))
+            elif arg == '>=': push(lhs.__ge__(rhs))
+    context.add_statement(stack[0])
+
+# Pops the arguments of an atom from the stack
+# and applies the atom as p_expression_atom does.
+def call_atom(name, count, stack, atom_dict, nodes):
+    args = stack[-count:]
+    del stack[-count:]
+    if not name in atom_dict:
+        raise UnknownSymbolError("'%s' is not a known function." % name)
+    atom = atom_dict[name]
+    if missing_arguments(args):
+        raise ArgumentCountError("Missing arguments in '%s'." %
+                                 get_atom_string(name, args))
+    try:
+        return nodes.atom(atom, args)
+    except TypeError:
+        raise ArgumentCountError("Incorrect number of arguments in '%s'." %
+                                 get_atom_string(name, args))
@@ -0,0 +1,362 @@
+"""
+Lex/yacc grammar for convex optimization expressions.
+Based on http://www.dabeaz.com/ply/example.html
+
+The rules are defined once at module level and compiled into a CompiledGrammar,
+which is immutable and shared by every Parser and thread.
+All state touched while parsing lives on the ParseContext passed to
+CompiledGrammar.parse, which the actions reach through t.parser.context.
+"""
+import copy
+import threading
+from dcp_parser.expression.sign import Sign
+from dcp_parser.expression.expression import Parameter, Variable
+from dcp_parser.expression.node_table import PLAIN_BUILDER
+from parse_errors import InvalidSyntaxError, UnknownSymbolError, ArgumentCountError
+from chunked import ChunkLexer
+import dcp_parser.atomic.atom_loader as atom_loader
+import dcp_parser.tables as tables
+
+# Lexer definition
+
+# Reserved keywords
+reserved = {
+   'variable' : 'VARIABLE',
+   'parameter' : 'PARAMETER',
+    str(Sign.POSITIVE).lower() : 'SIGN',
+    str(Sign.NEGATIVE).lower() : 'SIGN',
+    str(Sign.ZERO).lower() : 'SIGN',
+    str(Sign.UNKNOWN).lower() : 'SIGN',
+    'Inf' : 'STRING_ARG', # Special string arguments for atomic functions.
+}
+
+tokens = [
+    'INT','FLOAT',
+    'PLUS','MINUS','TIMES','DIVIDE',
+    'EQUALS','GEQ','LEQ',
+    'LPAREN','RPAREN','COMMA',
+    'ID'] + list(set(reserved.values()))
+
+# Tokens
+t_PLUS    = r'\+'
+t_MINUS   = r'-'
+t_TIMES   = r'\*'
+t_DIVIDE  = r'/'
+t_EQUALS  = r'=='
+t_LEQ     = r'<='
+t_GEQ     = r'>='
+t_LPAREN  = r'\('
+t_RPAREN  = r'\)'
+t_COMMA   = r','
+
+# Convert IDs to reserved words.
+def t_ID(t):
+    r'[a-zA-Z_][a-zA-Z_0-9]*'
+    t.type = reserved.get(t.value,'ID') # Check for reserved words
+    return t
+
+# Convert float string to value.
+def t_FLOAT(t):
+    r'\d*\.\d+'
+    t.value = float(t.value)
+    return t
+
+# Convert integer string to value.
+def t_INT(t):
+    r'\d+'
+    t.value = int(t.value)
+    return t
+
+# Ignore whitespace and comments.
+t_ignore_COMMENT = r'\#.*'
+t_ignore = " \t"
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += t.value.count("\n")
+
+def t_error(t):
+    if t.value[0] == '=':
+        raise InvalidSyntaxError("'=' is not valid. Did you mean '=='?")
+    elif t.value[0] == '<':
+        raise InvalidSyntaxError("'<' constraints are not valid. Consider using '<='.")
+    elif t.value[0] == '>':
+        raise InvalidSyntaxError("'>' constraints are not valid. Consider using '>='.")
+    elif t.value[0] == '^':
+        raise InvalidSyntaxError("'^' is not valid. Consider using the 'pow' function.")
+    else:
+        raise InvalidSyntaxError("Illegal character '%s'." % t.value[0])
+
+# Parser definition
+precedence = (
+    ('nonassoc', 'EQUALS', 'LEQ', 'GEQ'),
+    ('left','PLUS','MINUS'),
+    ('left','TIMES','DIVIDE'),
+    ('right','UMINUS', 'UPLUS'),
+    )
+
+# Add variables to the symbol table.
+# No sign given, defaults to UNKNOWN
+def p_statement_variables(t):
+    '''statement : VARIABLE id_list'''
+    t.parser.context.add_variables(t[2], Sign.UNKNOWN)
+
+# Sign given
+def p_statement_variables_sign(t):
+    '''statement : VARIABLE SIGN id_list'''
+    t.parser.context.add_variables(t[3], Sign(t[2]))
+
+# Add parameters to the symbol table.
+# No sign given, defaults to UNKNOWN
+def p_statement_parameters(t):
+    '''statement : PARAMETER id_list'''
+    t.parser.context.add_parameters(t[2], Sign.UNKNOWN)
+
+# Sign given
+def p_statement_parameters_sign(t):
+    '''statement : PARAMETER SIGN id_list'''
+    t.parser.context.add_parameters(t[3], Sign(t[2]))
+
+# List of ids.
+def p_id_list(t):
+    '''id_list : ID
+               | id_list ID '''
+    if len(t) == 2: # Single id.
+        t[0] = [t[1]]
+    else: # Concatenated ids.
+        t[1].append(t[2])
+        t[0] = t[1]
+
+# Evaluate an expression.
+def p_statement_expr(t):
+    '''statement : expression
+                 | constraint'''
+    t.parser.context.add_statement(t[1])
+
+# Top level error catching.
+def p_statement_error(t):
+    '''statement : expression error
+                 | constraint error'''
+    raise InvalidSyntaxError("Invalid syntax after '%s'." % str(t[1]))
+
+# Binary arithmetic and boolean operators.
+def p_expression_arith_binop(t):
+    '''expression : expression PLUS expression
+                  | expression MINUS expression
+                  | expression TIMES expression
+                  | expression DIVIDE expression'''
+    t[0] = t.parser.context.nodes.binary(t[2], t[1], t[3])
+
+def p_expression_bool_binop(t):
+    '''constraint : expression EQUALS expression
+                  | expression LEQ expression
+                  | expression GEQ expression'''
+    if t[2]   == '==': t[0] = t[1].__eq__(t[3])
+    elif t[2] == '<=': t[0] = t[1].__le__(t[3])
+    elif t[2] == '>=': t[0] = t[1].__ge__(t[3])
+
+# Raise error for multiple constraints.
+def p_expression_bool_binop_errors(t):
+    '''constraint : constraint EQUALS expression
+                  | constraint LEQ expression
+                  | constraint GEQ expression'''
+    raise InvalidSyntaxError("An expression can only contain one constraint.")
+
+# Utility function to convert an atom and expression list to a string.
+# Only called for error messages, as the string is as long as the call.
+def get_atom_string(atom, expression_list):
+    args = [str(arg) for arg in expression_list]
+    return atom + "(" + ", ".join(args) + ")"
+
+# Returns whether the expression list has missing arguments.
+def missing_arguments(expression_list):
+    return any(isinstance(arg, str) and len(arg) == 0 for arg in expression_list)
+
+# Atomic function.
+def p_expression_atom(t):
+    'expression : ID LPAREN expression_list RPAREN'
+    atom_dict = t.parser.context.atom_dict
+    if not t[1] in atom_dict:
+        raise UnknownSymbolError("'%s' is not a known function." % t[1])
+    atom = atom_dict[t[1]]
+    # Check if missing arguments.
+    if missing_arguments(t[3]):
+        raise ArgumentCountError("Missing arguments in '%s'." %
+                                 get_atom_string(t[1], t[3]))
+    try:
+        t[0] = t.parser.context.nodes.atom(atom, t[3])
+    except TypeError:
+        raise ArgumentCountError("Incorrect number of arguments in '%s'." %
+                                 get_atom_string(t[1], t[3]))
+
+# Catch all error for atomic function.
+def p_expression_atom_error(t):
+    '''expression : ID LPAREN error RPAREN'''
+    raise InvalidSyntaxError("Syntax error in call to '%s'." % t[1])
+
+# List of expressions.
+# Single expression or STRING_ARG.
+def p_expression_list_single(t):
+    '''expression_list : expression_or_empty
+                       | STRING_ARG'''
+    t[0] = [t[1]]
+
+# Concatenated expressions or STRING_ARGs.
+def p_expression_list_multi(t):
+    '''expression_list : expression_list COMMA expression_or_empty
+                       | expression_list COMMA STRING_ARG'''
+    t[1].append(t[3])
+    t[0] = t[1]
+
+# Error productions for expression lists with missing arguments.
+def p_expression_or_empty(t):
+    '''expression_or_empty :
+                           | expression '''
+    t[0] = '' if len(t) == 1 else t[1]
+
+# Unary plus and minus.
+def p_expression_uplus(t):
+    'expression : PLUS expression %prec UPLUS'
+    t[0] = t[2]
+
+def p_expression_uminus(t):
+    'expression : MINUS expression %prec UMINUS'
+    t[0] = t.parser.context.nodes.negate(t[2])
+
+# Parenthesized expression.
+def p_expression_group(t):
+    'expression : LPAREN expression RPAREN'
+    t[0] = t.parser.context.nodes.group(t[2])
+
+# Raw number.
+def p_expression_number(t):
+    '''expression : INT
+                  | FLOAT'''
+    t[0] = t.parser.context.nodes.constant(t[1])
+
+# Variable or parameter.
+def p_expression_id(t):
+    'expression : ID'
+    try:
+        t[0] = t.parser.context.symbol_table[t[1]]
+    except LookupError:
+        raise UnknownSymbolError("'%s' is not a known variable or parameter." % t[1])
+
+# Only needed to build the tables.
+# Each parse reports syntax errors to its ParseContext instead.
+def p_error(t):
+    pass
+
+
+class ParseContext(object):
+    """
+    The mutable state of a single call to CompiledGrammar.parse.
+    Declarations are added to symbol_table and statements are
+    appended to statements, both of which may be shared with a Parser.
+    If statements is None the statement is only kept on the context.
+    statement is the objective or constraint parsed, if any.
+    errors counts the syntax errors seen by the parser.
+    nodes is the NodeBuilder that builds the expressions, a NodeTable
+    if identical subexpressions are shared.
+    """
+    def __init__(self, symbol_table, statements, atom_dict, nodes=None):
+        self.symbol_table = symbol_table
+        self.statements = statements
+        self.atom_dict = atom_dict
+        self.nodes = PLAIN_BUILDER if nodes is None else nodes
+        self.statement = None
+        self.errors = 0
+
+    # Records a parsed objective or constraint.
+    def add_statement(self, statement):
+        self.statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    # Adds variables to the symbol table.
+    def add_variables(self, variables, sign):
+        for id in variables:
+            self.symbol_table[id] = Variable(id, sign)
+
+    # Adds parameters to the symbol table.
+    def add_parameters(self, parameters, sign):
+        for id in parameters:
+            self.symbol_table[id] = Parameter(id, sign)
+
+    # Error function for the parser.
+    def syntax_error(self, token):
+        self.errors += 1
+
+
+class CompiledGrammar(object):
+    """
+    The lexer, LALR parser and atom functions for the grammar.
+    Never modified after construction, so one instance is shared
+    by all Parsers and threads. Each call to parse works on its own
+    copies of the lexer and parser, which only copy references to the tables.
+    """
+    # The instance returned by shared().
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.atom_dict = atom_loader.LazyAtomDict()
+        (self.lexer, self.parser) = CompiledGrammar.build()
+
+    # Returns the CompiledGrammar shared by the process, building it on first use.
+    @staticmethod
+    def shared():
+        if CompiledGrammar._shared is None:
+            with CompiledGrammar._lock:
+                if CompiledGrammar._shared is None:
+                    CompiledGrammar._shared = CompiledGrammar()
+        return CompiledGrammar._shared
+
+    # Returns a new ParseContext for the given symbol table and statements,
+    # building expressions with nodes (see ParseContext).
+    def context(self, symbol_table, statements, nodes=None):
+        return ParseContext(symbol_table, statements, self.atom_dict, nodes)
+
+    # Parses a single line, recording its meaning in the context.
+    # Returns the number of syntax errors.
+    def parse(self, line, context):
+        parser = copy.copy(self.parser)
+        parser.context = context
+        parser.errorfunc = context.syntax_error
+        parser.parse(line, lexer=self.lexer.clone())
+        return context.errors
+
+    # Parses a single line given as a sequence of chunks that end on
+    # token boundaries (see chunked.LineReader), like parse.
+    def parse_chunks(self, chunks, context):
+        parser = copy.copy(self.parser)
+        parser.context = context
+        parser.errorfunc = context.syntax_error
+        parser.parse(lexer=ChunkLexer(self.lexer.clone(), chunks))
+        return context.errors
+
+    # Builds the lexer and parser from the prebuilt tables
+    # unless the grammar has changed since they were generated.
+    # PLY is only imported here, when the first Parser is made.
+    @staticmethod
+    def build():
+        import dcp_parser.grammar as grammar
+        import ply.lex
+        import ply.yacc
+        fingerprint = tables.grammar_fingerprint(vars(grammar))
+        if tables.is_current(fingerprint):
+            lexer = ply.lex.lex(module=grammar, optimize=1, lextab=tables.LEXTAB)
+            parser = ply.yacc.yacc(module=grammar, optimize=1, debug=False,
+                                   write_tables=False, tabmodule=tables.PARSETAB)
+            return (lexer, parser)
+
+        # Rebuild the tables, saving them for next time if possible.
+        lexer = ply.lex.lex(module=grammar)
+        writable = tables.writable()
+        parser = ply.yacc.yacc(module=grammar, debug=False, write_tables=writable,
+                               tabmodule=tables.PARSETAB,
+                               outputdir=tables.DIRECTORY)
+        if writable:
+            lexer.writetab(tables.LEXTAB, tables.DIRECTORY)
+            tables.write_fingerprint(fingerprint)
+        return (lexer, parser)
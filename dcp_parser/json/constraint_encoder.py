@@ -1,34 +1,67 @@
 import json
 import settings as s
 from dcp_parser.expression.constraints import Constraint, EqConstraint, LeqConstraint, GeqConstraint
-from expression_encoder import ExpressionEncoder
+from expression_encoder import ExpressionEncoder, decoded_class, \
+     encoder_options, split_children
 # Taken from http://docs.python.org/2/library/json.html
 
 class ConstraintEncoder(json.JSONEncoder):
-    """ Encodes a constraint as JSON """
+    """
+    Encodes a constraint as JSON.
+    encode and iterencode write the sides without recursion,
+    see ExpressionEncoder.
+    """
     def default(self, obj):
         if isinstance(obj, Constraint):
-            json_map = {
-                        s.TYPE_KEY: s.CONSTRAINT_TYPE,
-                        s.NAME_KEY: str(obj),
-                        s.SHORT_NAME_KEY: obj.short_name,
-                        s.CLASS_KEY: s.TYPE_TO_NAME[obj.__class__.__name__],
-                       }
-            # Encode the error as its string representation.
-            # Save indexed errors in a map.
-            error_map = {s.UNSORTED_ERRORS_KEY: [], s.INDEXED_ERRORS_KEY: {}}
-            for error in obj.errors:
-                if error.is_indexed():
-                    error_map[s.INDEXED_ERRORS_KEY][error.index] = error.error_message()
-                else:
-                    error_map[s.UNSORTED_ERRORS_KEY].append(error.error_message())
-            json_map[s.ERRORS_KEY] = error_map
-
-            json_map[s.SUBEXP_KEY] = [ExpressionEncoder().default(sub) for sub in obj.subexpressions]
+            json_map = self.encode_node(obj)
+            encoder = ExpressionEncoder()
+            json_map[s.SUBEXP_KEY] = [encoder.default(sub) for sub in obj.subexpressions]
             return json_map
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
 
+    def encode(self, obj):
+        if isinstance(obj, Constraint) and self.indent is None:
+            return "".join(self.text_chunks(obj))
+        return super(ConstraintEncoder, self).encode(obj)
+
+    def iterencode(self, obj, _one_shot=False):
+        if isinstance(obj, Constraint) and self.indent is None:
+            return self.text_chunks(obj)
+        return super(ConstraintEncoder, self).iterencode(obj, _one_shot)
+
+    # Yields the JSON text of a constraint in pieces, with the text of
+    # its sides from ExpressionEncoder.text_chunks.
+    def text_chunks(self, obj):
+        (before, after) = split_children(self, self.encode_node(obj))
+        yield before
+        encoder = ExpressionEncoder(**encoder_options(self))
+        for (i, side) in enumerate(obj.subexpressions):
+            if i > 0:
+                yield self.item_separator
+            for chunk in encoder.text_chunks(side):
+                yield chunk
+        yield after
+
+    # Returns the JSON of a constraint without its sides.
+    def encode_node(self, obj):
+        json_map = {
+                    s.TYPE_KEY: s.CONSTRAINT_TYPE,
+                    s.NAME_KEY: str(obj),
+                    s.SHORT_NAME_KEY: obj.short_name,
+                    s.CLASS_KEY: s.TYPE_TO_NAME[obj.__class__.__name__],
+                   }
+        # Encode the error as its string representation.
+        # Save indexed errors in a map.
+        error_map = {s.UNSORTED_ERRORS_KEY: [], s.INDEXED_ERRORS_KEY: {}}
+        for error in obj.errors:
+            if error.is_indexed():
+                error_map[s.INDEXED_ERRORS_KEY][error.index] = error.error_message()
+            else:
+                error_map[s.UNSORTED_ERRORS_KEY].append(error.error_message())
+        json_map[s.ERRORS_KEY] = error_map
+        return json_map
+
     # Translates JSON into a Constraint.
     # Used for testing. Does not preserve all information.
     @staticmethod
@@ -41,11 +74,11 @@ class ConstraintEncoder(json.JSONEncoder):
         rhs = subexpressions[1]
         constraint_str = dct[s.SHORT_NAME_KEY]
         if constraint_str == EqConstraint.CONSTRAINT_STR:
-            constraint = EqConstraint(lhs,rhs)
+            constraint = decoded_class(EqConstraint)(lhs,rhs)
         elif constraint_str == LeqConstraint.CONSTRAINT_STR:
-            constraint = LeqConstraint(lhs,rhs)
+            constraint = decoded_class(LeqConstraint)(lhs,rhs)
         elif constraint_str == GeqConstraint.CONSTRAINT_STR:
-            constraint = GeqConstraint(lhs,rhs)
+            constraint = decoded_class(GeqConstraint)(lhs,rhs)
         else:
             raise Exception("Invalid constraint type.")
         constraint.json_errors = dct[s.ERRORS_KEY]
@@ -1,40 +1,137 @@
 import json
 import settings as s
 from dcp_parser.expression.expression import Expression
+from dcp_parser.expression.traversal import postorder
 # Taken from http://docs.python.org/2/library/json.html
 
+# Subclasses made by decoded_class, by class.
+DECODED_CLASSES = {}
+
+# Returns a subclass of the statement class cls with the same name and a
+# __dict__, so decoded statements can also hold their json_errors.
+def decoded_class(cls):
+    if cls not in DECODED_CLASSES:
+        DECODED_CLASSES[cls] = type(cls.__name__, (cls,), {})
+    return DECODED_CLASSES[cls]
+
+# Returns the options of a JSONEncoder as keyword arguments,
+# to make another encoder that writes the same way.
+def encoder_options(encoder):
+    return dict(skipkeys=encoder.skipkeys, ensure_ascii=encoder.ensure_ascii,
+                check_circular=encoder.check_circular,
+                allow_nan=encoder.allow_nan, sort_keys=encoder.sort_keys,
+                indent=encoder.indent, encoding=encoder.encoding,
+                separators=(encoder.item_separator, encoder.key_separator))
+
+# Returns the JSON text json_map is written as by encoder, with an empty
+# list of children, as the text before and the text after the children.
+# Quotes in JSON strings are escaped, so the key cannot occur in them.
+def split_children(encoder, json_map):
+    json_map[s.SUBEXP_KEY] = []
+    text = json.JSONEncoder.encode(encoder, json_map)
+    key = json.dumps(s.SUBEXP_KEY) + encoder.key_separator + "["
+    i = text.index(key) + len(key)
+    return (text[:i], text[i:])
+
 class ExpressionEncoder(json.JSONEncoder):
-    """ Encodes an expression as JSON """
+    """
+    Encodes an expression as JSON.
+    A subexpression shared by several parents (see node_table) is encoded
+    once per encoder and its JSON reused everywhere it occurs.
+    Subexpressions are encoded before the expressions that contain them,
+    without recursion. default returns nested dicts, which json.dumps
+    writes out recursively, so encode and iterencode (and so json.dumps
+    and json.dump with cls=ExpressionEncoder) write the text of an
+    expression from a stack instead, and expressions of any depth can be
+    written. Expressions inside other objects, or written with indent,
+    go through default and are limited to a depth of about 400.
+    """
+    def __init__(self, *args, **kwargs):
+        super(ExpressionEncoder, self).__init__(*args, **kwargs)
+        # (expression, JSON) by id of the expressions encoded so far.
+        self.encoded = {}
+        # Ids of the expressions encoded so far.
+        self.seen = set()
+        # (expression, (text before, text after the children)) by id of the
+        # expressions written so far, and their ids, see text_chunks.
+        self.texts = {}
+        self.written = set()
+
     def default(self, obj):
         if isinstance(obj, Expression):
-            json_map = {
-                        s.TYPE_KEY: s.EXP_TYPE,
-                        s.NAME_KEY: str(obj),
-                        s.SHORT_NAME_KEY: obj.short_name,
-                        s.CURVATURE_KEY: s.TYPE_TO_NAME[str(obj.curvature)],
-                        s.SIGN_KEY: s.TYPE_TO_NAME[str(obj.sign)],
-                        s.CLASS_KEY: s.TYPE_TO_NAME[obj.__class__.__name__]
-                       }
-            # Encode the error as its string representation.
-            # Save indexed errors in a map.
-            error_map = {s.UNSORTED_ERRORS_KEY: [], s.INDEXED_ERRORS_KEY: {}}
-            for error in obj.errors:
-                if error.is_indexed():
-                    error_map[s.INDEXED_ERRORS_KEY][error.index] = error.error_message()
-                else:
-                    error_map[s.UNSORTED_ERRORS_KEY].append(error.error_message())
-            json_map[s.ERRORS_KEY] = error_map
-            # Only include subexpression attribute if non-empty
-            if len(obj.subexpressions) > 0:
-                json_map[s.SUBEXP_KEY] = [self.default(sub) for sub in obj.subexpressions]
-            # Ignore monotonicity if None (i.e. not an atomic function)
-            if obj.monotonicity is not None:
-                json_map[s.MONOTONICITY_KEY] = [s.TYPE_TO_NAME[str(tonicity)]
-                                            for tonicity in obj.monotonicity]
-            return json_map
+            for (path, node) in postorder(obj, self.seen):
+                json_map = self.encode_node(node)
+                # Only include subexpression attribute if non-empty
+                if len(node.subexpressions) > 0:
+                    json_map[s.SUBEXP_KEY] = [self.encoded[id(sub)][1]
+                                              for sub in node.subexpressions]
+                self.encoded[id(node)] = (node, json_map)
+            return self.encoded[id(obj)][1]
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
 
+    def encode(self, obj):
+        if isinstance(obj, Expression) and self.indent is None:
+            return "".join(self.text_chunks(obj))
+        return super(ExpressionEncoder, self).encode(obj)
+
+    def iterencode(self, obj, _one_shot=False):
+        if isinstance(obj, Expression) and self.indent is None:
+            return self.text_chunks(obj)
+        return super(ExpressionEncoder, self).iterencode(obj, _one_shot)
+
+    # Yields the JSON text of an expression in pieces: the text of each
+    # node before its children, the children, and the text after them.
+    # The text of a node is only kept without its children, so the text of
+    # a deep expression is not copied into every expression above it.
+    def text_chunks(self, obj):
+        for (path, node) in postorder(obj, self.written):
+            json_map = self.encode_node(node)
+            if len(node.subexpressions) > 0:
+                texts = split_children(self, json_map)
+            else:
+                texts = (json.JSONEncoder.encode(self, json_map), "")
+            self.texts[id(node)] = (node, texts)
+        stack = [obj]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, basestring):
+                yield item
+                continue
+            (before, after) = self.texts[id(item)][1]
+            yield before
+            stack.append(after)
+            subexpressions = item.subexpressions
+            for i in range(len(subexpressions) - 1, -1, -1):
+                stack.append(subexpressions[i])
+                if i > 0:
+                    stack.append(self.item_separator)
+
+    # Returns the JSON of an expression without its subexpressions.
+    def encode_node(self, obj):
+        json_map = {
+                    s.TYPE_KEY: s.EXP_TYPE,
+                    s.NAME_KEY: str(obj),
+                    s.SHORT_NAME_KEY: obj.short_name,
+                    s.CURVATURE_KEY: s.TYPE_TO_NAME[str(obj.curvature)],
+                    s.SIGN_KEY: s.TYPE_TO_NAME[str(obj.sign)],
+                    s.CLASS_KEY: s.TYPE_TO_NAME[obj.__class__.__name__]
+                   }
+        # Encode the error as its string representation.
+        # Save indexed errors in a map.
+        error_map = {s.UNSORTED_ERRORS_KEY: [], s.INDEXED_ERRORS_KEY: {}}
+        for error in obj.errors:
+            if error.is_indexed():
+                error_map[s.INDEXED_ERRORS_KEY][error.index] = error.error_message()
+            else:
+                error_map[s.UNSORTED_ERRORS_KEY].append(error.error_message())
+        json_map[s.ERRORS_KEY] = error_map
+        # Ignore monotonicity if None (i.e. not an atomic function)
+        if obj.monotonicity is not None:
+            json_map[s.MONOTONICITY_KEY] = [s.TYPE_TO_NAME[str(tonicity)]
+                                        for tonicity in obj.monotonicity]
+        return json_map
+
     # Translates JSON into an Expression.
     # Used for testing. Does not preserve all information.
     @staticmethod
@@ -53,7 +150,7 @@ class ExpressionEncoder(json.JSONEncoder):
         if s.MONOTONICITY_KEY in dct:
             monotonicity = [s.NAME_TO_TYPE[tonicity] for tonicity in dct[s.MONOTONICITY_KEY]]
         short_name = dct[s.SHORT_NAME_KEY]
-        exp = Expression(curvature, sign, name, subexpressions, 
+        exp = decoded_class(Expression)(curvature, sign, name, subexpressions, 
                           monotonicity=monotonicity, short_name=short_name)
         exp.json_errors = dct[s.ERRORS_KEY]
         return exp
\ No newline at end of file
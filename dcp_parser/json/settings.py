@@ -2,7 +2,8 @@ from dcp_parser.expression.curvature import Curvature
 from dcp_parser.expression.sign import Sign
 from dcp_parser.atomic.monotonicity import Monotonicity
 from dcp_parser.expression.constraints import Constraint, EqConstraint, LeqConstraint, GeqConstraint
-from dcp_parser.expression.expression import Expression, Variable, Parameter, Constant
+from dcp_parser.expression.expression import Expression, NaryExpression, \
+     Variable, Parameter, Constant
 
 # Maps curvature, monotonicity, and sign to the JSON name.
 TYPE_TO_NAME = {
@@ -23,6 +24,7 @@ TYPE_TO_NAME = {
                 LeqConstraint.__name__: Constraint.__name__,
                 GeqConstraint.__name__: Constraint.__name__,
                 Expression.__name__: 'Function',
+                NaryExpression.__name__: 'Function',
                 Variable.__name__: Variable.__name__,
                 Parameter.__name__: Parameter.__name__,
                 Constant.__name__: Constant.__name__,
@@ -3,11 +3,15 @@ import settings as s
 from dcp_parser.expression.expression import Expression
 from dcp_parser.expression.constraints import Constraint
 from constraint_encoder import ConstraintEncoder
-from expression_encoder import ExpressionEncoder
+from expression_encoder import ExpressionEncoder, encoder_options
 # Taken from http://docs.python.org/2/library/json.html
 
 class StatementEncoder(json.JSONEncoder):
-    """ Encodes a statement as JSON """
+    """
+    Encodes a statement as JSON.
+    encode and iterencode write statements of any depth without recursion,
+    see ExpressionEncoder.
+    """
     def default(self, obj):
         if isinstance(obj, Constraint):
             return ConstraintEncoder().default(obj)
@@ -16,6 +20,27 @@ class StatementEncoder(json.JSONEncoder):
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
 
+    def encode(self, obj):
+        encoder = self.statement_encoder(obj)
+        if encoder is None:
+            return super(StatementEncoder, self).encode(obj)
+        return encoder.encode(obj)
+
+    def iterencode(self, obj, _one_shot=False):
+        encoder = self.statement_encoder(obj)
+        if encoder is None:
+            return super(StatementEncoder, self).iterencode(obj, _one_shot)
+        return encoder.iterencode(obj, _one_shot)
+
+    # Returns an encoder for obj with the options of this one,
+    # or None if obj is not a statement.
+    def statement_encoder(self, obj):
+        if isinstance(obj, Constraint):
+            return ConstraintEncoder(**encoder_options(self))
+        elif isinstance(obj, Expression):
+            return ExpressionEncoder(**encoder_options(self))
+        return None
+
     # Translates JSON into a Statement.
     # Used for testing. Does not preserve all information.
     @staticmethod
@@ -0,0 +1,91 @@
+"""
+Finds which statements of a model changed meaning.
+
+Every statement has a fingerprint (see expression.statement.Statement),
+a hash of its operators, atoms and their parameters, constants and the
+names and signs of the declarations it uses, worked out bottom-up as it is
+parsed. Statements with the same fingerprint are the same function, so
+earlier results for them, e.g. their verification, still hold.
+
+diff compares two versions of a model by fingerprint only, without
+walking the parse trees. The unchanged start and end of the models are
+skipped with one comparison per statement, and only the part in between
+is aligned, so the work beyond that scan follows the size of the changes.
+"""
+import difflib
+
+class ModelDiff(object):
+    """
+    The differences between an old and a new list of statements, by index.
+    added lists the new statements that replace nothing in the old list,
+    removed the old statements that nothing in the new list replaces, and
+    changed the (old, new) pairs of statements in the same place that
+    differ. unchanged lists (old_start, new_start, length) blocks of
+    statements with the same fingerprints in both. new_count is the number
+    of new statements.
+    """
+    def __init__(self, added, removed, changed, unchanged, new_count):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+        self.new_count = new_count
+
+    # Returns whether the models have the same statements.
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+    # Takes a value for each old statement (e.g. a ParseResult or the
+    # outcome of a verification) and returns a list with the value of its
+    # old statement for each unchanged new statement and None for the
+    # added and changed statements, which need to be analyzed again.
+    def carry_over(self, old_values):
+        values = [None] * self.new_count
+        for (old_start, new_start, length) in self.unchanged:
+            values[new_start:new_start + length] = \
+                old_values[old_start:old_start + length]
+        return values
+
+    def __repr__(self):
+        return "ModelDiff(%r, %r, %r, %r, %r)" % (self.added, self.removed,
+                                                  self.changed, self.unchanged,
+                                                  self.new_count)
+
+
+# Returns the ModelDiff from the old to the new statements.
+# old and new are lists of statements, or Parsers or ProblemContexts.
+def diff(old, new):
+    old = [statement.fingerprint for statement in statement_list(old)]
+    new = [statement.fingerprint for statement in statement_list(new)]
+    # Skip the unchanged start and end.
+    start = 0
+    end = min(len(old), len(new))
+    while start < end and old[start] == new[start]:
+        start += 1
+    tail = 0
+    while tail < end - start and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    (added, removed, changed, unchanged) = ([], [], [], [])
+    if start > 0:
+        unchanged.append((0, 0, start))
+    matcher = difflib.SequenceMatcher(None, old[start:len(old) - tail],
+                                      new[start:len(new) - tail], False)
+    for (tag, i1, i2, j1, j2) in matcher.get_opcodes():
+        (i1, i2, j1, j2) = (start + i1, start + i2, start + j1, start + j2)
+        if tag == 'equal':
+            unchanged.append((i1, j1, i2 - i1))
+            continue
+        # Pair up replaced statements in order, the rest are removed or added.
+        count = min(i2 - i1, j2 - j1)
+        changed.extend((i1 + k, j1 + k) for k in range(count))
+        removed.extend(range(i1 + count, i2))
+        added.extend(range(j1 + count, j2))
+    if tail > 0:
+        unchanged.append((len(old) - tail, len(new) - tail, tail))
+    return ModelDiff(added, removed, changed, unchanged, len(new))
+
+# Returns the statements of a list, Parser or ProblemContext.
+def statement_list(model):
+    if isinstance(model, list):
+        return model
+    return model.statements
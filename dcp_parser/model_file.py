@@ -0,0 +1,171 @@
+"""
+Parses a large model file on demand.
+
+Opening a ModelFile only memory-maps the file. The byte offsets of the
+statement lines and of the declaration lines are indexed as far as needed,
+without parsing anything, so looking at the first statements of a huge file
+does not read the rest of it. A statement is parsed the first time it is
+accessed, with the declarations that come before it in the file, and the
+most recently used results are kept in an LRU cache.
+
+The symbol table is saved every CHECKPOINT_INTERVAL declarations, so going
+back to an earlier statement, or forward past a saved table, restores the
+nearest saved table and applies at most CHECKPOINT_INTERVAL declarations
+instead of all of those since the start or the current position.
+"""
+import re
+import sys
+import mmap
+import bisect
+from array import array
+from collections import OrderedDict
+from parser import Parser
+from parallel import DECLARATION_RE
+from problem_context import ProblemContext
+
+# Number of parsed statements kept by default.
+DEFAULT_CACHE_SIZE = 128
+
+# Bytes indexed at a time.
+BLOCK_SIZE = 1 << 20
+
+# Declarations applied between saved symbol tables.
+CHECKPOINT_INTERVAL = 256
+
+# Matches a line that is not ignored by Parser.parse.
+LINE_RE = re.compile(r'^[ \t\r\f\v]*\S.*', re.M)
+
+class ModelFile(object):
+    """
+    A read-only model file whose statements are parsed when accessed.
+    model[k] returns statement k (counting only objectives and constraints)
+    or raises its ParseError, model.result(k) returns its ParseResult.
+    Not safe to share between threads; open one ModelFile per thread.
+    """
+    def __init__(self, path, engine="ply", cache_size=DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.parser = Parser(engine)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # Empty files cannot be mapped.
+            self.map = ''
+        (self.starts, self.ends) = (array('l'), array('l'))
+        (self.decl_starts, self.decl_ends) = (array('l'), array('l'))
+        self.decl_positions = array('l')
+        # Bytes of the file indexed so far.
+        self.scanned = 0
+        # Declarations applied to the parser.
+        self.applied = 0
+        # Copies of the symbol table after each CHECKPOINT_INTERVAL
+        # declarations, starting with the empty table.
+        self.checkpoints = [{}]
+
+    # Records the start and end offsets of the statement and declaration
+    # lines up to and including statement k, one block at a time.
+    # For each declaration, also records how many statements come before it.
+    def scan(self, k):
+        data = self.map
+        size = len(data)
+        while len(self.starts) <= k and self.scanned < size:
+            end = data.find('\n', min(self.scanned + BLOCK_SIZE, size))
+            end = size if end < 0 else end + 1
+            for match in LINE_RE.finditer(data, self.scanned, end):
+                (start, stop) = match.span()
+                if DECLARATION_RE.match(data, start, stop) is None:
+                    self.starts.append(start)
+                    self.ends.append(stop)
+                else:
+                    self.decl_starts.append(start)
+                    self.decl_ends.append(stop)
+                    self.decl_positions.append(len(self.starts))
+            self.scanned = end
+
+    # The number of statements in the file.
+    # Indexes the whole file the first time.
+    def __len__(self):
+        self.scan(sys.maxint)
+        return len(self.starts)
+
+    # Returns statement k, raising a ParseError if it cannot be parsed.
+    def __getitem__(self, k):
+        result = self.result(k)
+        if result.error is not None:
+            raise result.error
+        return result.statement
+
+    # Yields every statement in order, raising on the first bad line.
+    def __iter__(self):
+        k = 0
+        while self.has_statement(k):
+            yield self[k]
+            k += 1
+
+    # Returns whether the file has a statement k, indexing up to it.
+    def has_statement(self, k):
+        self.scan(k)
+        return k < len(self.starts)
+
+    # Returns the text of statement k.
+    def line(self, k):
+        k = self.index(k)
+        return self.map[self.starts[k]:self.ends[k]]
+
+    # Returns the ParseResult for statement k, parsing it if it is not cached.
+    def result(self, k):
+        k = self.index(k)
+        result = self.cache.pop(k, None)
+        if result is None:
+            self.declare(k)
+            result = self.parser.parse_line(self.line(k), record=False)
+            if len(self.cache) >= self.cache_size > 0:
+                self.cache.popitem(last=False)
+        if self.cache_size > 0:
+            self.cache[k] = result
+        return result
+
+    # Returns the symbol table statement k is parsed with.
+    def symbol_table(self, k):
+        self.declare(self.index(k))
+        return self.parser.symbol_table
+
+    # Brings the symbol table up to date with the declarations
+    # before statement k, starting from the last checkpoint before them
+    # if the symbol table is ahead of them or behind that checkpoint.
+    def declare(self, k):
+        count = bisect.bisect_right(self.decl_positions, k)
+        checkpoint = min(count // CHECKPOINT_INTERVAL, len(self.checkpoints) - 1)
+        if count < self.applied or \
+           self.applied < checkpoint * CHECKPOINT_INTERVAL:
+            self.parser.problem = ProblemContext(dict(self.checkpoints[checkpoint]))
+            self.applied = checkpoint * CHECKPOINT_INTERVAL
+        for i in range(self.applied, count):
+            line = self.map[self.decl_starts[i]:self.decl_ends[i]]
+            self.parser.parse_line(line, record=False)
+            if (i + 1) % CHECKPOINT_INTERVAL == 0 and \
+               len(self.checkpoints) == (i + 1) // CHECKPOINT_INTERVAL:
+                self.checkpoints.append(dict(self.parser.symbol_table))
+        self.applied = count
+
+    # Converts a possibly negative index to a position in the index.
+    def index(self, k):
+        if k < 0:
+            k += len(self)
+        if k < 0 or not self.has_statement(k):
+            raise IndexError("Statement index out of range.")
+        return k
+
+    # Releases the map and the file.
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+        self.cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
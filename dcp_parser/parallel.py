@@ -0,0 +1,163 @@
+"""
+Parses large models across a pool of processes.
+
+Statements only depend on earlier declarations, so a cheap first pass
+finds the declaration lines and the remaining lines are split into chunks
+that are parsed in parallel. Each worker rebuilds the symbol table a chunk
+starts with from the declarations before it, then parses the chunk in
+order, so every line sees exactly the declarations it would see serially.
+
+The results of a chunk are sent back pickled with tree_pickle, so
+statements of any depth can be sent, and with their declarations by kind,
+name and sign, so the statements refer to the parser's own declarations.
+"""
+import re
+import bisect
+import multiprocessing
+from cStringIO import StringIO
+from dcp_parser.expression.expression import Variable, Parameter
+from dcp_parser.expression.sign import Sign
+from problem_context import ProblemContext, declaration_factory
+from tree_pickle import TreePickler, TreeUnpickler
+
+# Lines per chunk sent to a worker.
+DEFAULT_CHUNK_SIZE = 500
+
+# Matches lines starting with a declaration keyword.
+DECLARATION_RE = re.compile(r'[ \t]*(variable|parameter)(?![a-zA-Z_0-9])')
+
+# Returns whether the line is a variable or parameter declaration.
+def is_declaration(line):
+    return DECLARATION_RE.match(line) is not None
+
+# Parses the lines of the given statements with a pool of processes.
+# Declarations are applied to the parser's symbol table and, if record is
+# True, statements are appended to parser.statements in input order.
+# Returns a ParseResult for every non-empty line, in input order.
+# The statements refer to the declarations in the parser's symbol table,
+# except those of names declared again later in the input, which refer to
+# equal declarations made for them. If the parser shares nodes, the workers
+# do too, but nodes are only shared within a chunk and the parser's node
+# table is not updated.
+def parse_parallel(parser, statements, processes=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE, record=True):
+    if isinstance(statements, basestring):
+        statements = [statements]
+    lines = [line for statement in statements
+                  for line in statement.split('\n') if len(line.strip()) > 0]
+    symbol_table = dict(parser.symbol_table)
+    # First pass: collect the declarations and apply them to the parser.
+    declarations = []
+    for index, line in enumerate(lines):
+        if is_declaration(line):
+            declarations.append((index, line))
+            parser.parse_line(line)
+
+    chunks = [(start, lines[start:start + chunk_size])
+              for start in range(0, len(lines), chunk_size)]
+    share_nodes = parser.problem.nodes is not None
+    pool = multiprocessing.Pool(processes, init_worker,
+                                (parser.engine, symbol_table, declarations,
+                                 share_nodes))
+    lookup = declaration_lookup(parser.symbol_table)
+    results = []
+    try:
+        for data in pool.imap(parse_chunk, chunks):
+            results.extend(decode_results(data, lookup))
+    finally:
+        pool.close()
+        pool.join()
+
+    if record:
+        for result in results:
+            if result.statement is not None:
+                parser.statements.append(result.statement)
+    return results
+
+
+class Worker(object):
+    """
+    Parser state of a worker process.
+    symbol_table holds the declarations made before the first line,
+    declarations the (index, line) of every declaration in the input,
+    applied how many of those have been applied to the parser, and
+    share_nodes whether the parser shares nodes (see ProblemContext).
+    """
+    def __init__(self, engine, symbol_table, declarations, share_nodes=False):
+        from dcp_parser.parser import Parser
+        self.parser = Parser(engine)
+        self.symbol_table = symbol_table
+        self.declarations = declarations
+        self.share_nodes = share_nodes
+        self.indices = [index for (index, line) in declarations]
+        self.reset()
+
+    # Restores the symbol table from before the first line.
+    def reset(self):
+        self.parser.problem = ProblemContext(dict(self.symbol_table),
+                                             share_nodes=self.share_nodes)
+        self.applied = 0
+
+    # Parses the lines starting at index start.
+    # Returns a list of ParseResults.
+    def parse_chunk(self, start, lines):
+        count = bisect.bisect_left(self.indices, start)
+        if count < self.applied:
+            self.reset()
+        for (index, line) in self.declarations[self.applied:count]:
+            self.parser.parse_line(line, record=False)
+        results = [self.parser.parse_line(line, record=False) for line in lines]
+        self.applied = bisect.bisect_left(self.indices, start + len(lines))
+        return results
+
+# The Worker of the current process.
+worker = None
+
+# Pool initializer.
+def init_worker(engine, symbol_table, declarations, share_nodes):
+    global worker
+    worker = Worker(engine, symbol_table, declarations, share_nodes)
+
+# Pool task: parses one (start, lines) chunk.
+# Returns the results as a string, see encode_results.
+def parse_chunk(chunk):
+    (start, lines) = chunk
+    return encode_results(worker.parse_chunk(start, lines))
+
+# Returns the ParseResults as a string for decode_results.
+def encode_results(results):
+    buffer = StringIO()
+    pickler = TreePickler(buffer, declaration_key)
+    pickler.dump_trees([result.statement for result in results])
+    pickler.dump(results)
+    return buffer.getvalue()
+
+# Returns the ParseResults encoded by encode_results, with the declarations
+# made by lookup from their keys (see declaration_lookup).
+def decode_results(data, lookup):
+    unpickler = TreeUnpickler(StringIO(data), lookup)
+    unpickler.load_trees()
+    return unpickler.load()
+
+# Returns (is_variable, name, sign) for a declared Variable or Parameter,
+# and None for any other node, including declarations in parentheses.
+def declaration_key(node):
+    if type(node) in (Variable, Parameter) and node.parens == 0:
+        return (type(node) is Variable, node.name, node.sign.sign_str)
+    return None
+
+# Returns a function that returns the declaration of a key: the one in
+# symbol_table if it has the same kind and sign, and otherwise a declaration
+# made for the key, the same one each time.
+def declaration_lookup(symbol_table):
+    made = {}
+    def lookup(key):
+        (is_variable, name, sign_str) = key
+        declaration = symbol_table.get(name)
+        if declaration is not None and declaration_key(declaration) == key:
+            return declaration
+        if key not in made:
+            cls = Variable if is_variable else Parameter
+            made[key] = declaration_factory(cls, Sign(sign_str))(name)
+        return made[key]
+    return lookup
@@ -0,0 +1,20 @@
+""" Exceptions raised for statements that cannot be parsed. """
+
+class ParseError(Exception):
+    """
+    Base class for errors in the text of a statement.
+    KIND is the matching ParseResult kind.
+    """
+    KIND = 'INVALID'
+
+class InvalidSyntaxError(ParseError):
+    """ Illegal characters or tokens in an impossible order. """
+    KIND = 'SYNTAX_ERROR'
+
+class UnknownSymbolError(ParseError):
+    """ A function, variable or parameter that is not defined. """
+    KIND = 'UNKNOWN_SYMBOL'
+
+class ArgumentCountError(ParseError):
+    """ An atom called with missing arguments or the wrong number of arguments. """
+    KIND = 'WRONG_ARITY'
@@ -0,0 +1,50 @@
+from parse_errors import ParseError
+
+class ParseResult(object):
+    """
+    Outcome of parsing one line.
+    kind is one of SUCCESS, SYNTAX_ERROR, UNKNOWN_SYMBOL, WRONG_ARITY, or
+    INVALID for any other error (e.g. an invalid atom parameter).
+    statement is the Expression or Constraint for a successful objective
+    or constraint, and None for declarations and errors.
+    error is the exception describing a failure, and None on success.
+    """
+    SUCCESS = 'SUCCESS'
+    SYNTAX_ERROR = 'SYNTAX_ERROR'
+    UNKNOWN_SYMBOL = 'UNKNOWN_SYMBOL'
+    WRONG_ARITY = 'WRONG_ARITY'
+    INVALID = 'INVALID'
+
+    def __init__(self, line, kind, statement=None, error=None):
+        self.line = line
+        self.kind = kind
+        self.statement = statement
+        self.error = error
+
+    # Returns a successful result.
+    @staticmethod
+    def success(line, statement):
+        return ParseResult(line, ParseResult.SUCCESS, statement)
+
+    # Returns a failed result for the given exception.
+    @staticmethod
+    def failure(line, error):
+        if isinstance(error, ParseError):
+            kind = error.KIND
+        else:
+            kind = ParseResult.INVALID
+        return ParseResult(line, kind, error=error)
+
+    # Returns whether the line was parsed.
+    def is_success(self):
+        return self.kind == ParseResult.SUCCESS
+
+    # The error message, or None on success.
+    def message(self):
+        if self.error is None:
+            return None
+        return str(self.error)
+
+    def __repr__(self):
+        return "ParseResult(%r, %s, %r, %r)" % (self.line, self.kind,
+                                                self.statement, self.message())
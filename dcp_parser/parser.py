@@ -1,8 +1,23 @@
-from expression.statement import Statement
-from expression.expression import Parameter, Variable, Constant
-from expression.sign import Sign
-import dcp_parser.atomic.atom_loader as atom_loader
-import ply.yacc
+from grammar import CompiledGrammar
+from fast_grammar import FastGrammar
+from parse_errors import InvalidSyntaxError
+from parse_result import ParseResult
+from problem_context import ProblemContext
+import chunked
+import gc
+
+# Parsing engines by name.
+# Both produce the same statements and error messages.
+ENGINES = {'ply': CompiledGrammar, 'fast': FastGrammar}
+
+# Builds the shared grammars of the given engines (all by default) ahead of
+# forking worker processes, so every child starts with them compiled
+# instead of compiling them again. The garbage left by compiling is
+# collected first, so the children do not inherit it.
+def preload(engines=None):
+    for engine in (ENGINES.keys() if engines is None else engines):
+        ENGINES[engine].shared()
+    gc.collect()
 
 class Parser(object):
     """
@@ -11,275 +26,143 @@ class Parser(object):
       variable (SIGN) x y z ...
       parameter (SIGN) a b c ...
       Any constraint or objective.
-    """
-    def __init__(self):
-        self.clear()
-        self.atom_dict = atom_loader.generate_atom_dict()
-        self.parser = self.build_parser()
 
-    # Dump previous input.
-    def clear(self):
-        self.symbol_table = {}
-        self.statements = []
+    The lexer, LALR tables and atoms are compiled once per process and
+    shared by every Parser. Each line is parsed with its own ParseContext,
+    so a Parser can be used from several threads at once and
+    creating extra Parsers is cheap.
 
-    # Evaluates statement and records the meaning.
-    def parse(self, statement):
-        self.errors = 0
-        lines = statement.split('\n')
-        for line in lines:
-            # Ignore empty input.
-            if len(line.strip()) > 0:
-                self.parser.parse(line)
-            if self.errors > 0:
-                raise Exception("'%s' is not a valid expression." % line)
+    engine selects the LALR parser generated by PLY ("ply") or
+    the hand-written recursive descent parser ("fast").
 
-    """
-    Constructs at lex/yacc parser for convex optimization expressions.
-    Based on http://www.dabeaz.com/ply/example.html
-    """
-    def build_parser(self):
-        # Lexer definition
+    Declarations and statements are kept in problem, a ProblemContext.
+    Assigning another ProblemContext to problem switches to that problem
+    without touching the compiled grammar.
 
-        # Reserved keywords
-        reserved = {
-           'variable' : 'VARIABLE',
-           'parameter' : 'PARAMETER',
-            str(Sign.POSITIVE).lower() : 'SIGN',
-            str(Sign.NEGATIVE).lower() : 'SIGN',
-            str(Sign.ZERO).lower() : 'SIGN',
-            str(Sign.UNKNOWN).lower() : 'SIGN',
-            'Inf' : 'STRING_ARG', # Special string arguments for atomic functions.
-        }
+    If share_nodes is True, the new problem builds structurally identical
+    subexpressions once and shares them (see ProblemContext); it is ignored
+    if problem is given.
 
-        tokens = [
-            'INT','FLOAT',
-            'PLUS','MINUS','TIMES','DIVIDE',
-            'EQUALS','GEQ','LEQ',
-            'LPAREN','RPAREN','COMMA',
-            'ID'] + list(set(reserved.values()))
+    Pickling a Parser saves only its engine and problem; the compiled
+    grammar is looked up again when it is unpickled.
+    """
+    def __init__(self, engine="ply", problem=None, share_nodes=False):
+        if engine not in ENGINES:
+            raise Exception("No such engine %s exists." % str(engine))
+        if problem is None:
+            problem = ProblemContext(share_nodes=share_nodes)
+        self.problem = problem
+        self.engine = engine
+        self.grammar = ENGINES[engine].shared()
+        self.atom_dict = self.grammar.atom_dict
+
+    # The declared Variables and Parameters of the current problem.
+    @property
+    def symbol_table(self):
+        return self.problem.symbol_table
+
+    # The objectives and constraints of the current problem.
+    @property
+    def statements(self):
+        return self.problem.statements
 
-        # Tokens
-        t_PLUS    = r'\+'
-        t_MINUS   = r'-'
-        t_TIMES   = r'\*'
-        t_DIVIDE  = r'/'
-        t_EQUALS  = r'=='
-        t_LEQ     = r'<='
-        t_GEQ     = r'>='
-        t_LPAREN  = r'\('
-        t_RPAREN  = r'\)'
-        t_COMMA   = r','
+    # Dump previous input.
+    def clear(self):
+        self.problem.clear()
 
-        # Convert IDs to reserved words.
-        def t_ID(t):
-            r'[a-zA-Z_][a-zA-Z_0-9]*'
-            t.type = reserved.get(t.value,'ID') # Check for reserved words
-            return t
+    # Returns the Parser and its problem as a string for restore().
+    def snapshot(self):
+        import cPickle
+        return cPickle.dumps(self, cPickle.HIGHEST_PROTOCOL)
 
-        # Convert float string to value.
-        def t_FLOAT(t):
-            r'\d*\.\d+'
-            t.value = float(t.value)
-            return t
+    # Returns the Parser saved by snapshot().
+    @staticmethod
+    def restore(data):
+        import cPickle
+        return cPickle.loads(data)
 
-        # Convert integer string to value.
-        def t_INT(t):
-            r'\d+'
-            t.value = int(t.value) 
-            return t
+    def __getstate__(self):
+        return (self.engine, self.problem)
 
-        # Ignore whitespace and comments.
-        t_ignore_COMMENT = r'\#.*'
-        t_ignore = " \t"
+    def __setstate__(self, state):
+        (engine, problem) = state
+        self.__init__(engine, problem)
 
-        def t_newline(t):
-            r'\n+'
-            t.lexer.lineno += t.value.count("\n")
-            
-        def t_error(t):
-            if t.value[0] == '=':
-                raise Exception("'=' is not valid. Did you mean '=='?")
-            elif t.value[0] == '<':
-                raise Exception("'<' constraints are not valid. Consider using '<='.")
-            elif t.value[0] == '>':
-                raise Exception("'>' constraints are not valid. Consider using '>='.")
-            elif t.value[0] == '^':
-                raise Exception("'^' is not valid. Consider using the 'pow' function.")
+    # Evaluates statement and records the meaning.
+    # Raises a ParseError for the first line that cannot be parsed.
+    def parse(self, statement):
+        lines = statement.split('\n')
+        for line in lines:
+            # Ignore empty input.
+            if len(line.strip()) > 0:
+                result = self.parse_line(line)
+                if result.error is not None:
+                    raise result.error
+
+    # Evaluates each line of each statement, recording the meaning of the
+    # lines that parse. A bad line does not stop the lines after it.
+    # Returns a ParseResult for every non-empty line, in order.
+    def parse_many(self, statements):
+        if isinstance(statements, basestring):
+            statements = [statements]
+        results = []
+        for statement in statements:
+            for line in statement.split('\n'):
+                # Ignore empty input.
+                if len(line.strip()) > 0:
+                    results.append(self.parse_line(line))
+        return results
+
+    # Evaluates the lines of the statements with a pool of processes,
+    # see parallel.parse_parallel. Gives the same results as parse_many.
+    # chunk_size defaults to parallel.DEFAULT_CHUNK_SIZE.
+    def parse_parallel(self, statements, processes=None,
+                       chunk_size=None, record=True):
+        import parallel
+        if chunk_size is None:
+            chunk_size = parallel.DEFAULT_CHUNK_SIZE
+        return parallel.parse_parallel(self, statements, processes,
+                                       chunk_size, record)
+
+    # Evaluates each line of a file object as it is read, yielding a
+    # ParseResult for every non-empty line as soon as it is parsed.
+    # Declarations are applied as they are read. If record is False the
+    # statements are only yielded, not appended to self.statements,
+    # so memory use does not grow with the size of the file.
+    def iter_parse(self, fileobj, record=True):
+        for text in fileobj:
+            for line in text.split('\n'):
+                # Ignore empty input.
+                if len(line.strip()) > 0:
+                    yield self.parse_line(line, record)
+
+    # Evaluates each line of a file object like iter_parse, but reads and
+    # lexes the lines in chunks of about chunk_size characters, so a huge
+    # statement is never held in memory as a string. The line of each
+    # ParseResult is cut to chunk_size characters, followed by '...'.
+    def parse_stream(self, fileobj, chunk_size=chunked.DEFAULT_CHUNK_SIZE,
+                     record=True):
+        reader = chunked.LineReader(fileobj, chunk_size)
+        while reader.next_line():
+            yield self.parse_line(reader.line(), record, reader.chunks())
+
+    # Evaluates a single line and records the meaning
+    # (in self.statements only if record is True).
+    # If chunks is given the line is read from it (see chunked.LineReader)
+    # and line is only used to report errors.
+    # Returns a ParseResult instead of raising.
+    def parse_line(self, line, record=True, chunks=None):
+        statements = self.statements if record else None
+        context = self.grammar.context(self.symbol_table, statements,
+                                       self.problem.nodes)
+        try:
+            if chunks is None:
+                errors = self.grammar.parse(line, context)
             else:
-                raise Exception("Illegal character '%s'." % t.value[0])
-            
-        # Build the lexer
-        import ply.lex as lex
-        lex.lex()
-
-        # Parser definition
-        precedence = (
-            ('nonassoc', 'EQUALS', 'LEQ', 'GEQ'),
-            ('left','PLUS','MINUS'),
-            ('left','TIMES','DIVIDE'),
-            ('right','UMINUS', 'UPLUS'),
-            )
-
-        # Add variables to the symbol table.
-        # No sign given, defaults to UNKNOWN
-        def p_statement_variables(t):
-            '''statement : VARIABLE id_list'''
-            add_variables(t[2], Sign.UNKNOWN)
-
-        # Sign given
-        def p_statement_variables_sign(t):
-            '''statement : VARIABLE SIGN id_list'''
-            add_variables(t[3], Sign(t[2]))
-
-        # Helper to add variables to the symbol table.
-        def add_variables(variables, sign):
-            for id in variables:
-                self.symbol_table[id] = Variable(id, sign)
-
-        # Add parameters to the symbol table.
-        # No sign given, defaults to UNKNOWN
-        def p_statement_parameters(t):
-            '''statement : PARAMETER id_list'''
-            add_parameters(t[2], Sign.UNKNOWN)
-
-        # Sign given
-        def p_statement_parameters_sign(t):
-            '''statement : PARAMETER SIGN id_list'''
-            add_parameters(t[3], Sign(t[2]))
-
-        # Helper to add parameters to the symbol table.
-        def add_parameters(parameters, sign):
-            for id in parameters:
-                self.symbol_table[id] = Parameter(id, sign)
-
-        # List of ids.
-        def p_id_list(t):
-            '''id_list : ID
-                       | id_list ID '''
-            if len(t) == 2: # Single id.
-                t[0] = [t[1]]
-            else: # Concatenated ids.
-                t[1].append(t[2])
-                t[0] = t[1]
-
-        # Evaluate an expression.
-        def p_statement_expr(t):
-            '''statement : expression
-                         | constraint'''
-            self.statements.append(t[1])
-
-        # Top level error catching.
-        def p_statement_error(t):
-            '''statement : expression error
-                         | constraint error'''
-            raise Exception("Invalid syntax after '%s'." % str(t[1]))
-
-        # Binary arithmetic and boolean operators.
-        def p_expression_arith_binop(t):
-            '''expression : expression PLUS expression
-                          | expression MINUS expression
-                          | expression TIMES expression
-                          | expression DIVIDE expression'''
-            if t[2]   == '+': t[0] = t[1] + t[3]
-            elif t[2] == '-': t[0] = t[1] - t[3]
-            elif t[2] == '*': t[0] = t[1] * t[3]
-            elif t[2] == '/': t[0] = t[1] / t[3]
-
-        def p_expression_bool_binop(t):
-            '''constraint : expression EQUALS expression
-                          | expression LEQ expression
-                          | expression GEQ expression'''
-            if t[2]   == '==': t[0] = t[1].__eq__(t[3])
-            elif t[2] == '<=': t[0] = t[1].__le__(t[3])
-            elif t[2] == '>=': t[0] = t[1].__ge__(t[3])
-
-        # Raise error for multiple constraints.
-        def p_expression_bool_binop_errors(t):
-            '''constraint : constraint EQUALS expression
-                          | constraint LEQ expression
-                          | constraint GEQ expression'''
-            raise Exception("An expression can only contain one constraint.")
-
-        # Utility function to convert an atom and expression list to a string.
-        # Returns the function call as a string and whether there are missing
-        # arguments.
-        def get_atom_string(atom, expression_list):
-            args = [str(arg) for arg in expression_list]
-            missing_args = '' in args
-            return (atom + "(" + ", ".join(args) + ")", missing_args)
-
-        # Atomic function.
-        def p_expression_atom(t):
-            'expression : ID LPAREN expression_list RPAREN'
-            if not t[1] in self.atom_dict:
-                raise Exception("'%s' is not a known function." % t[1])
-            atom = self.atom_dict[t[1]]
-            # Check if missing arguments.
-            (atom_str, missing_args) = get_atom_string(t[1], t[3])
-            if missing_args:
-                raise Exception("Missing arguments in '%s'." % atom_str)
-            try:
-                t[0] = atom(*t[3])
-            except TypeError:
-                raise Exception("Incorrect number of arguments in '%s'." % atom_str)
-
-        # Catch all error for atomic function.
-        def p_expression_atom_error(t):
-            '''expression : ID LPAREN error RPAREN'''
-            raise Exception("Syntax error in call to '%s'." % t[1])
-
-        # List of expressions.
-        # Single expression or STRING_ARG.
-        def p_expression_list_single(t):
-            '''expression_list : expression_or_empty
-                               | STRING_ARG'''
-            t[0] = [t[1]]
-
-        # Concatenated expressions or STRING_ARGs.
-        def p_expression_list_multi(t):
-            '''expression_list : expression_list COMMA expression_or_empty
-                               | expression_list COMMA STRING_ARG'''
-            t[1].append(t[3])
-            t[0] = t[1]
-
-        # Error productions for expression lists with missing arguments.
-        def p_expression_or_empty(t):
-            '''expression_or_empty :
-                                   | expression '''
-            t[0] = '' if len(t) == 1 else t[1]
-
-        # Unary plus and minus.
-        def p_expression_uplus(t):
-            'expression : PLUS expression %prec UPLUS'
-            t[0] = t[2]
-
-        def p_expression_uminus(t):
-            'expression : MINUS expression %prec UMINUS'
-            t[0] = -t[2]
-
-        # Parenthesized expression.
-        def p_expression_group(t):
-            'expression : LPAREN expression RPAREN'
-            t[2].add_parens()
-            t[0] = t[2]
-
-        # Raw number.
-        def p_expression_number(t):
-            '''expression : INT
-                          | FLOAT'''
-            t[0] = Constant(t[1])
-
-        # Variable or parameter.
-        def p_expression_id(t):
-            'expression : ID'
-            try:
-                t[0] = self.symbol_table[t[1]]
-            except LookupError:
-                raise Exception("'%s' is not a known variable or parameter." % t[1])
-
-
-        def p_error(t):
-            self.errors += 1
-
-        # Build the parser, tabmodule set so it loads parsetab.py
-        return ply.yacc.yacc(tabmodule="dcp_parser.parsetab")
+                errors = self.grammar.parse_chunks(chunks, context)
+        except Exception as e:
+            return ParseResult.failure(line, e)
+        if errors > 0:
+            error = InvalidSyntaxError("'%s' is not a valid expression." % line)
+            return ParseResult.failure(line, error)
+        return ParseResult.success(line, context.statement)
@@ -0,0 +1,141 @@
+import gc
+from dcp_parser.expression.expression import Variable, Parameter, \
+     leaf_fingerprint
+from dcp_parser.expression.sign import Sign
+from dcp_parser.expression.node_table import NodeTable
+
+# Format of ProblemContext.snapshot().
+# Version 2 pickles signs and curvatures by name,
+# version 3 also records whether nodes are shared,
+# version 4 keeps the value of Constants,
+# version 5 the fingerprints of statements,
+# version 6 their summaries of violations,
+# version 7 pickles DCP violations as records (see DCPViolation),
+# version 8 pickles the nodes one at a time (see tree_pickle).
+SNAPSHOT_VERSION = 8
+
+class ProblemContext(object):
+    """
+    The declarations and statements of one problem.
+    symbol_table maps names to the declared Variables and Parameters and
+    statements lists the objectives and constraints parsed so far.
+
+    A ProblemContext holds no parser state, so it is cheap to create and
+    many problems can be parsed against the same compiled grammar, either
+    each with its own Parser(problem=...) or by switching parser.problem.
+    Pickling a ProblemContext uses snapshot() and restore().
+
+    If share_nodes is True, structurally identical subexpressions of the
+    statements are built once and shared, see node_table.NodeTable.
+    nodes is then the NodeTable, and None otherwise.
+    """
+    def __init__(self, symbol_table=None, statements=None, share_nodes=False):
+        self.symbol_table = {} if symbol_table is None else symbol_table
+        self.statements = [] if statements is None else statements
+        self.nodes = NodeTable() if share_nodes else None
+
+    # Dump previous input.
+    def clear(self):
+        self.symbol_table = {}
+        self.statements = []
+        if self.nodes is not None:
+            self.nodes = NodeTable()
+
+    # Returns a new ProblemContext with copies of the symbol table,
+    # statement list and node table, sharing the Variables, Parameters,
+    # statements and their nodes.
+    def copy(self):
+        problem = ProblemContext(dict(self.symbol_table), list(self.statements))
+        if self.nodes is not None:
+            problem.nodes = self.nodes.copy()
+        return problem
+
+    # Returns the problem as a string for restore().
+    # Declarations are saved as (is_variable, name, sign) and the statements
+    # refer to them by name, so restoring rebuilds them directly
+    # instead of unpickling or parsing them. Nodes shared by the statements
+    # are restored shared, but the node table starts empty.
+    # The nodes are pickled without recursion, so statements of any depth
+    # can be saved, see tree_pickle.
+    def snapshot(self):
+        from cStringIO import StringIO
+        from tree_pickle import TreePickler
+        declarations = []
+        others = {}
+        names = {}
+        for (name, value) in self.symbol_table.iteritems():
+            if type(value) in (Variable, Parameter) and value.name == name:
+                declarations.append((type(value) is Variable, name, value.sign.sign_str))
+                names[id(value)] = name
+            else:
+                others[name] = value
+        buffer = StringIO()
+        pickler = TreePickler(buffer, lambda obj: names.get(id(obj)))
+        pickler.dump((SNAPSHOT_VERSION, declarations))
+        pickler.dump_trees(self.statements + others.values())
+        pickler.dump((others, self.statements, self.nodes is not None))
+        return buffer.getvalue()
+
+    # Returns the ProblemContext saved by snapshot().
+    @staticmethod
+    def restore(data):
+        problem = ProblemContext()
+        problem.load(data)
+        return problem
+
+    # Replaces the problem with the one saved by snapshot().
+    # Every object made is kept, so the garbage collector is paused
+    # instead of repeatedly scanning the growing symbol table.
+    def load(self, data):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.load_objects(data)
+        finally:
+            if enabled:
+                gc.enable()
+
+    # Does the work of load.
+    def load_objects(self, data):
+        from cStringIO import StringIO
+        from tree_pickle import TreeUnpickler
+        symbol_table = {}
+        unpickler = TreeUnpickler(StringIO(data), symbol_table.__getitem__)
+        (version, declarations) = unpickler.load()
+        if version != SNAPSHOT_VERSION:
+            raise Exception("Unsupported snapshot version %s." % str(version))
+        factories = {}
+        for (is_variable, name, sign_str) in declarations:
+            key = (is_variable, sign_str)
+            if key not in factories:
+                cls = Variable if is_variable else Parameter
+                factories[key] = declaration_factory(cls, Sign(sign_str))
+            symbol_table[name] = factories[key](name)
+        unpickler.load_trees()
+        (others, statements, share_nodes) = unpickler.load()
+        symbol_table.update(others)
+        self.symbol_table = symbol_table
+        self.statements = statements
+        self.nodes = NodeTable() if share_nodes else None
+
+    def __getstate__(self):
+        return self.snapshot()
+
+    def __setstate__(self, state):
+        self.load(state)
+
+
+# Returns a function that makes a Variable or Parameter of the given class
+# and sign from its name. It copies the attributes of one declaration made by
+# the constructor instead of running the constructor for each name.
+def declaration_factory(cls, sign):
+    state = cls('', sign).__getstate__()
+    new = cls.__new__
+    def make(name):
+        declaration = new(cls)
+        declaration.__setstate__(state)
+        declaration.name = declaration.short_name = name
+        declaration.fingerprint = leaf_fingerprint(name, declaration.curvature,
+                                                   sign)
+        return declaration
+    return make
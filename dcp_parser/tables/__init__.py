@@ -0,0 +1,62 @@
+"""
+Prebuilt lexer and LALR tables for the parser.
+
+lextab.py and parsetab.py are generated by PLY and shipped with the package,
+so a Parser loads them in optimize mode instead of reflecting over the grammar
+and regenerating the tables on every start up.
+fingerprint.py records a hash of the grammar the tables were built from.
+The tables are only rebuilt when the grammar no longer matches the fingerprint,
+and are rewritten in place when the package directory is writable.
+"""
+import os
+import sys
+import hashlib
+
+# Module names of the generated tables.
+LEXTAB = "dcp_parser.tables.lextab"
+PARSETAB = "dcp_parser.tables.parsetab"
+FINGERPRINT = "dcp_parser.tables.fingerprint"
+# Directory the tables are written to.
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Hashes everything the generated tables depend on: the PLY table format,
+# the tokens, precedence, reserved words and every t_/p_ rule.
+# namespace is the dict the lexer and parser are built from.
+def grammar_fingerprint(namespace):
+    import ply.lex
+    import ply.yacc
+    parts = [ply.lex.__tabversion__,
+             ply.yacc.__tabversion__,
+             repr(sorted(namespace['tokens'])),
+             repr(namespace['precedence']),
+             repr(sorted(namespace['reserved'].items()))]
+    for name in sorted(namespace):
+        if name.startswith('t_') or name.startswith('p_'):
+            rule = namespace[name]
+            if not isinstance(rule, str):
+                rule = rule.__doc__ or ''
+            parts.append("%s:%s" % (name, rule))
+    return hashlib.md5("\n".join(parts).encode('utf-8')).hexdigest()
+
+# Returns whether the shipped tables were built from the grammar
+# with the given fingerprint.
+def is_current(fingerprint):
+    try:
+        __import__(FINGERPRINT)
+    except ImportError:
+        return False
+    return getattr(sys.modules[FINGERPRINT], 'FINGERPRINT', None) == fingerprint
+
+# Returns whether regenerated tables can be saved in the package.
+def writable():
+    return os.access(DIRECTORY, os.W_OK)
+
+# Records the fingerprint of freshly written tables and drops any
+# stale table modules so the next load imports the new files.
+def write_fingerprint(fingerprint):
+    filename = os.path.join(DIRECTORY, FINGERPRINT.split('.')[-1] + '.py')
+    with open(filename, 'w') as f:
+        f.write("# Grammar fingerprint of lextab.py and parsetab.py. Don't edit!\n")
+        f.write("FINGERPRINT = %r\n" % fingerprint)
+    for module in [LEXTAB, PARSETAB, FINGERPRINT]:
+        sys.modules.pop(module, None)
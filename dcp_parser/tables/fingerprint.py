@@ -0,0 +1,2 @@
+# Grammar fingerprint of lextab.py and parsetab.py. Don't edit!
+FINGERPRINT = '816d00508d819fbe3e899db1895d5a50'
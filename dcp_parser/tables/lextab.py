@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('COMMA', 'DIVIDE', 'EQUALS', 'FLOAT', 'GEQ', 'ID', 'INT', 'LEQ', 'LPAREN', 'MINUS', 'PARAMETER', 'PLUS', 'RPAREN', 'SIGN', 'STRING_ARG', 'TIMES', 'VARIABLE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_ID>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_FLOAT>\\d*\\.\\d+)|(?P<t_INT>\\d+)|(?P<t_newline>\\n+)|(?P<t_ignore_COMMENT>\\#.*)|(?P<t_PLUS>\\+)|(?P<t_GEQ>>=)|(?P<t_LPAREN>\\()|(?P<t_LEQ><=)|(?P<t_TIMES>\\*)|(?P<t_EQUALS>==)|(?P<t_RPAREN>\\))|(?P<t_DIVIDE>/)|(?P<t_COMMA>,)|(?P<t_MINUS>-)', [None, ('t_ID', 'ID'), ('t_FLOAT', 'FLOAT'), ('t_INT', 'INT'), ('t_newline', 'newline'), (None, None), (None, 'PLUS'), (None, 'GEQ'), (None, 'LPAREN'), (None, 'LEQ'), (None, 'TIMES'), (None, 'EQUALS'), (None, 'RPAREN'), (None, 'DIVIDE'), (None, 'COMMA'), (None, 'MINUS')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,64 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'nonassocEQUALSLEQGEQleftPLUSMINUSleftTIMESDIVIDErightUMINUSUPLUSCOMMA DIVIDE EQUALS FLOAT GEQ ID INT LEQ LPAREN MINUS PARAMETER PLUS RPAREN SIGN STRING_ARG TIMES VARIABLEstatement : VARIABLE id_liststatement : VARIABLE SIGN id_liststatement : PARAMETER id_liststatement : PARAMETER SIGN id_listid_list : ID\n               | id_list ID statement : expression\n                 | constraintstatement : expression error\n                 | constraint errorexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression TIMES expression\n                  | expression DIVIDE expressionconstraint : expression EQUALS expression\n                  | expression LEQ expression\n                  | expression GEQ expressionconstraint : constraint EQUALS expression\n                  | constraint LEQ expression\n                  | constraint GEQ expressionexpression : ID LPAREN expression_list RPARENexpression : ID LPAREN error RPARENexpression_list : expression_or_empty\n                       | STRING_ARGexpression_list : expression_list COMMA expression_or_empty\n                       | expression_list COMMA STRING_ARGexpression_or_empty :\n                           | expression expression : PLUS expression %prec UPLUSexpression : MINUS expression %prec UMINUSexpression : LPAREN expression RPARENexpression : INT\n                  | FLOATexpression : ID'
+    
+_lr_action_items = {'GEQ':([1,2,3,4,9,25,32,33,34,35,36,37,38,39,40,41,42,43,52,54,],[12,-32,16,-33,-34,-29,-30,-20,-18,-19,-17,-14,-15,-13,-16,-11,-12,-31,-21,-22,]),'RPAREN':([2,4,9,24,25,29,32,37,39,41,42,43,46,47,48,49,50,52,53,54,55,56,],[-32,-33,-34,43,-29,-27,-30,-14,-13,-11,-12,-31,-23,-28,52,54,-24,-21,-27,-22,-25,-26,]),'DIVIDE':([2,3,4,9,24,25,32,33,34,35,36,37,38,39,40,41,42,43,47,52,54,],[-32,17,-33,-34,17,-29,-30,17,17,17,17,-14,17,-13,17,17,17,-31,17,-21,-22,]),'INT':([0,5,6,11,12,13,14,16,17,18,19,20,21,23,29,53,],[2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,]),'STRING_ARG':([29,53,],[50,56,]),'SIGN':([8,10,],[28,31,]),'FLOAT':([0,5,6,11,12,13,14,16,17,18,19,20,21,23,29,53,],[4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,]),'EQUALS':([1,2,3,4,9,25,32,33,34,35,36,37,38,39,40,41,42,43,52,54,],[13,-32,18,-33,-34,-29,-30,-20,-18,-19,-17,-14,-15,-13,-16,-11,-12,-31,-21,-22,]),'ID':([0,5,6,8,10,11,12,13,14,16,17,18,19,20,21,23,26,27,28,29,30,31,44,45,51,53,],[9,9,9,27,27,9,9,9,9,9,9,9,9,9,9,9,44,-5,27,9,44,27,-6,44,44,9,]),'LEQ':([1,2,3,4,9,25,32,33,34,35,36,37,38,39,40,41,42,43,52,54,],[14,-32,20,-33,-34,-29,-30,-20,-18,-19,-17,-14,-15,-13,-16,-11,-12,-31,-21,-22,]),'PLUS':([0,2,3,4,5,6,9,11,12,13,14,16,17,18,19,20,21,23,24,25,29,32,33,34,35,36,37,38,39,40,41,42,43,47,52,53,54,],[6,-32,21,-33,6,6,-34,6,6,6,6,6,6,6,6,6,6,6,21,-29,6,-30,21,21,21,21,-14,21,-13,21,-11,-12,-31,21,-21,6,-22,]),'LPAREN':([0,5,6,9,11,12,13,14,16,17,18,19,20,21,23,29,53,],[5,5,5,29,5,5,5,5,5,5,5,5,5,5,5,5,5,]),'error':([1,2,3,4,9,25,29,32,33,34,35,36,37,38,39,40,41,42,43,52,54,],[15,-32,22,-33,-34,-29,49,-30,-20,-18,-19,-17,-14,-15,-13,-16,-11,-12,-31,-21,-22,]),'VARIABLE':([0,],[8,]),'COMMA':([2,4,9,25,29,32,37,39,41,42,43,46,47,48,50,52,53,54,55,56,],[-32,-33,-34,-29,-27,-30,-14,-13,-11,-12,-31,-23,-28,53,-24,-21,-27,-22,-25,-26,]),'TIMES':([2,3,4,9,24,25,32,33,34,35,36,37,38,39,40,41,42,43,47,52,54,],[-32,19,-33,-34,19,-29,-30,19,19,19,19,-14,19,-13,19,19,19,-31,19,-21,-22,]),'PARAMETER':([0,],[10,]),'MINUS':([0,2,3,4,5,6,9,11,12,13,14,16,17,18,19,20,21,23,24,25,29,32,33,34,35,36,37,38,39,40,41,42,43,47,52,53,54,],[11,-32,23,-33,11,11,-34,11,11,11,11,11,11,11,11,11,11,11,23,-29,11,-30,23,23,23,23,-14,23,-13,23,-11,-12,-31,23,-21,11,-22,]),'$end':([1,2,3,4,7,9,15,22,25,26,27,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,51,52,54,],[-8,-32,-7,-33,0,-34,-10,-9,-29,-1,-5,-3,-30,-20,-18,-19,-17,-14,-15,-13,-16,-11,-12,-31,-6,-2,-4,-21,-22,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expression_or_empty':([29,53,],[46,55,]),'constraint':([0,],[1,]),'expression_list':([29,],[48,]),'id_list':([8,10,28,31,],[26,30,45,51,]),'statement':([0,],[7,]),'expression':([0,5,6,11,12,13,14,16,17,18,19,20,21,23,29,53,],[3,24,25,32,33,34,35,36,37,38,39,40,41,42,47,47,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> statement","S'",1,None,None,None),
+  ('statement -> VARIABLE id_list','statement',2,'p_statement_variables','grammar.py',100),
+  ('statement -> VARIABLE SIGN id_list','statement',3,'p_statement_variables_sign','grammar.py',105),
+  ('statement -> PARAMETER id_list','statement',2,'p_statement_parameters','grammar.py',111),
+  ('statement -> PARAMETER SIGN id_list','statement',3,'p_statement_parameters_sign','grammar.py',116),
+  ('id_list -> ID','id_list',1,'p_id_list','grammar.py',121),
+  ('id_list -> id_list ID','id_list',2,'p_id_list','grammar.py',122),
+  ('statement -> expression','statement',1,'p_statement_expr','grammar.py',131),
+  ('statement -> constraint','statement',1,'p_statement_expr','grammar.py',132),
+  ('statement -> expression error','statement',2,'p_statement_error','grammar.py',137),
+  ('statement -> constraint error','statement',2,'p_statement_error','grammar.py',138),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_arith_binop','grammar.py',143),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_arith_binop','grammar.py',144),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_arith_binop','grammar.py',145),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_arith_binop','grammar.py',146),
+  ('constraint -> expression EQUALS expression','constraint',3,'p_expression_bool_binop','grammar.py',153),
+  ('constraint -> expression LEQ expression','constraint',3,'p_expression_bool_binop','grammar.py',154),
+  ('constraint -> expression GEQ expression','constraint',3,'p_expression_bool_binop','grammar.py',155),
+  ('constraint -> constraint EQUALS expression','constraint',3,'p_expression_bool_binop_errors','grammar.py',162),
+  ('constraint -> constraint LEQ expression','constraint',3,'p_expression_bool_binop_errors','grammar.py',163),
+  ('constraint -> constraint GEQ expression','constraint',3,'p_expression_bool_binop_errors','grammar.py',164),
+  ('expression -> ID LPAREN expression_list RPAREN','expression',4,'p_expression_atom','grammar.py',177),
+  ('expression -> ID LPAREN error RPAREN','expression',4,'p_expression_atom_error','grammar.py',193),
+  ('expression_list -> expression_or_empty','expression_list',1,'p_expression_list_single','grammar.py',199),
+  ('expression_list -> STRING_ARG','expression_list',1,'p_expression_list_single','grammar.py',200),
+  ('expression_list -> expression_list COMMA expression_or_empty','expression_list',3,'p_expression_list_multi','grammar.py',205),
+  ('expression_list -> expression_list COMMA STRING_ARG','expression_list',3,'p_expression_list_multi','grammar.py',206),
+  ('expression_or_empty -> <empty>','expression_or_empty',0,'p_expression_or_empty','grammar.py',212),
+  ('expression_or_empty -> expression','expression_or_empty',1,'p_expression_or_empty','grammar.py',213),
+  ('expression -> PLUS expression','expression',2,'p_expression_uplus','grammar.py',218),
+  ('expression -> MINUS expression','expression',2,'p_expression_uminus','grammar.py',222),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','grammar.py',227),
+  ('expression -> INT','expression',1,'p_expression_number','grammar.py',233),
+  ('expression -> FLOAT','expression',1,'p_expression_number','grammar.py',234),
+  ('expression -> ID','expression',1,'p_expression_id','grammar.py',239),
+]
@@ -1,7 +1,12 @@
 from dcp_parser.atomic.atoms import *
 from dcp_parser.atomic.atom_loader import *
 from dcp_parser.expression.expression import *
+from dcp_parser.parser import Parser
+import dcp_parser.atomic.atom_loader as atom_loader
 from nose.tools import *
+import contextlib
+import sys
+import types
 
 class TestAtomLoader(object):
     """ Unit tests for the atomic/atom_loader module. """
@@ -24,5 +29,97 @@ class TestAtomLoader(object):
     # Test creation of atom dict
     def test_generate_atom_dict(self):
         atom_dict = generate_atom_dict()
-        assert_equals(len(atom_dict), len(get_subclasses(Atom)))
-        assert('square' in atom_dict)
\ No newline at end of file
+        assert_equals(atom_dict, ATOM_REGISTRY)
+        assert('square' in atom_dict)
+        assert atom_dict['square'].atom_class is Square
+        assert all(issubclass(func.atom_class, Atom) for func in atom_dict.values())
+
+    # Atoms are registered when they are defined.
+    def test_registry(self):
+        assert ATOM_REGISTRY['square'] is generate_atom_dict()['square']
+        class My_atom(Square):
+            pass
+        try:
+            assert_equals(str(ATOM_REGISTRY['my_atom'](Variable('x'))), 'my_atom(x)')
+            assert 'my_atom' in Parser().atom_dict
+            register(My_atom)
+            register(name='my_alias')(My_atom)
+            assert_equals(Parser().atom_dict['my_alias'](Variable('x')).curvature,
+                          Curvature.CONVEX)
+            assert 'my_atom' in ATOM_REGISTRY
+        finally:
+            del ATOM_REGISTRY['my_atom']
+            del ATOM_REGISTRY['my_alias']
+
+    # Registering a class under another name replaces its registration
+    # by class name, and can replace or hide built-in atoms.
+    def test_register_name(self):
+        square = ATOM_REGISTRY['square']
+        huber = ATOM_REGISTRY['huber']
+        try:
+            @register(name='my_atom')
+            class Other_atom(Square):
+                pass
+            assert 'other_atom' not in ATOM_REGISTRY
+            assert ATOM_REGISTRY['my_atom'].atom_class is Other_atom
+
+            # A class named after a built-in atom replaces it when it is
+            # defined, and puts it back when registered under another name.
+            other_square = type(Square)('Square', (Square,), {})
+            assert ATOM_REGISTRY['square'].atom_class is other_square
+            register(other_square, name='my_square')
+            assert ATOM_REGISTRY['square'] is square
+
+            @register(name='square')
+            class Fast_square(Square):
+                pass
+            assert 'fast_square' not in ATOM_REGISTRY
+            assert Parser().atom_dict['square'].atom_class is Fast_square
+
+            unregister('huber')
+            assert 'huber' not in Parser().atom_dict
+        finally:
+            ATOM_REGISTRY['square'] = square
+            ATOM_REGISTRY['huber'] = huber
+            for name in ['my_atom', 'my_square']:
+                ATOM_REGISTRY.pop(name, None)
+
+    # Atoms of other packages are loaded from entry points on the first miss.
+    def test_entry_points(self):
+        class Plugin(Square):
+            pass
+        del ATOM_REGISTRY['plugin']
+        class EntryPoint(object):
+            name = 'plugged'
+            def load(self):
+                return Plugin
+        pkg_resources = types.ModuleType('pkg_resources')
+        pkg_resources.iter_entry_points = lambda group: [EntryPoint()]
+        modules = {'pkg_resources': pkg_resources}
+        loaded = atom_loader.entry_points_loaded
+        atom_loader.entry_points_loaded = False
+        try:
+            with patch_modules(modules):
+                atom_dict = LazyAtomDict()
+                assert 'square' in atom_dict
+                assert not atom_loader.entry_points_loaded
+                assert 'plugged' in atom_dict
+                assert 'none' not in atom_dict
+                assert_equals(str(atom_dict['plugged'](Variable('x'))), 'plugin(x)')
+        finally:
+            atom_loader.entry_points_loaded = loaded
+            ATOM_REGISTRY.pop('plugged', None)
+
+# Temporarily replaces entries in sys.modules.
+@contextlib.contextmanager
+def patch_modules(modules):
+    saved = dict((name, sys.modules.get(name)) for name in modules)
+    sys.modules.update(modules)
+    try:
+        yield
+    finally:
+        for (name, module) in saved.items():
+            if module is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = module
@@ -60,8 +60,8 @@ class TestAtoms(object):
                          'pow_pos','pow_abs','sum_largest','sum_smallest'];
 
         # Test short names for all standard atoms
-        for subclass in atom_loader.get_subclasses(Atom):
-            name = subclass.__name__.lower()
+        for (name, atomic_func) in atom_dict.items():
+            subclass = atomic_func.atom_class
             if name not in special_names:
                 (args, varargs, keywords, defaults) = inspect.getargspec(subclass.__init__)
                 new_args = [self.cvx_exp] * (len(args)-1)
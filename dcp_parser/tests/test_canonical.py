@@ -0,0 +1,84 @@
+from dcp_parser.parser import Parser
+from dcp_parser.expression.canonical import canonical_key, canonical_keys
+from nose.tools import assert_equals
+
+class TestCanonical(object):
+    """ Unit tests for the expression/canonical module. """
+    def setup(self):
+        self.parser = Parser()
+        self.parser.parse('variable x y z\nparameter positive a b\nparameter c')
+
+    # Returns the canonical key of a statement.
+    def key(self, line):
+        self.parser.parse(line)
+        return canonical_key(self.parser.statements[-1])
+
+    # Statements that only differ in order, grouping or double negation.
+    def test_same_key(self):
+        pairs = [('x + 2*y', '2*y + x'),
+                 ('a * x * b', 'b * (x * a)'),
+                 ('max(a, b)', 'max(b, a)'),
+                 ('norm(x, y, z, 1)', 'norm(z, x, y, 1)'),
+                 ('log_sum_exp(x, y) + geo_mean(a, x)', 'geo_mean(x, a) + log_sum_exp(y, x)'),
+                 ('x + (y + z)', '(z + x) + y'),
+                 ('--x', 'x'),
+                 ('-(-(-x))', '-x'),
+                 ('((x))', 'x'),
+                 ('x == y + z', 'z + y == x'),
+                 ('square(x) <= a', 'a >= square(x)')]
+        for (first, second) in pairs:
+            assert_equals(self.key(first), self.key(second))
+
+    # Constants with equal values have the same key, as they have the same
+    # fingerprint, whether they are written as integers or not.
+    def test_constant_values(self):
+        lines = ['2 * x', '2.0 * x', '4 / 2 * x', '(1 + 1) * x']
+        keys = [self.key(line) for line in lines]
+        fingerprints = [statement.fingerprint
+                        for statement in self.parser.statements[-len(lines):]]
+        assert_equals(keys, [keys[0]] * len(lines))
+        assert_equals(fingerprints, [fingerprints[0]] * len(lines))
+        assert self.key('2.5 * x') != keys[0]
+
+    # Atom parameters are keyed by value like constants.
+    def test_parameter_values(self):
+        pairs = [('pow(x, 2)', 'pow(x, 2.0)'),
+                 ('norm(x, y, 1)', 'norm(y, x, 1.0)'),
+                 ('huber(x, 3) + x', 'x + huber(x, 3.0)')]
+        for (first, second) in pairs:
+            assert_equals(self.key(first), self.key(second))
+        assert self.key('pow(x, 2)') != self.key('pow(x, 2.5)')
+        assert_equals(self.key('norm(x, Inf)'), '(norm(..., Inf) (variable x UNKNOWN))')
+
+    # Statements that are different functions.
+    def test_different_key(self):
+        pairs = [('x - y', 'y - x'),
+                 ('x / a', 'a / x'),
+                 ('quad_over_lin(x, a)', 'quad_over_lin(a, x)'),
+                 ('norm(x, y)', 'norm(x, y, 1)'),
+                 ('-x', 'x'),
+                 ('a * (x + y)', 'a * x + y'),
+                 ('x <= y', 'y <= x'),
+                 ('a + x', 'c + x'),
+                 ('2 - 3', '-1')]
+        for (first, second) in pairs:
+            assert self.key(first) != self.key(second)
+
+    # Keys are strings that do not depend on shared nodes.
+    def test_keys(self):
+        key = self.key('x + 2*y')
+        assert_equals(key, '(+ (* (constant 2 POSITIVE) (variable y UNKNOWN)) '
+                           '(variable x UNKNOWN))')
+        shared = Parser(share_nodes=True)
+        shared.parse('variable x y z\nparameter positive a b\nparameter c')
+        lines = ['square(x) + max(a, b)', 'max(b, a) + square(x)', 'square(x)']
+        for line in lines:
+            shared.parse(line)
+            self.parser.parse(line)
+        assert_equals(canonical_keys(shared.statements),
+                      canonical_keys(self.parser.statements[-3:]))
+
+    # Deep trees are keyed without recursing.
+    def test_deep(self):
+        line = '-(' * 2000 + 'x' + ')' * 2000
+        assert_equals(self.key(line), self.key('x'))
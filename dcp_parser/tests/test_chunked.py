@@ -0,0 +1,58 @@
+from dcp_parser.parser import Parser
+from dcp_parser.chunked import LineReader
+from dcp_parser.json.statement_encoder import StatementEncoder
+from dcp_parser.tests.test_fast_grammar import CORPUS, DECLARATIONS
+from nose.tools import assert_equals
+from StringIO import StringIO
+import json
+
+# Returns the kind, JSON encoding and, if the line was not cut,
+# the line and message of each result.
+def encode(results, lines, chunk_size):
+    return [(r.kind, json.dumps(r.statement, cls=StatementEncoder, sort_keys=True))
+            + ((r.line, r.message()) if len(line) <= chunk_size else ())
+            for (r, line) in zip(results, lines)]
+
+class TestChunked(object):
+    """ Unit tests for Parser.parse_stream and the chunked module. """
+    # Reading in chunks of any size gives the same results as parse_many.
+    def test_same_as_parse_many(self):
+        text = "\n".join(DECLARATIONS + CORPUS + ['', '  \t', 'x + y'])
+        expected = Parser().parse_many(text)
+        lines = [r.line for r in expected]
+        for engine in ['ply', 'fast']:
+            for chunk_size in [1, 2, 3, 7, 64, 1 << 16]:
+                results = list(Parser(engine).parse_stream(StringIO(text), chunk_size))
+                assert_equals(encode(results, lines, chunk_size),
+                              encode(expected, lines, chunk_size))
+
+    # Long lines are lexed in chunks of about the chunk size.
+    def test_chunks(self):
+        line = 'max(' + ', '.join('x%d' % i for i in range(1000)) + ') # max(,'
+        reader = LineReader(StringIO('\n \n' + line + '\nx'), 16)
+        assert reader.next_line()
+        chunks = list(reader.chunks())
+        assert_equals(''.join(chunks), line[:line.index('#')])
+        assert max(len(chunk) for chunk in chunks) <= 16 + 5
+        assert_equals(reader.line(), line[:16] + '...')
+        assert reader.next_line()
+        assert_equals(list(reader.chunks()), ['x'])
+        assert_equals(reader.line(), 'x')
+        assert not reader.next_line()
+
+    # Lines need not be read to the end to move on.
+    def test_skip(self):
+        reader = LineReader(StringIO('a b c d e f\ng'), 2)
+        assert reader.next_line()
+        assert_equals(next(reader.chunks()), 'a ')
+        assert reader.next_line()
+        assert_equals(reader.line(), 'g')
+
+    # A statement spanning many chunks is parsed as a whole.
+    def test_long_statement(self):
+        parser = Parser()
+        parser.parse('variable positive x y')
+        line = 'sum(' + ', '.join(['x', 'log(y)', '2*x'] * 500) + ') <= 1'
+        [result] = list(parser.parse_stream(StringIO(line), 32))
+        assert_equals(str(result.statement), line.replace('2*x', '2 * x'))
+        assert_equals(parser.statements, [result.statement])
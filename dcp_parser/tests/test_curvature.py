@@ -62,4 +62,12 @@ class TestCurvature(object):
         assert Curvature.AFFINE.is_concave()
         assert not Curvature.CONVEX.is_concave()
         assert Curvature.CONCAVE.is_concave()
-        assert not Curvature.NONCONVEX.is_concave()
\ No newline at end of file
+        assert not Curvature.NONCONVEX.is_concave()
+
+    # Tests that each curvature is a single object.
+    def test_interned(self):
+        import cPickle
+        assert Curvature('convex') is Curvature.CONVEX
+        assert Curvature.CONVEX + Curvature.CONCAVE is Curvature.NONCONVEX
+        assert Curvature.CONCAVE.sign_mult(Sign.NEGATIVE) is Curvature.CONVEX
+        assert cPickle.loads(cPickle.dumps(Curvature.AFFINE, 2)) is Curvature.AFFINE
@@ -0,0 +1,56 @@
+from dcp_parser.parser import Parser
+from dcp_parser.expression.expression import Variable
+from dcp_parser.expression.elision import bounded_str
+from nose.tools import assert_equals
+import time
+
+class TestElision(object):
+    """ Unit tests for the expression/elision module. """
+    def setup(self):
+        self.parser = Parser()
+        self.parser.parse('variable x1 x2 x3 x4 x5 x6 x7 x8 x9')
+
+    # Returns the last statement parsed from text.
+    def parse(self, text):
+        self.parser.parse(text)
+        return self.parser.statements[-1]
+
+    def test_fits(self):
+        text = 'x1 + x2 * (x3 - x4) + square(x5 + x6 + x7) <= max(x1, x2) - x9 / 2'
+        constraint = self.parse(text)
+        assert_equals(bounded_str(constraint, len(text)), text)
+        assert_equals(constraint.bounded_str(1000), text)
+
+    def test_limit(self):
+        text = 'x1 + x2 * (x3 - x4) + square(x5 + x6 + x7) <= max(x1, x2) - x9 / 2'
+        constraint = self.parse(text)
+        for limit in range(len(text)):
+            assert len(bounded_str(constraint, limit)) <= limit
+        assert_equals(bounded_str(constraint, 56),
+                      'x1 + ... + square(...) <= max(x1, x2) - x9 / 2')
+        assert_equals(bounded_str(constraint, 0), '')
+
+    def test_wide(self):
+        count = 5000
+        self.parser.parse('variable ' + ' '.join('y%d' % i for i in range(count)))
+        expression = self.parse('max(' + ', '.join('y%d' % i for i in range(count)) + ')')
+        assert_equals(bounded_str(expression, 30), 'max(y0, y1, y2, ..., y4999)')
+        assert_equals(bounded_str(expression, 24), 'max(y0, y1, ..., y4999)')
+        assert_equals(bounded_str(expression, 8), 'max(...)')
+        expression = self.parse(' + '.join('y%d' % i for i in range(count)))
+        assert_equals(bounded_str(expression, 24), 'y0 + y1 + ... + y4999')
+
+    # Deep trees are elided without recursion and without rendering
+    # their whole names.
+    def test_deep(self):
+        expression = Variable('x')
+        for i in range(20000):
+            expression = expression - Variable('y%d' % i)
+        start = time.time()
+        text = bounded_str(expression, 30)
+        assert time.time() - start < 1
+        assert_equals(text, '... - y19997 - y19998 - y19999')
+        expression = Variable('x')
+        for i in range(20000):
+            expression = -expression
+        assert_equals(bounded_str(expression, 10), '-------...')
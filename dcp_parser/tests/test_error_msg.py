@@ -3,7 +3,12 @@ from dcp_parser.expression.curvature import Curvature
 from dcp_parser.expression.sign import Sign
 from dcp_parser.expression.expression import *
 import dcp_parser.atomic.atom_loader as atom_loader
+from dcp_parser.atomic.monotonicity import Monotonicity
+from dcp_parser.error_messages.dcp_violation import DCPViolation
 from nose.tools import assert_equals
+from StringIO import StringIO
+import cPickle
+import gc
 
 class TestErrorMsg(object):
       """ Tests for DCP violation error messages. """
@@ -69,4 +74,40 @@ class TestErrorMsg(object):
 
           error_str = "Illegal composition: convex non-decreasing with non-convex argument"
           assert_equals(str(exp.errors[1]),self.dcp_violation + error_str)
-          assert_equals(exp.errors[1].index,1)
\ No newline at end of file
+          assert_equals(exp.errors[1].index,1)
+
+      # Violations are shared records that keep no expressions.
+      def test_records(self):
+          error = (self.cvx_exp + self.conc_exp).errors[0]
+          assert error is (self.cvx_exp + self.conc_exp).errors[0]
+          assert_equals((error.op_str, error.lh_curvature, error.lh_sign,
+                         error.rh_curvature, error.rh_sign),
+                        ('+', Curvature.CONVEX, Sign.UNKNOWN,
+                         Curvature.CONCAVE, Sign.UNKNOWN))
+          assert not any(isinstance(obj, Expression)
+                         for obj in gc.get_referents(error))
+          assert cPickle.loads(cPickle.dumps(error, 2)) is error
+
+          square = atom_loader.generate_atom_dict()['square']
+          error = square(self.cvx_exp).errors[0]
+          assert_equals((error.func_curvature, error.monotonicity,
+                         error.arg_curvature, error.arg_sign, error.index),
+                        (Curvature.CONVEX, Monotonicity.NONMONOTONIC,
+                         Curvature.CONVEX, Sign.UNKNOWN, 0))
+          copy = cPickle.loads(cPickle.dumps(error, 2))
+          assert copy is error
+          assert_equals(copy.index, 0)
+
+      # Violations at new argument indices are only kept while in use,
+      # so parsing without recording statements does not grow the cache.
+      def test_records_released(self):
+          parser = Parser()
+          parser.parse('variable x')
+          lines = ['max(%slog(x))' % ('x, ' * i) for i in range(200)]
+          gc.collect()
+          before = len(DCPViolation.INDEXED_INSTANCES)
+          for result in parser.iter_parse(StringIO('\n'.join(lines)), record=False):
+              assert_equals(len(result.statement.errors), 1)
+          del result
+          gc.collect()
+          assert len(DCPViolation.INDEXED_INSTANCES) <= before
\ No newline at end of file
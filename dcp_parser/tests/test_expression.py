@@ -71,3 +71,133 @@ class TestExpression(object):
         assert_equals((-a).short_name, '-')
 
 
+
+    # Tests that names are rendered from the tree when needed.
+    def test_lazy_name(self):
+        x = Variable('x')
+        a = Parameter('a', Sign.POSITIVE)
+        exp = -(x + a) * a
+        assert_equals(str(exp), '-x + a * a')
+        exp = (-(x + a)).parenthesized() * a
+        assert_equals(str(exp), '(-x + a) * a')
+        assert_equals(exp.short_name, '*')
+
+    # Tests that a long sum builds and renders without recursing.
+    def test_long_sum(self):
+        import time
+        from dcp_parser.expression import settings
+        x = Variable('x')
+        start = time.time()
+        exp = x
+        for i in range(100000):
+            exp = exp + x
+        assert time.time() - start < 5
+        name = str(exp)
+        assert_equals(name, ' + '.join(['x'] * 100001))
+        assert_equals(len(exp.subexpressions), 100001)
+        assert exp.name_cache is None
+        settings.CACHE_NAMES = True
+        try:
+            assert_equals(str(exp), name)
+            assert_equals(exp.name_cache, name)
+        finally:
+            settings.CACHE_NAMES = False
+
+    # Tests that chains of + and * are single NaryExpressions.
+    def test_nary(self):
+        x = Variable('x')
+        y = Variable('y')
+        a = Parameter('a', Sign.POSITIVE)
+        exp = x + y + a * x * y + x
+        assert isinstance(exp, NaryExpression)
+        assert_equals(len(exp.subexpressions), 4)
+        assert_equals(str(exp), 'x + y + a * x * y + x')
+        assert_equals(exp.subexpressions[2].subexpressions, [a, x, y])
+        assert_equals(exp.curvature, Curvature.NONCONVEX)
+        assert_equals(len(exp.errors), 2)
+        assert_equals(len(exp.subexpressions[2].errors), 1)
+        # Other operators and parentheses end a chain.
+        exp = x - y + x
+        assert_equals(len(exp.subexpressions), 2)
+        grouped = (x + y).parenthesized()
+        assert_equals(len((grouped + x).subexpressions), 2)
+
+    # Tests that building expressions leaves their operands unchanged.
+    def test_immutable(self):
+        x = Variable('x')
+        a = Parameter('a', Sign.NEGATIVE)
+        sum = x + a
+        grouped = sum.parenthesized()
+        assert grouped is not sum
+        assert_equals(str(sum), 'x + a')
+        assert_equals(str(grouped.parenthesized()), '((x + a))')
+        assert_equals(str(x.parenthesized()), '(x)')
+        assert_equals(str(x), 'x')
+        assert_equals(x.parens, 0)
+        before = [(e.curvature, e.sign, str(e)) for e in (x, a, sum, grouped)]
+        exp = (grouped * a) / a - sum
+        assert_equals(str(exp), '(x + a) * a / a - x + a')
+        assert_equals([(e.curvature, e.sign, str(e)) for e in (x, a, sum, grouped)],
+                      before)
+
+    # Tests that arithmetic on constants is folded into one Constant.
+    def test_constant_folding(self):
+        x = Variable('x')
+        exp = Constant(2) * Constant(3) * x
+        assert_equals(str(exp), '2 * 3 * x')
+        assert_equals(len(exp.subexpressions), 2)
+        six = exp.subexpressions[0]
+        assert isinstance(six, Constant)
+        assert_equals(six.value, 6)
+        assert_equals(six.subexpressions, [])
+        # Signs follow the sign rules, not the value.
+        diff = Constant(2) - Constant(3)
+        assert_equals((diff.value, diff.sign, str(diff)), (-1, Sign.UNKNOWN, '2 - 3'))
+        neg = -Constant(2).parenthesized()
+        assert_equals((neg.value, neg.sign, str(neg)), (-2, Sign.NEGATIVE, '-(2)'))
+        assert_equals((Constant(1) / Constant(4)).value, 0.25)
+        # Values that cannot be computed are left unfolded.
+        exp = Constant(1) / (Constant(2) - Constant(2))
+        assert not isinstance(exp, Constant)
+        assert_equals(str(exp), '1 / 2 - 2')
+
+    # Tests that chains extended more than once keep their own terms.
+    def test_nary_sharing(self):
+        x = Variable('x')
+        y = Variable('y')
+        z = Variable('z')
+        cvx = Expression(Curvature.CONVEX, Sign.UNKNOWN, 'cvx')
+        conc = Expression(Curvature.CONCAVE, Sign.UNKNOWN, 'conc')
+        base = x + cvx
+        first = base + conc
+        second = base + y
+        third = first + z
+        assert_equals(str(base), 'x + cvx')
+        assert_equals(str(first), 'x + cvx + conc')
+        assert_equals(str(second), 'x + cvx + y')
+        assert_equals(str(third), 'x + cvx + conc + z')
+        assert_equals(str(first + y), 'x + cvx + conc + y')
+        assert_equals(str(third), 'x + cvx + conc + z')
+        assert_equals(len(base.errors), 0)
+        assert_equals(len(second.errors), 0)
+        assert_equals(len(first.errors), 1)
+        assert_equals(len(third.errors), 2)
+        assert_equals(second.curvature, Curvature.CONVEX)
+        assert_equals(third.curvature, Curvature.NONCONVEX)
+
+    # Tests that expressions have no __dict__ and pickle their slots.
+    def test_slots(self):
+        import cPickle
+        x = Variable('x')
+        a = Parameter('a', Sign.POSITIVE)
+        exp = (x + a * x + Constant(2)) * self.cvx_exp
+        for obj in [x, a, exp, exp.subexpressions[0], exp.errors[0],
+                    exp.sign, exp.curvature, x <= a]:
+            assert not hasattr(obj, '__dict__'), obj
+        # Extending the chain adds terms after the ones it uses.
+        exp.subexpressions[0] + x
+        restored = cPickle.loads(cPickle.dumps(exp, cPickle.HIGHEST_PROTOCOL))
+        assert_equals(str(restored), str(exp))
+        assert_equals(len(restored.subexpressions[0].subexpressions), 3)
+        assert_equals(restored.curvature, exp.curvature)
+        assert_equals([str(e) for e in restored.errors], [str(e) for e in exp.errors])
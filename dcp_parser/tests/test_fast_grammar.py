@@ -0,0 +1,152 @@
+from dcp_parser.parser import Parser
+from dcp_parser.fast_grammar import FastGrammar, tokenize, NotAccepted
+from dcp_parser.json.statement_encoder import StatementEncoder
+from nose.tools import assert_equals, assert_raises
+import json
+import random
+
+# Declarations shared by the corpus.
+DECLARATIONS = ['variable x y z',
+                'variable positive u',
+                'parameter positive a b',
+                'parameter negative c',
+                'parameter zero d',
+                'parameter e']
+
+# Lines parsed by both engines, valid and invalid.
+CORPUS = [
+    # Valid expressions
+    'x', '(x)', '((x + y))', '-x', '+x', '--x', '-+-x', '2', '.5', '1.25', '0',
+    'a*square(square(x)) + b*log(y)',
+    'log_sum_exp(a*x, max(b, -a*log(y))) + a*z/b',
+    'log(square(z)) - log_sum_exp(2*x*z, -square(y)) + (max(x,3) + log(y))',
+    'sum_smallest(rel_entr(norm(x,3),quad_over_lin(kl_div(x,y),max(log(x),1),y)), pow_p(huber(y,3), .5), 2)',
+    'c * (a * x + d * (y / b - z) + x)',
+    '-2 * b + 0 * (z * x - 5) + -a / 1.5',
+    'c * square(square(u)) - log(v) - (-c * log_sum_exp(d, u, v) - max(u, c))',
+    '-square(square(u)) - max(square(u), c)',
+    'huber(u, 2) + pow(u, 2) + huber_circ(u, x, 2) + pow_pos(x, 3) + pow_abs(u, 5)',
+    'sum_largest(u, x, 1) + norm_largest(x, 2, 2) + norm(x) + norm(x, 2) + huber(u)',
+    'norm(u, Inf)', 'norm_inf(u)', 'norm1(u)', 'norm2(u)', 'kl_div(u, x)',
+    'a * -x * b', '2 - -3', 'x - y - z', 'x / y / z', 'x * y + z * x', 'x+y#comment',
+    '   x   +   y   ', 'x\t*\ty', 'max(x)', 'max((x), (y))', 'sqrt(u) + geo_mean(u, x)',
+    # Constraints
+    'a * x == y + b', 'a * x + b == 2', 'max(x, y) == (y + square(b))',
+    'a * square(x) <= log(y) + b', 'a * log(x) <= square(y) + b',
+    'a * log(x) >= square(y) + b', 'quad_over_lin(x,y,z) <= huber_circ(square(x),a,b,10) + inv_pos(z)',
+    # Lexical errors
+    'x < 2', 'x > 2', 'a * x = y + b', 'x^2', '.', 'x $ y', 'none + x^2', 'x\r',
+    # Semantic errors
+    'none', 'none(x)', '1 + none', 'max(1,,)', '1 + sum(x,y) + max(1,,)', 'max()',
+    'square(x, y)', 'pow(x, y)', 'norm(x, 0)', 'x / 0', 'none + none(x)',
+    'huber(x, -1)', 'max(none, )', '(x) + none',
+    # Syntax errors
+    '-', '1--', '1<= ==', '1 + >= max(1)', '1 == 1 == 1', '1 + (1 == 1)',
+    '1 + 1 -2 <= 3*5 - x + max(x) <= 2', 'max(1 1)', '1 + sum(x,y) + max(1,++)',
+    'x y', '(x', 'x)', '()', 'max(x', 'max(Inf)', 'Inf', 'max(Inf + 1)', 'positive',
+    'x positive', 'variable', 'variable positive', 'variable x positive',
+    'parameter Inf', '# comment', '1.', '(x) )', 'x +', '* x', 'max(, x)',
+    # Declarations
+    'variable w', 'parameter negative f g', 'variable zero h',
+]
+
+# Returns a random expression over the declared symbols.
+def random_expression(rand, depth):
+    choice = rand.randint(0, 9 if depth > 0 else 2)
+    if choice == 0:
+        return rand.choice(['x', 'y', 'z', 'u', 'a', 'b', 'c', 'd', 'e'])
+    elif choice == 1:
+        return rand.choice(['0', '1', '2', '.5', '3.25'])
+    elif choice == 2:
+        return rand.choice(['-', '+']) + random_expression(rand, depth)
+    elif choice in [3, 4, 5]:
+        return "%s %s %s" % (random_expression(rand, depth - 1),
+                             rand.choice(['+', '-', '*', '/']),
+                             random_expression(rand, depth - 1))
+    elif choice == 6:
+        return "(%s)" % random_expression(rand, depth - 1)
+    elif choice in [7, 8]:
+        atom = rand.choice(['max', 'min', 'sum', 'log_sum_exp', 'norm'])
+        args = [random_expression(rand, depth - 1) for i in range(rand.randint(1, 3))]
+        return "%s(%s)" % (atom, ", ".join(args))
+    else:
+        atom = rand.choice(['square', 'log', 'exp', 'entr', 'inv_pos', 'huber', 'pow'])
+        args = [random_expression(rand, depth - 1)]
+        if atom in ['huber', 'pow']:
+            args.append(rand.choice(['1', '2', '.5']))
+        return "%s(%s)" % (atom, ", ".join(args))
+
+# Returns the line with one character deleted, duplicated or replaced.
+def mutate(rand, line):
+    index = rand.randint(0, len(line) - 1)
+    choice = rand.randint(0, 2)
+    if choice == 0:
+        return line[:index] + line[index + 1:]
+    elif choice == 1:
+        return line[:index] + line[index] + line[index:]
+    else:
+        return line[:index] + rand.choice('+-*/(),=<>x1 ') + line[index + 1:]
+
+# Parses each line with the given engine, returning the outcome of each.
+def outcomes(engine, lines):
+    parser = Parser(engine)
+    for line in DECLARATIONS:
+        parser.parse(line)
+    results = []
+    for line in lines:
+        count = len(parser.statements)
+        try:
+            parser.parse(line)
+        except Exception as e:
+            results.append((line, 'error', str(e)))
+            continue
+        if len(parser.statements) > count:
+            statement = parser.statements[-1]
+            encoded = json.dumps(statement, cls=StatementEncoder, sort_keys=True)
+            results.append((line, str(statement), encoded))
+        else:
+            results.append((line, 'declaration',
+                            sorted((k, repr(v)) for k, v in parser.symbol_table.items())))
+    return results
+
+class TestFastGrammar(object):
+    """ Differential tests of the fast engine against the PLY engine. """
+    # The engines agree on every line of the corpus.
+    def test_corpus(self):
+        for (ply, fast) in zip(outcomes('ply', CORPUS), outcomes('fast', CORPUS)):
+            assert_equals(ply, fast)
+
+    # The engines agree on random expressions and their mutations.
+    def test_random(self):
+        rand = random.Random(0)
+        lines = []
+        for i in range(300):
+            line = random_expression(rand, 4)
+            lines.append(line)
+            lines.append(mutate(rand, line))
+            lines.append("%s %s %s" % (line, rand.choice(['==', '<=', '>=']),
+                                       random_expression(rand, 2)))
+        for (ply, fast) in zip(outcomes('ply', lines), outcomes('fast', lines)):
+            assert_equals(ply, fast)
+
+    # Tokens use the PLY token types.
+    def test_tokenize(self):
+        assert_equals(tokenize('variable positive x # y'),
+                      [('VARIABLE', 'variable'), ('SIGN', 'positive'),
+                       ('ID', 'x'), (None, None)])
+        assert_equals(tokenize(' max(x1, 2.5, Inf) <= 3 '),
+                      [('ID', 'max'), ('(', '('), ('ID', 'x1'), (',', ','),
+                       ('NUMBER', 2.5), (',', ','), ('STRING_ARG', 'Inf'),
+                       (')', ')'), ('<=', '<='), ('NUMBER', 3), (None, None)])
+        assert_raises(NotAccepted, tokenize, 'x < 2')
+
+    # Deep nesting falls back to the PLY engine.
+    def test_deep_nesting(self):
+        line = '(' * 2000 + 'x' + ')' * 2000
+        (ply, fast) = (outcomes('ply', [line]), outcomes('fast', [line]))
+        assert_equals(ply, fast)
+
+    # Unknown engines are rejected.
+    def test_engine(self):
+        assert Parser('fast').grammar is FastGrammar.shared()
+        assert_raises(Exception, Parser, 'slow')
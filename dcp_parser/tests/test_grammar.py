@@ -0,0 +1,68 @@
+from dcp_parser.parser import Parser
+from dcp_parser.grammar import CompiledGrammar, ParseContext
+from dcp_parser.expression.curvature import Curvature
+from dcp_parser.expression.sign import Sign
+from nose.tools import assert_equals
+import threading
+
+class TestGrammar(object):
+    """ Unit tests for the grammar module. """
+    def setup(self):
+        self.grammar = CompiledGrammar.shared()
+
+    # All Parsers share one compiled grammar.
+    def test_shared(self):
+        assert self.grammar is CompiledGrammar.shared()
+        assert Parser().grammar is self.grammar
+        assert Parser().atom_dict is self.grammar.atom_dict
+
+    # Parse state lives on the context, not the grammar.
+    def test_context(self):
+        symbol_table = {}
+        statements = []
+        context = self.grammar.context(symbol_table, statements)
+        assert isinstance(context, ParseContext)
+        assert_equals(self.grammar.parse('variable positive x', context), 0)
+        assert_equals(symbol_table['x'].sign, Sign.POSITIVE)
+        assert_equals(self.grammar.parse('square(x) + 1', context), 0)
+        assert_equals(str(statements[0]), 'square(x) + 1')
+
+        context = self.grammar.context(symbol_table, statements)
+        assert_equals(self.grammar.parse('1--', context), 1)
+        assert_equals(context.errors, 1)
+        assert_equals(len(statements), 1)
+
+        # A fresh context is unaffected by earlier errors.
+        context = self.grammar.context({}, [])
+        assert_equals(self.grammar.parse('1 + 1', context), 0)
+
+    # Parsers in different threads do not see each other's state.
+    def test_threads(self):
+        results = {}
+        failures = []
+        shared = Parser()
+        shared.parse('variable x')
+        def work(index):
+            try:
+                parser = Parser()
+                parser.parse('variable positive x%i' % index)
+                for i in range(50):
+                    parser.parse('square(x%i) + %i' % (index, i))
+                    shared.parse('log(x) + %i' % index)
+                results[index] = parser
+            except Exception as e:
+                failures.append(e)
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_equals(failures, [])
+        for index, parser in results.items():
+            assert_equals(parser.symbol_table.keys(), ['x%i' % index])
+            assert_equals(len(parser.statements), 50)
+            for i, statement in enumerate(parser.statements):
+                assert_equals(str(statement), 'square(x%i) + %i' % (index, i))
+                assert_equals(statement.curvature, Curvature.CONVEX)
+        assert_equals(len(shared.statements), 8*50)
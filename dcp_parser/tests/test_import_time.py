@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+from nose.tools import assert_equals
+
+# Directory containing the dcp_parser package.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seconds allowed for importing dcp_parser.parser (measured at about 0.025 s)
+# and for importing it and parsing a first line (about 0.045 s). The margins
+# are wide so that slow or busy machines pass. The budget is enforced by
+# IMPORT_MODULES; these only catch imports becoming an order of magnitude slower.
+IMPORT_BUDGET = 1.0
+PARSE_BUDGET = 2.0
+
+# The modules importing dcp_parser.parser loads: the package modules, and
+# the standard library modules other than private ones such as _struct.
+# A module imported at the top of any of these has to be added here.
+IMPORT_MODULES = ['dcp_parser', 'dcp_parser.atomic', 'dcp_parser.atomic.atom_loader',
+                  'dcp_parser.atomic.monotonicity', 'dcp_parser.chunked',
+                  'dcp_parser.error_messages',
+                  'dcp_parser.error_messages.dcp_violation_factory',
+                  'dcp_parser.expression', 'dcp_parser.expression.constraints',
+                  'dcp_parser.expression.curvature', 'dcp_parser.expression.expression',
+                  'dcp_parser.expression.node_table', 'dcp_parser.expression.settings',
+                  'dcp_parser.expression.sign', 'dcp_parser.expression.statement',
+                  'dcp_parser.expression.traversal', 'dcp_parser.expression.violations',
+                  'dcp_parser.fast_grammar', 'dcp_parser.grammar',
+                  'dcp_parser.parse_errors', 'dcp_parser.parse_result',
+                  'dcp_parser.parser', 'dcp_parser.problem_context', 'dcp_parser.tables',
+                  'binascii', 'collections', 'copy', 'gc', 'hashlib', 'heapq',
+                  'itertools', 'keyword', 'numbers', 'operator', 'struct', 'thread',
+                  'threading', 'time', 'weakref']
+
+# The common parse path.
+PARSE = "dcp_parser.parser.Parser().parse('variable x\\nx + 1')"
+
+# Modules that are only loaded when they are used.
+LAZY_MODULES = ['multiprocessing', 'cPickle', 'json', 'dcp_parser.parallel',
+                'dcp_parser.tree_pickle',
+                'dcp_parser.json', 'dcp_parser.atomic.atoms',
+                'dcp_parser.error_messages.operation_error',
+                'dcp_parser.error_messages.composition_error',
+                'dcp_parser.error_messages.constraint_error']
+
+# Modules that are only loaded by the first parse, not by the import.
+PARSE_MODULES = ['ply', 'ply.lex', 'ply.yacc', 'dcp_parser.tables.lextab',
+                 'dcp_parser.tables.parsetab']
+
+# Runs the code in a new interpreter and returns its output.
+def run(code, *options):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen([sys.executable] + list(options) + ['-c', code],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    (out, err) = process.communicate()
+    assert_equals(process.returncode, 0, err)
+    return (out, err)
+
+# Returns the least of three measurements of the seconds taken to import
+# dcp_parser.parser and run the statement after it.
+def measure(statement):
+    code = "import time; t = time.time(); import dcp_parser.parser; %s; " \
+           "print(time.time() - t)" % statement
+    return min(float(run(code)[0]) for i in range(3))
+
+# Returns the names of the modules loaded by importing dcp_parser.parser
+# and running the statement, leaving out those the interpreter starts with.
+def loaded_modules(statement):
+    code = "import sys; started = set(sys.modules); import dcp_parser.parser; %s; " \
+           "print(' '.join(m for m in sys.modules " \
+           "if sys.modules[m] and m not in started))" % statement
+    return set(run(code)[0].split())
+
+class TestImportTime(object):
+    """ Regression tests for the cost of importing dcp_parser. """
+    # Importing loads exactly the modules in IMPORT_MODULES.
+    def test_import_modules(self):
+        loaded = [m for m in loaded_modules("pass") if not m.startswith('_')]
+        assert_equals(sorted(loaded), sorted(IMPORT_MODULES))
+
+    # Rarely used modules are not loaded by the common parse path.
+    def test_lazy_modules(self):
+        loaded = loaded_modules(PARSE)
+        assert 'dcp_parser.grammar' in loaded
+        assert_equals([m for m in LAZY_MODULES if m in loaded], [])
+
+    # PLY and the parse tables are loaded by the first parse.
+    def test_parse_modules(self):
+        loaded = loaded_modules("pass")
+        assert 'dcp_parser.grammar' in loaded
+        assert_equals([m for m in LAZY_MODULES + PARSE_MODULES if m in loaded], [])
+        loaded = loaded_modules(PARSE)
+        assert_equals([m for m in PARSE_MODULES if m not in loaded], [])
+
+    def test_import_budget(self):
+        seconds = measure("pass")
+        assert seconds < IMPORT_BUDGET, "import took %.3f s" % seconds
+
+    def test_parse_budget(self):
+        seconds = measure(PARSE)
+        assert seconds < PARSE_BUDGET, "import and parse took %.3f s" % seconds
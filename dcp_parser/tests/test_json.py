@@ -60,4 +60,16 @@ class TestJson(object):
             if error.is_indexed():
                 assert_equals(result.json_errors['indexed_errors'][str(error.index)], error.error_message())
             else:
-                assert error.error_message() in result.json_errors['unsorted_errors']
\ No newline at end of file
+                assert error.error_message() in result.json_errors['unsorted_errors']
+
+    # Tests that long sums encode as one level of children.
+    def test_long_sum_encoder(self):
+        exp = self.cvx_exp
+        for i in range(5000):
+            exp = exp + self.conc_exp
+        json_str = StatementEncoder().encode(exp)
+        result = json.loads(json_str)
+        assert_equals(result['class'], 'Function')
+        assert_equals(result['short_name'], '+')
+        assert_equals(len(result['children']), 5001)
+        assert_equals(len(result['errors']['unsorted_errors']), 5000)
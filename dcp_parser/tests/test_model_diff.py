@@ -0,0 +1,81 @@
+from dcp_parser.parser import Parser
+from dcp_parser.model_diff import diff
+from dcp_parser.expression.expression import Variable, Parameter, Constant, \
+     NaryExpression
+from dcp_parser.expression.sign import Sign
+from nose.tools import assert_equals
+
+DECLARATIONS = 'variable x y z\nparameter positive a b'
+
+STATEMENTS = ['square(x) + a * y',
+              'max(x, y) <= b',
+              'norm(x, y, 1) + 2 * 3 * z',
+              'log(x) >= -a',
+              'huber(x, 2) == 0']
+
+class TestModelDiff(object):
+    """ Unit tests for the model_diff module. """
+
+    # Returns a Parser for the declarations and statements.
+    def parse(self, statements, declarations=DECLARATIONS):
+        parser = Parser()
+        parser.parse(declarations)
+        for statement in statements:
+            parser.parse(statement)
+        return parser
+
+    # Fingerprints follow the structure, not the text.
+    def test_fingerprints(self):
+        parser = self.parse(['square(x) + a*y', '((square(x)) + (a * y))',
+                             'square(x) + a * (y)', 'square(x) + y * a',
+                             'x + 2*3', 'x + 6', 'x + 6.0', 'x + 7'])
+        prints = [s.fingerprint for s in parser.statements]
+        assert_equals(prints[0], prints[1])
+        assert_equals(prints[0], prints[2])
+        assert prints[0] != prints[3]
+        assert_equals(prints[4], prints[5])
+        assert_equals(prints[5], prints[6])
+        assert prints[5] != prints[7]
+        # Declarations count through their name, kind and sign.
+        assert Variable('x').fingerprint != Variable('y').fingerprint
+        assert Variable('x').fingerprint != Variable('x', Sign.POSITIVE).fingerprint
+        assert Variable('a').fingerprint != Parameter('a', Sign.UNKNOWN).fingerprint
+        assert Constant(2).fingerprint != Constant(-2).fingerprint
+        # Chains extended term by term match chains built at once.
+        x = Variable('x')
+        chain = x + x + x
+        rebuilt = NaryExpression('+', chain.curvature, chain.sign,
+                                 chain.subexpressions, [])
+        assert_equals(chain.fingerprint, rebuilt.fingerprint)
+
+    # Edits are reported as added, removed and changed statements.
+    def test_diff(self):
+        old = self.parse(STATEMENTS)
+        assert diff(old, self.parse(STATEMENTS)).is_empty()
+        new = list(STATEMENTS)
+        new[1] = 'max(y, x) <= b'
+        new[3:4] = []
+        new.append('z >= 0')
+        new.insert(0, 'x == y')
+        result = diff(old, self.parse(new))
+        assert_equals(result.changed, [(1, 2)])
+        assert_equals(result.removed, [3])
+        assert_equals(result.added, [0, 5])
+        assert_equals(result.unchanged, [(0, 1, 1), (2, 3, 1), (4, 4, 1)])
+        assert not result.is_empty()
+        # Results for unchanged statements are carried over.
+        assert_equals(result.carry_over(['a', 'b', 'c', 'd', 'e']),
+                      [None, 'a', None, 'c', 'e', None])
+
+    # Changing a declaration changes the statements that use it.
+    def test_declarations(self):
+        old = self.parse(STATEMENTS)
+        new = self.parse(STATEMENTS, 'variable x y z\nparameter positive a\nparameter b')
+        result = diff(old, new)
+        assert_equals(result.changed, [(1, 1)])
+        assert_equals(diff(old.statements, new.problem).changed, [(1, 1)])
+
+    # Restored snapshots keep their fingerprints.
+    def test_snapshot(self):
+        old = self.parse(STATEMENTS)
+        assert diff(old, Parser.restore(old.snapshot())).is_empty()
@@ -0,0 +1,122 @@
+from dcp_parser.parser import Parser
+from dcp_parser.model_file import ModelFile
+import dcp_parser.model_file as model_file
+from dcp_parser.parallel import is_declaration
+from dcp_parser.parse_errors import UnknownSymbolError
+from nose.tools import assert_equals, assert_raises
+import os
+import tempfile
+
+MODEL = """variable x y
+parameter positive a
+
+a*square(x)
+  \t
+log(u)
+variable positive u
+log(u) + a
+x--
+parameter negative a
+max(x, y) <= a
+log(u)"""
+
+class TestModelFile(object):
+    """ Unit tests for ModelFile. """
+    def setup(self):
+        (handle, self.path) = tempfile.mkstemp()
+        os.write(handle, MODEL)
+        os.close(handle)
+        self.model = ModelFile(self.path, cache_size=2)
+
+    def teardown(self):
+        self.model.close()
+        os.remove(self.path)
+
+    # Only objectives and constraints are indexed, and only when needed.
+    def test_index(self):
+        assert_equals(self.model.scanned, 0)
+        assert_equals(self.model.line(0), 'a*square(x)')
+        assert_equals(self.model.scanned, len(MODEL))
+        assert_equals(len(self.model), 6)
+        assert_equals(self.model.line(0), 'a*square(x)')
+        assert_equals(self.model.line(-1), 'log(u)')
+        assert_raises(IndexError, self.model.line, 6)
+        assert_equals(len(self.model.cache), 0)
+
+    # Lines are indexed the same way across block boundaries.
+    def test_blocks(self):
+        block_size = model_file.BLOCK_SIZE
+        model_file.BLOCK_SIZE = 5
+        try:
+            model = ModelFile(self.path)
+            assert_equals(model.line(1), 'log(u)')
+            assert model.scanned < len(MODEL)
+            assert_equals([model.line(k) for k in range(len(model))],
+                          [self.model.line(k) for k in range(len(self.model))])
+            assert_equals(list(model.decl_starts), list(self.model.decl_starts))
+            model.close()
+        finally:
+            model_file.BLOCK_SIZE = block_size
+
+    # Statements match parsing the whole file, in any access order.
+    def test_same_as_parse_many(self):
+        expected = [result for result in Parser().parse_many(MODEL)
+                    if not is_declaration(result.line)]
+        for k in [5, 0, 3, 1, 4, 2, 5]:
+            result = self.model.result(k)
+            assert_equals(result.line, expected[k].line)
+            assert_equals(result.kind, expected[k].kind)
+            assert_equals(result.message(), expected[k].message())
+            assert_equals(str(result.statement), str(expected[k].statement))
+        assert_equals(str(self.model.symbol_table(4)['a'].sign), 'NEGATIVE')
+        assert_equals(str(self.model.symbol_table(2)['a'].sign), 'POSITIVE')
+
+    # Going back, or forward past a checkpoint, replays the declarations
+    # since the last checkpoint only.
+    def test_checkpoints(self):
+        interval = model_file.CHECKPOINT_INTERVAL
+        model_file.CHECKPOINT_INTERVAL = 2
+        try:
+            model = ModelFile(self.path, cache_size=0)
+            lines = []
+            parse_line = model.parser.parse_line
+            def counted(line, record=True):
+                lines.append(line)
+                return parse_line(line, record)
+            model.parser.parse_line = counted
+            assert_equals(str(model.symbol_table(5)['a'].sign), 'NEGATIVE')
+            assert_equals(len(model.checkpoints), 3)
+            del lines[:]
+            assert_equals(str(model.symbol_table(4)['a'].sign), 'NEGATIVE')
+            assert_equals(lines, [])
+            assert_equals(str(model.symbol_table(2)['a'].sign), 'POSITIVE')
+            assert_equals(lines, ['variable positive u'])
+            del lines[:]
+            assert_equals(str(model.symbol_table(5)['a'].sign), 'NEGATIVE')
+            assert_equals(lines, [])
+            model.close()
+        finally:
+            model_file.CHECKPOINT_INTERVAL = interval
+
+    # Parsed results are cached, least recently used first out.
+    def test_cache(self):
+        first = self.model.result(0)
+        assert self.model.result(0) is first
+        self.model.result(2)
+        self.model.result(3)
+        assert_equals(list(self.model.cache.keys()), [2, 3])
+        assert self.model.result(0) is not first
+
+    # Indexing raises the error of a bad line.
+    def test_getitem(self):
+        assert_equals(str(self.model[2]), 'log(u) + a')
+        assert_raises(UnknownSymbolError, self.model.__getitem__, 1)
+        assert_raises(UnknownSymbolError, list, self.model)
+
+    # Empty files have no statements.
+    def test_empty(self):
+        (handle, path) = tempfile.mkstemp()
+        os.close(handle)
+        with ModelFile(path) as model:
+            assert_equals(len(model), 0)
+        os.remove(path)
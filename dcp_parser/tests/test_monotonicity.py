@@ -23,4 +23,12 @@ class TestMonotonicity(object):
         assert_equals(Monotonicity.INCREASING.dcp_curvature(Curvature.CONCAVE, Curvature.CONVEX), Curvature.NONCONVEX)
         assert_equals(Monotonicity.NONMONOTONIC.dcp_curvature(Curvature.CONCAVE, Curvature.AFFINE), Curvature.CONCAVE)
 
-        assert_equals(Monotonicity.NONMONOTONIC.dcp_curvature(Curvature.CONSTANT, Curvature.NONCONVEX), Curvature.CONSTANT)
\ No newline at end of file
+        assert_equals(Monotonicity.NONMONOTONIC.dcp_curvature(Curvature.CONSTANT, Curvature.NONCONVEX), Curvature.CONSTANT)
+
+    # Tests that each monotonicity is a single object.
+    def test_interned(self):
+        import cPickle
+        assert Monotonicity('increasing') is Monotonicity.INCREASING
+        assert cPickle.loads(cPickle.dumps(Monotonicity.DECREASING, 2)) \
+            is Monotonicity.DECREASING
+        assert_raises(Exception, Monotonicity, 'sideways')
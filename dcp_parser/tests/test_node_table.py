@@ -0,0 +1,84 @@
+from dcp_parser.parser import Parser, ENGINES
+from dcp_parser.problem_context import ProblemContext
+from dcp_parser.expression.node_table import NodeTable, distinct_nodes
+from dcp_parser.json.statement_encoder import StatementEncoder
+from nose.tools import assert_equals
+
+DECLARATIONS = 'variable x y z\nparameter positive a\nparameter b'
+
+STATEMENTS = ['square(x) + a * z - log(y)',
+              'square(x) + a * z + log(y) + square(x)',
+              'max(square(x), (a * z)) <= -log(y) * 2',
+              'norm(x + y, Inf) + norm(x + y, 1) + norm(x + y, Inf)',
+              '(x + y) * b + (x + y) + ((x + y))',
+              'b * square(x) / 2.0 + b * square(x) / 2']
+
+class TestNodeTable(object):
+    """ Unit tests for the expression/node_table module. """
+
+    # Returns a Parser with the declarations, sharing nodes if asked to.
+    def parser(self, engine, share_nodes):
+        parser = Parser(engine, share_nodes=share_nodes)
+        parser.parse(DECLARATIONS)
+        return parser
+
+    # Shared statements render, analyze and encode like plain ones.
+    def test_same_results(self):
+        for engine in ENGINES:
+            plain = self.parser(engine, False)
+            shared = self.parser(engine, True)
+            for line in STATEMENTS:
+                plain.parse(line)
+                shared.parse(line)
+            encoder = StatementEncoder()
+            for (lhs, rhs) in zip(plain.statements, shared.statements):
+                assert_equals(str(lhs), str(rhs))
+                assert_equals(encoder.encode(lhs), encoder.encode(rhs))
+
+    # Identical subexpressions are one node.
+    def test_sharing(self):
+        for engine in ENGINES:
+            parser = self.parser(engine, True)
+            parser.parse(STATEMENTS[0])
+            parser.parse(STATEMENTS[1])
+            (first, second) = parser.statements
+            square = first.subexpressions[0].subexpressions[0]
+            assert_equals(str(square), 'square(x)')
+            assert square is second.subexpressions[0]
+            assert square is second.subexpressions[3]
+            assert first.subexpressions[0].subexpressions[1] is second.subexpressions[1]
+            assert len(distinct_nodes(parser.statements)) < \
+                len(distinct_nodes(self.plain_statements(engine, STATEMENTS[:2])))
+
+    # Parentheses make a new node and leave the shared one alone.
+    def test_group(self):
+        parser = self.parser('ply', True)
+        parser.parse(STATEMENTS[4])
+        parser.parse('x + y')
+        assert_equals(str(parser.statements[0]), STATEMENTS[4])
+        assert_equals(str(parser.statements[1]), 'x + y')
+        assert_equals(str(parser.symbol_table['x']), 'x')
+
+    # Clearing a problem empties its table; copies get their own.
+    def test_problem(self):
+        problem = ProblemContext(share_nodes=True)
+        parser = Parser(problem=problem)
+        parser.parse(DECLARATIONS + '\n' + STATEMENTS[0])
+        size = len(problem.nodes)
+        assert size > 0
+        copy = problem.copy()
+        Parser(problem=copy).parse('square(x) + y')
+        assert len(copy.nodes) > size
+        assert_equals(len(problem.nodes), size)
+        restored = ProblemContext.restore(problem.snapshot())
+        assert_equals(len(restored.nodes), 0)
+        assert ProblemContext.restore(ProblemContext().snapshot()).nodes is None
+        problem.clear()
+        assert_equals(len(problem.nodes), 0)
+
+    # Returns the statements parsed without sharing nodes.
+    def plain_statements(self, engine, lines):
+        parser = self.parser(engine, False)
+        for line in lines:
+            parser.parse(line)
+        return parser.statements
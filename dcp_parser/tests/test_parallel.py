@@ -0,0 +1,105 @@
+from dcp_parser.parser import Parser
+from dcp_parser.parallel import is_declaration
+from dcp_parser.json.statement_encoder import StatementEncoder
+from dcp_parser.tests.test_fast_grammar import random_expression
+from nose.tools import assert_equals
+import json
+import random
+
+# Returns the kind, message and JSON encoding of each result.
+def encode(results):
+    return [(r.line, r.kind, r.message(),
+             json.dumps(r.statement, cls=StatementEncoder, sort_keys=True))
+            for r in results]
+
+# Returns the kind, message, text, fingerprint and kinds of violations of each
+# result, which unlike encode takes time linear in the depth of the statements.
+def describe(results):
+    return [(r.line, r.kind, r.message(), str(r.statement),
+             r.statement and r.statement.fingerprint,
+             r.statement and r.statement.violations.kinds) for r in results]
+
+class TestParallel(object):
+    """ Unit tests for the parallel module. """
+    def setup(self):
+        rand = random.Random(1)
+        self.lines = ['variable x y z', 'parameter positive a b',
+                      'parameter negative c', 'parameter zero d', 'parameter e',
+                      'log(u)', 'variable positive u']
+        for i in range(200):
+            self.lines.append(random_expression(rand, 3))
+            if i == 100:
+                # Redeclaration part way through the input.
+                self.lines.append('parameter negative a')
+                self.lines.append('variable x positive')
+                self.lines.append('log(u) + a')
+
+    # Parallel parsing gives the same results in the same order as serial parsing.
+    def test_same_as_serial(self):
+        serial = Parser()
+        expected = serial.parse_many(self.lines)
+        for engine in ['ply', 'fast']:
+            parser = Parser(engine)
+            results = parser.parse_parallel(self.lines, processes=3, chunk_size=7)
+            assert_equals(encode(results), encode(expected))
+            assert_equals(len(parser.statements), len(serial.statements))
+            assert_equals(sorted(parser.symbol_table.keys()),
+                          sorted(serial.symbol_table.keys()))
+            assert_equals(str(parser.symbol_table['a'].sign), 'NEGATIVE')
+
+    # Grouping a declared name in one chunk does not rename it in others.
+    def test_grouped_identifiers(self):
+        lines = ['variable x', 'parameter positive a', '(x) + (a)', 'x + a',
+                 '((x))', 'square(x) + a', '(+x)', 'log(a * x)']
+        serial = Parser()
+        expected = serial.parse_many(lines)
+        assert_equals([str(r.statement) for r in expected[2:]],
+                      ['(x) + (a)', 'x + a', '((x))', 'square(x) + a',
+                       '(x)', 'log(a * x)'])
+        assert_equals(str(serial.symbol_table['x']), 'x')
+        for engine in ['ply', 'fast']:
+            results = Parser(engine).parse_parallel(lines, processes=2,
+                                                    chunk_size=1)
+            assert_equals(encode(results), encode(expected))
+
+    # Declarations made before the call are visible to the workers.
+    def test_existing_declarations(self):
+        parser = Parser()
+        parser.parse('variable positive w')
+        results = parser.parse_parallel('log(w)\nsquare(w)', processes=2,
+                                        chunk_size=1, record=False)
+        assert_equals([str(r.statement) for r in results], ['log(w)', 'square(w)'])
+        assert_equals(parser.statements, [])
+
+    # Deep statements are sent back from the workers and refer to the
+    # parser's declarations.
+    def test_deep_statements(self):
+        lines = ['variable x', 'parameter positive a', ' - '.join(['x'] * 1000),
+                 '/'.join(['a'] * 1000), 'square(' * 1000 + 'x' + ')' * 1000,
+                 '-(' * 1000 + 'log(x)' + ')' * 1000 + ' >= x',
+                 'parameter negative a', 'a - x']
+        serial = Parser('fast')
+        expected = serial.parse_many(lines)
+        parser = Parser('fast')
+        results = parser.parse_parallel(lines, processes=2, chunk_size=2)
+        assert_equals(describe(results), describe(expected))
+        assert results[2].statement.subexpressions[1] is parser.symbol_table['x']
+        assert results[7].statement.subexpressions[0] is parser.symbol_table['a']
+        # The earlier declaration of a is not the one in the symbol table.
+        assert_equals(str(results[3].statement.subexpressions[1].sign),
+                      'POSITIVE')
+
+    # Workers share nodes if the parser does.
+    def test_share_nodes(self):
+        lines = ['variable x', 'square(x) + square(x)']
+        for share_nodes in [False, True]:
+            parser = Parser(share_nodes=share_nodes)
+            statement = parser.parse_parallel(lines, processes=2)[1].statement
+            assert_equals(statement.subexpressions[0] is
+                          statement.subexpressions[1], share_nodes)
+
+    def test_is_declaration(self):
+        assert is_declaration('variable x')
+        assert is_declaration('  parameter positive a')
+        assert not is_declaration('variables + 1')
+        assert not is_declaration('x + variable')
@@ -0,0 +1,97 @@
+from dcp_parser.parser import Parser
+from dcp_parser.parse_result import ParseResult
+from dcp_parser.parse_errors import *
+from dcp_parser.expression.curvature import Curvature
+from nose.tools import assert_equals, assert_raises
+
+class TestParseResult(object):
+    """ Unit tests for Parser.parse_many and ParseResult. """
+    def setup(self):
+        self.parser = Parser()
+
+    # Every line gets a result, and bad lines do not stop later ones.
+    def test_parse_many(self):
+        results = self.parser.parse_many(['variable x y',
+                                          'parameter positive a\n\n  ',
+                                          'a*square(x)',
+                                          'x--',
+                                          'x^2',
+                                          'none + x',
+                                          'square(x, y)',
+                                          'max(x,,)',
+                                          'pow(x, y)',
+                                          'max(x, y) <= log(y)'])
+        assert_equals([result.kind for result in results],
+                      [ParseResult.SUCCESS, ParseResult.SUCCESS, ParseResult.SUCCESS,
+                       ParseResult.SYNTAX_ERROR, ParseResult.SYNTAX_ERROR,
+                       ParseResult.UNKNOWN_SYMBOL, ParseResult.WRONG_ARITY,
+                       ParseResult.WRONG_ARITY, ParseResult.INVALID,
+                       ParseResult.SUCCESS])
+        # Declarations have no statement.
+        assert_equals(results[0].statement, None)
+        assert 'y' in self.parser.symbol_table
+        assert_equals(str(results[2].statement), 'a * square(x)')
+        assert_equals(results[2].statement.curvature, Curvature.CONVEX)
+        assert results[2].is_success()
+        assert_equals(results[2].message(), None)
+
+        assert_equals(results[3].message(), "'x--' is not a valid expression.")
+        assert isinstance(results[3].error, InvalidSyntaxError)
+        assert_equals(results[4].message(),
+                      "'^' is not valid. Consider using the 'pow' function.")
+        assert_equals(results[5].message(),
+                      "'none' is not a known variable or parameter.")
+        assert_equals(results[6].message(),
+                      "Incorrect number of arguments in 'square(x, y)'.")
+        assert_equals(results[7].line, 'max(x,,)')
+        assert not results[7].is_success()
+
+        # Only the successful objectives and constraints are recorded.
+        assert_equals([str(s) for s in self.parser.statements],
+                      ['a * square(x)', 'max(x, y) <= log(y)'])
+
+    # A single string is split into lines.
+    def test_parse_many_string(self):
+        results = self.parser.parse_many('variable x\nlog(x)\n\nlog(z)')
+        assert_equals([result.kind for result in results],
+                      [ParseResult.SUCCESS, ParseResult.SUCCESS, ParseResult.UNKNOWN_SYMBOL])
+
+    # Both engines classify errors the same way.
+    def test_fast_engine(self):
+        lines = ['variable x', 'x--', 'none', 'square()', 'x + 1']
+        ply = Parser().parse_many(lines)
+        fast = Parser(engine='fast').parse_many(lines)
+        assert_equals([(r.kind, r.message()) for r in ply],
+                      [(r.kind, r.message()) for r in fast])
+
+    # parse raises the classified errors.
+    def test_parse_raises(self):
+        self.parser.parse('variable x')
+        assert_raises(InvalidSyntaxError, self.parser.parse, 'x +')
+        assert_raises(UnknownSymbolError, self.parser.parse, 'log(z)')
+        assert_raises(ArgumentCountError, self.parser.parse, 'log(x, x)')
+        assert_raises(ParseError, self.parser.parse, 'foo(x)')
+
+    # iter_parse yields results as lines are read.
+    def test_iter_parse(self):
+        lines = iter(['variable x\n', 'parameter negative a\n', '\n',
+                      'log(x)\n', 'a * x -\n', 'square(x) + a'])
+        results = self.parser.iter_parse(lines)
+        assert_equals(results.next().kind, ParseResult.SUCCESS)
+        assert_equals(results.next().kind, ParseResult.SUCCESS)
+        # Declarations are applied before later lines are read.
+        assert 'a' in self.parser.symbol_table
+        assert_equals(str(results.next().statement), 'log(x)')
+        assert_equals(len(self.parser.statements), 1)
+        assert_equals(results.next().kind, ParseResult.SYNTAX_ERROR)
+        assert_equals(str(results.next().statement), 'square(x) + a')
+        assert_raises(StopIteration, results.next)
+        assert_equals(len(self.parser.statements), 2)
+
+    # Without recording, statements are yielded but not kept.
+    def test_iter_parse_no_record(self):
+        lines = ['variable x', 'log(x)', 'square(x)']
+        results = list(self.parser.iter_parse(lines, record=False))
+        assert_equals([str(r.statement) for r in results], ['None', 'log(x)', 'square(x)'])
+        assert_equals(self.parser.statements, [])
+        assert 'x' in self.parser.symbol_table
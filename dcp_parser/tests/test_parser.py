@@ -234,6 +234,31 @@ class TestParser(object):
           assert_equals(expression, str(result))
           assert_equals(result.curvature, Curvature.CONVEX)
 
+          # Only numbers are parameters. Constant expressions, although
+          # they are folded into Constants, are arguments ...
+          expression = 'norm(2 + 1) + norm(v, 1 + 1) + norm(v, (2)) + norm(v, -(2))'
+          self.parser.parse(expression)
+          result = self.parser.statements[len(self.parser.statements) - 1]
+          assert_equals(expression, str(result))
+          assert_equals([(exp.short_name, len(exp.subexpressions))
+                         for exp in result.subexpressions],
+                        [('norm(..., 2)', 1), ('norm(..., 2)', 2),
+                         ('norm(..., 2)', 2), ('norm(..., 2)', 2)])
+          assert_equals(result.curvature, Curvature.CONVEX)
+
+          # ... or invalid parameters of atoms that need one.
+          errors = [('huber(u, 4 / 2)', "Invalid value '4 / 2' for M in huber(...,M)."),
+                    ('pow(u, 2 - 1)', "Invalid value '2 - 1' for p in pow(..., p)."),
+                    ('pow(u, (2))', "Invalid value '(2)' for p in pow(..., p)."),
+                    ('sum_largest(u, v, 1 + 1)',
+                     "Invalid value 'None' for k in sum_largest(...,k).")]
+          for (expression, message) in errors:
+              try:
+                  self.parser.parse(expression)
+                  assert False
+              except Exception as e:
+                  assert_equals(str(e), message)
+
           expression = 'norm(u, Inf)'
           self.parser.parse(expression)
           result = self.parser.statements[len(self.parser.statements) - 1]
@@ -0,0 +1,110 @@
+from dcp_parser.parser import Parser, ENGINES, preload
+from dcp_parser.problem_context import ProblemContext
+from dcp_parser.parse_errors import UnknownSymbolError
+from nose.tools import assert_equals, assert_raises
+
+class TestProblemContext(object):
+    """ Unit tests for ProblemContext. """
+    def setup(self):
+        self.parser = Parser()
+        self.first = ProblemContext()
+        self.second = ProblemContext()
+
+    # Problems parsed with one Parser do not see each other.
+    def test_switch(self):
+        self.parser.problem = self.first
+        self.parser.parse('variable x\nsquare(x)')
+        self.parser.problem = self.second
+        assert_raises(UnknownSymbolError, self.parser.parse, 'square(x)')
+        self.parser.parse('parameter x\nx + 1')
+        assert_equals([str(s) for s in self.first.statements], ['square(x)'])
+        assert_equals([str(s) for s in self.second.statements], ['x + 1'])
+        assert_equals(str(self.first.symbol_table['x'].curvature), 'AFFINE')
+        assert_equals(str(self.second.symbol_table['x'].curvature), 'CONSTANT')
+        assert self.parser.symbol_table is self.second.symbol_table
+
+    # Parsers for different problems share the compiled grammar.
+    def test_parsers(self):
+        first = Parser(problem=self.first)
+        second = Parser('fast', problem=self.second)
+        assert first.grammar.atom_dict is second.grammar.atom_dict
+        first.parse('variable x')
+        second.parse('variable y')
+        assert_equals(self.first.symbol_table.keys(), ['x'])
+        assert_equals(self.second.symbol_table.keys(), ['y'])
+
+    # Clearing a Parser only clears its current problem.
+    def test_clear(self):
+        Parser(problem=self.first).parse('variable x\nx')
+        self.parser.problem = self.second
+        self.parser.parse('variable y\ny')
+        self.parser.clear()
+        assert_equals(self.second.statements, [])
+        assert_equals(self.second.symbol_table, {})
+        assert_equals(len(self.first.statements), 1)
+
+    # Copies share the parsed objects but not the containers.
+    def test_copy(self):
+        Parser(problem=self.first).parse('variable x\nx')
+        copy = self.first.copy()
+        Parser(problem=copy).parse('variable y\ny')
+        assert_equals(len(self.first.statements), 1)
+        assert_equals(len(copy.statements), 2)
+        assert copy.symbol_table['x'] is self.first.symbol_table['x']
+        assert 'y' not in self.first.symbol_table
+
+    # Snapshots restore declarations, redeclarations and statements.
+    def test_snapshot(self):
+        parser = Parser('fast', problem=self.first)
+        parser.parse('variable x y\nparameter negative a\nsquare(x) + a*y\n'
+                     'parameter positive y\nlog(y) >= (x)')
+        problem = ProblemContext.restore(self.first.snapshot())
+        assert_equals(sorted(problem.symbol_table.keys()), ['a', 'x', 'y'])
+        assert_equals(repr(problem.symbol_table['a']), 'Parameter(a, NEGATIVE)')
+        assert_equals(repr(problem.symbol_table['y']), 'Parameter(y, POSITIVE)')
+        assert_equals(repr(problem.symbol_table['x']), 'Variable(x)')
+        assert_equals([str(s) for s in problem.statements],
+                      [str(s) for s in self.first.statements])
+        # Statements refer to the restored declarations.
+        lhs = problem.statements[0].subexpressions[0].subexpressions[0]
+        assert lhs is problem.symbol_table['x']
+        assert problem.statements[0].subexpressions[1].subexpressions[0] \
+            is problem.symbol_table['a']
+        assert problem.statements[0].subexpressions[1].subexpressions[1] \
+            is not problem.symbol_table['y']
+
+    # Parsers pickle their engine and problem but not the grammar.
+    def test_parser_snapshot(self):
+        parser = Parser('fast', problem=self.first)
+        parser.parse('variable x\nsquare(x)')
+        restored = Parser.restore(parser.snapshot())
+        assert_equals(restored.engine, 'fast')
+        assert restored.grammar is parser.grammar
+        assert_equals([str(s) for s in restored.statements], ['square(x)'])
+        restored.parse('x + 1')
+        assert_equals(len(self.first.statements), 1)
+        assert 'CompiledGrammar' not in parser.snapshot()
+
+    # Statements of any depth are saved and restored with their violations.
+    def test_deep_snapshot(self):
+        parser = Parser('fast', problem=self.first)
+        parser.parse('variable x\nparameter positive a')
+        lines = [' - '.join(['x'] * 1000), '/'.join(['a'] * 1000),
+                 'square(' * 500 + 'x' + ')' * 500 + ' <= ' + '-(' * 501 +
+                 'log(x)' + ')' * 501]
+        parser.parse('\n'.join(lines))
+        restored = Parser.restore(parser.snapshot())
+        for (old, new) in zip(parser.statements, restored.statements):
+            assert_equals(str(new), str(old))
+            assert_equals(new.fingerprint, old.fingerprint)
+            assert_equals(new.violations.kinds, old.violations.kinds)
+        assert_equals(restored.statements[2].violations.count, 1)
+        assert restored.statements[0].subexpressions[1] \
+            is restored.symbol_table['x']
+
+    # Preloading builds the grammars of every engine.
+    def test_preload(self):
+        preload(['fast'])
+        assert ENGINES['fast']._shared is not None
+        preload()
+        assert Parser().grammar is ENGINES['ply']._shared
@@ -50,4 +50,14 @@ class TestSign(object):
      assert Sign.NEGATIVE <= Sign.ZERO
      assert Sign.ZERO <= Sign.UNKNOWN
      assert not Sign.UNKNOWN <= Sign.ZERO
-     assert not Sign.POSITIVE <= Sign.ZERO
\ No newline at end of file
+     assert not Sign.POSITIVE <= Sign.ZERO
+
+  # Test that each sign is a single object.
+  def test_interned(self):
+     import cPickle, copy
+     assert Sign('positive') is Sign.POSITIVE
+     assert Sign.POSITIVE + Sign.NEGATIVE is Sign.UNKNOWN
+     assert -Sign.NEGATIVE is Sign.POSITIVE
+     assert cPickle.loads(cPickle.dumps(Sign.ZERO, 2)) is Sign.ZERO
+     assert copy.deepcopy(Sign.NEGATIVE) is Sign.NEGATIVE
+     assert_raises(Exception, Sign, 'sometimes')
@@ -0,0 +1,49 @@
+from dcp_parser.parser import Parser
+import dcp_parser.tables as tables
+from nose.tools import assert_equals, assert_not_equal
+
+class TestTables(object):
+    """ Unit tests for the prebuilt lexer and parser tables. """
+    def setup(self):
+        self.namespace = {
+            'tokens': ['ID', 'PLUS'],
+            'precedence': (('left', 'PLUS'),),
+            'reserved': {'variable': 'VARIABLE'},
+            't_PLUS': r'\+',
+            'p_error': lambda t: None,
+        }
+
+    # The shipped tables must match the grammar in grammar.py,
+    # so building a Parser never regenerates them.
+    def test_shipped_tables_current(self):
+        rebuilt = []
+        write_fingerprint = tables.write_fingerprint
+        tables.write_fingerprint = rebuilt.append
+        try:
+            parser = Parser()
+        finally:
+            tables.write_fingerprint = write_fingerprint
+        assert_equals(rebuilt, [])
+        parser.parse('variable x')
+        parser.parse('x + 1')
+        assert_equals(len(parser.statements), 1)
+
+    # Any change to a rule, token or precedence changes the fingerprint.
+    def test_grammar_fingerprint(self):
+        original = tables.grammar_fingerprint(self.namespace)
+        assert_equals(original, tables.grammar_fingerprint(dict(self.namespace)))
+
+        self.namespace['t_PLUS'] = r'\++'
+        assert_not_equal(tables.grammar_fingerprint(self.namespace), original)
+
+        def p_statement(t):
+            '''statement : ID'''
+        self.namespace['p_statement'] = p_statement
+        changed = tables.grammar_fingerprint(self.namespace)
+        p_statement.__doc__ = '''statement : ID PLUS ID'''
+        assert_not_equal(tables.grammar_fingerprint(self.namespace), changed)
+
+        # Token order does not matter.
+        before = tables.grammar_fingerprint(self.namespace)
+        self.namespace['tokens'] = ['PLUS', 'ID']
+        assert_equals(tables.grammar_fingerprint(self.namespace), before)
@@ -0,0 +1,103 @@
+from dcp_parser.parser import Parser
+from dcp_parser.expression.expression import Variable, Parameter, Constant, \
+     NaryExpression
+from dcp_parser.expression.constraints import Constraint
+from dcp_parser.expression.traversal import preorder, postorder, \
+     breadth_first, find
+from dcp_parser.expression.node_table import distinct_nodes
+from dcp_parser.json.statement_encoder import StatementEncoder
+from nose.tools import assert_equals
+import json
+
+class TestTraversal(object):
+    """ Unit tests for the expression/traversal module. """
+    def setup(self):
+        self.parser = Parser()
+        self.parser.parse('variable x y\nparameter positive a')
+        self.parser.parse('square(x) + a * log(y) <= norm(x, y, 1)')
+        self.constraint = self.parser.statements[0]
+
+    # Returns the (path, short name) of each pair.
+    def names(self, pairs):
+        return [(path, node.short_name) for (path, node) in pairs]
+
+    def test_orders(self):
+        assert_equals(self.names(preorder(self.constraint)),
+                      [((), '<='), ((0,), '+'), ((0, 0), 'square'),
+                       ((0, 0, 0), 'x'), ((0, 1), '*'), ((0, 1, 0), 'a'),
+                       ((0, 1, 1), 'log'), ((0, 1, 1, 0), 'y'),
+                       ((1,), 'norm(..., 1)'), ((1, 0), 'x'), ((1, 1), 'y')])
+        assert_equals(self.names(postorder(self.constraint)),
+                      [((0, 0, 0), 'x'), ((0, 0), 'square'), ((0, 1, 0), 'a'),
+                       ((0, 1, 1, 0), 'y'), ((0, 1, 1), 'log'), ((0, 1), '*'),
+                       ((0,), '+'), ((1, 0), 'x'), ((1, 1), 'y'),
+                       ((1,), 'norm(..., 1)'), ((), '<=')])
+        assert_equals(self.names(breadth_first(self.constraint)),
+                      [((), '<='), ((0,), '+'), ((1,), 'norm(..., 1)'),
+                       ((0, 0), 'square'), ((0, 1), '*'), ((1, 0), 'x'),
+                       ((1, 1), 'y'), ((0, 0, 0), 'x'), ((0, 1, 0), 'a'),
+                       ((0, 1, 1), 'log'), ((0, 1, 1, 0), 'y')])
+        # Paths lead to the nodes.
+        for (path, node) in preorder(self.constraint):
+            target = self.constraint
+            for index in path:
+                target = target.subexpressions[index]
+            assert target is node
+
+    def test_find(self):
+        assert_equals(self.names(find(self.constraint, cls=Variable)),
+                      [((0, 0, 0), 'x'), ((0, 1, 1, 0), 'y'),
+                       ((1, 0), 'x'), ((1, 1), 'y')])
+        assert_equals(self.names(find(self.constraint, short_name='norm')),
+                      [((1,), 'norm(..., 1)')])
+        assert_equals(self.names(find(self.constraint, short_name='norm(..., 1)',
+                                      order=postorder)),
+                      [((1,), 'norm(..., 1)')])
+        assert_equals(self.names(find(self.constraint, has_errors=True)),
+                      [((), '<='), ((0,), '+')])
+        assert_equals(self.names(find(self.constraint, cls=NaryExpression,
+                                      has_errors=False)), [((0, 1), '*')])
+        assert_equals(len(list(find(self.constraint, cls=Constraint))), 1)
+
+    # Shared nodes are visited once for each place they occur,
+    # or once in all if seen is given.
+    def test_seen(self):
+        x = Variable('x')
+        square = self.parser.atom_dict['square'](x)
+        exp = square + square * square
+        assert_equals(len(list(preorder(exp))), 8)
+        for order in [preorder, postorder, breadth_first]:
+            seen = set()
+            assert_equals(len(list(order(exp, seen))), 4)
+            assert_equals(len(list(order(exp, seen))), 0)
+        assert_equals(len(distinct_nodes([exp, square])), 4)
+
+    # Deep trees are walked, represented and encoded without recursing.
+    def test_deep(self):
+        exp = Variable('x')
+        for i in range(5000):
+            exp = -exp
+            if i == 600:
+                middle = exp
+            if i == 1100:
+                shallow = exp
+        for order in [preorder, postorder, breadth_first]:
+            assert_equals(len(list(order(exp))), 5001)
+        # Beyond the recursion limit. The representation grows with the
+        # square of the depth, so it is only checked for a shallower tree.
+        exp = shallow
+        assert repr(exp).startswith('Expression(AFFINE, UNKNOWN, --')
+        encoded = StatementEncoder().default(exp)
+        assert_equals(encoded['short_name'], '-')
+        # json.dumps writes the text without recursing over the nested dicts.
+        text = json.dumps(exp, cls=StatementEncoder)
+        assert text.startswith('{')
+        assert_equals(text.count('"children": ['), 1101)
+        x = Variable('x')
+        text = json.dumps(middle <= x, cls=StatementEncoder, separators=(',', ':'))
+        assert_equals(text.count('"children":['), 602)
+        # Text written either way is the same.
+        for statement in [x - -x, (x + x).parenthesized() <= -x]:
+            assert_equals(json.dumps(statement, cls=StatementEncoder, sort_keys=True),
+                          json.dumps(StatementEncoder().default(statement),
+                                     sort_keys=True))
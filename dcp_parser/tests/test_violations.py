@@ -0,0 +1,79 @@
+from dcp_parser.parser import Parser
+from dcp_parser.expression.expression import Variable
+from dcp_parser.expression.traversal import preorder, find
+from dcp_parser.expression.violations import first_violation, NO_VIOLATIONS
+from nose.tools import assert_equals
+import cPickle
+
+class TestViolations(object):
+    """ Unit tests for the expression/violations module. """
+    def setup(self):
+        self.parser = Parser()
+        self.parser.parse('variable x y\nparameter c')
+
+    # Returns the last statement parsed from text.
+    def parse(self, text):
+        self.parser.parse(text)
+        return self.parser.statements[-1]
+
+    # Checks the summary of every node against a walk over its subtree.
+    def check(self, statement):
+        for (path, node) in preorder(statement):
+            errors = [error for (sub_path, sub) in preorder(node)
+                            for error in sub.errors]
+            assert_equals(node.violations.count, len(errors))
+            kinds = {}
+            for error in errors:
+                kinds[type(error).__name__] = kinds.get(type(error).__name__, 0) + 1
+            assert_equals(node.violations.kinds, kinds)
+            first = next(find(node, has_errors=True), None)
+            assert_equals(first_violation(node), first)
+            if first is not None:
+                assert node.violations.first is first[1]
+
+    def test_no_violations(self):
+        statement = self.parse('square(x) + 2 * y <= log(y)')
+        assert statement.violations is NO_VIOLATIONS
+        assert statement.violations.is_empty()
+        assert_equals(first_violation(statement), None)
+        self.check(statement)
+
+    def test_summary(self):
+        statement = self.parse('x + square(log(x)) + c * square(y) - y * y >= 2')
+        # Each operation on a non-convex expression is a violation too.
+        assert_equals(statement.violations.kinds,
+                      {'CompositionError': 1, 'OperationError': 5,
+                       'ConstraintError': 1})
+        assert_equals(statement.violations.count, 7)
+        assert statement.violations.first is statement
+        self.check(statement)
+        # Negation and parentheses add no violations.
+        statement = self.parse('x <= -(-(square(log(x))))')
+        (path, node) = first_violation(statement.rhs)
+        assert_equals(path, (0, 0))
+        assert_equals(str(node), '(square(log(x)))')
+        assert node is statement.rhs.violations.first
+        self.check(statement)
+        self.check(self.parse('(c * square(x)) + (y * y) + (log(square(x)))'))
+        self.check(self.parse('-(square(x) / log(x)) + x'))
+
+    # Chains and deep trees are summarized as they are built.
+    def test_deep(self):
+        expression = Variable('x') * Variable('y')
+        for i in range(20000):
+            expression = -expression
+        assert_equals(expression.violations.count, 1)
+        (path, node) = first_violation(expression)
+        assert_equals(path, (0,) * 20000)
+        assert node is expression.violations.first
+        assert_equals(node.short_name, '*')
+        for i in range(20000):
+            expression = expression - Variable('y')
+        assert_equals(expression.violations.count, 20001)
+        assert_equals(first_violation(expression), ((), expression))
+
+    def test_pickle(self):
+        statement = self.parse('(c * square(x)) + y <= 2')
+        copy = cPickle.loads(cPickle.dumps(statement, cPickle.HIGHEST_PROTOCOL))
+        assert_equals(copy.violations.kinds, statement.violations.kinds)
+        self.check(copy)
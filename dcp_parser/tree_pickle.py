@@ -0,0 +1,90 @@
+"""
+Pickles parse trees without recursion.
+
+cPickle recurses into the objects it pickles, so pickling a statement a few
+hundred levels deep fails. A TreePickler dumps the nodes of the statements
+one at a time in postorder, each after its subexpressions, and pickles every
+node it has already dumped by its index. So the state of each node is
+pickled at constant depth, and a TreeUnpickler rebuilds the nodes in the
+same order. Nodes shared by several parents or statements are dumped once
+and restored shared.
+
+Nodes (e.g. declarations) can instead be saved by reference with the
+persistent_id and persistent_load functions given; they are still given an
+index, so they are looked up once.
+"""
+import cPickle
+from dcp_parser.expression.statement import Statement
+from dcp_parser.expression.traversal import postorder
+
+class TreePickler(object):
+    """
+    Pickles statements and other objects to file.
+    persistent_id returns the id of a node saved by reference,
+    or None to save the node itself.
+    """
+    def __init__(self, file, persistent_id=None):
+        self.pickler = cPickle.Pickler(file, cPickle.HIGHEST_PROTOCOL)
+        ids = self.ids = {}
+        self.pickler.persistent_id = lambda obj: ids.get(id(obj))
+        self.persistent_id = persistent_id
+        self.count = 0
+        self.seen = set()
+
+    # Dumps the nodes of the statements that are not dumped yet, so later
+    # dumps pickle the statements by index. Objects that are not Statements
+    # are skipped.
+    def dump_trees(self, statements):
+        nodes = []
+        for statement in statements:
+            if isinstance(statement, Statement):
+                nodes.extend([node for (path, node)
+                              in postorder(statement, self.seen)])
+        self.pickler.dump(len(nodes))
+        for node in nodes:
+            # The index is assigned first, as the violations of a node
+            # can refer to the node itself.
+            self.ids[id(node)] = self.count
+            self.count += 1
+            pid = None
+            if self.persistent_id is not None:
+                pid = self.persistent_id(node)
+            if pid is None:
+                self.pickler.dump(type(node))
+                self.pickler.dump(node.__getstate__())
+            else:
+                self.pickler.dump(None)
+                self.pickler.dump(pid)
+
+    # Pickles obj, with the dumped nodes by index.
+    def dump(self, obj):
+        self.pickler.dump(obj)
+
+
+class TreeUnpickler(object):
+    """
+    Unpickles what a TreePickler pickled to file.
+    persistent_load returns the node saved by reference
+    with the given persistent id.
+    """
+    def __init__(self, file, persistent_load=None):
+        self.unpickler = cPickle.Unpickler(file)
+        self.persistent_load = persistent_load
+        self.nodes = []
+        self.unpickler.persistent_load = self.nodes.__getitem__
+
+    # Restores the nodes dumped by one call of TreePickler.dump_trees.
+    def load_trees(self):
+        load = self.unpickler.load
+        for i in xrange(load()):
+            cls = load()
+            if cls is None:
+                self.nodes.append(self.persistent_load(load()))
+                continue
+            node = cls.__new__(cls)
+            self.nodes.append(node)
+            node.__setstate__(load())
+
+    # Unpickles the next object.
+    def load(self):
+        return self.unpickler.load()
@@ -1,6 +1,9 @@
 """ Text based demo of parse tree generation for convex optimization expressions. """
 from dcp_parser.parser import Parser
 
+# The most characters of an expression shown on one line.
+DISPLAY_LENGTH = 160
+
 def main():
     welcome()
     parser = Parser()
@@ -21,15 +24,13 @@ def parse_file(parser):
             break
         except Exception as e:
             print "Invalid filename"
-    for line in f.readlines():
-        try:
-          parser.parse(line)
-        except Exception as e:
-          print "Error parsing " + line
+    for result in parser.iter_parse(f):
+        if not result.is_success():
+          print "Error parsing %s: %s" % (result.line, result.message())
 
 def select_expression(expressions):
     for i in range(len(expressions)):
-        print "Expression %i: %s" % (i, str(expressions[i]))
+        print "Expression %i: %s" % (i, expressions[i].bounded_str(DISPLAY_LENGTH))
 
     index = int(raw_input('Select an expression by index: '))
     return expressions[index]
@@ -43,7 +44,7 @@ def explore_parse_trees(parser):
 
 def display_root(exp):
     print
-    print "Current expression: %s" % exp
+    print "Current expression: %s" % exp.bounded_str(DISPLAY_LENGTH)
     try:
         print "Curvature: %s, Sign: %s" % (exp.curvature, exp.sign)
     except Exception as e: # exp is a Constraint
@@ -59,6 +60,8 @@ def select_child(exp, parent_stack):
       print "Child expressions:"
       for i in range(num_children):
           child = exp.subexpressions[i]
+          if hasattr(child, 'bounded_str'):
+              child = child.bounded_str(DISPLAY_LENGTH)
           print "Expression %i: %s" % (i, child)
     index = int(raw_input('Select a child expression by index (-1 for parent): '))
     if index == -1:
@@ -10,6 +10,7 @@ setup(
                 'dcp_parser.error_messages',
                 'dcp_parser.expression',
                 'dcp_parser.json',
+                'dcp_parser.tables',
              ],
     package_dir={'dcp_parser': 'dcp_parser'},
         url='https://github.com/SteveDiamond/parser/',